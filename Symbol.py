@@ -1,4 +1,34 @@
 class Symbol(str):
-    """A symbol is a unique string that is used as an identifier."""
+    """A symbol is a unique string that is used as an identifier.
+
+    Symbols are interned: Symbol(name) always returns the same object for the
+    same name, so environment lookups and special-form dispatch usually
+    match on identity before comparing characters.
+    """
+    __slots__ = ()
+    _table = {}
+
+    def __new__(cls, name):
+        try:
+            return cls._table[name]
+        except KeyError:
+            symbol = cls._table[name] = super().__new__(cls, name)
+            return symbol
+
+    def __reduce__(self):
+        return Symbol, (str(self),)  # re-interned when unpickled
+
     def __repr__(self):
-        return f"'{self}'"  # Return the symbol in quoted form for clarity
\ No newline at end of file
+        return f"'{self}'"  # Return the symbol in quoted form for clarity
+
+
+class String(str):
+    """A string literal from source code, without its quotes.
+
+    A separate type from Symbol, so evaluating a string literal is a type
+    check rather than a look at its first and last characters.
+    """
+    __slots__ = ()
+
+    def __reduce__(self):
+        return String, (str(self),)
@@ -0,0 +1,46 @@
+"""Arithmetic-heavy loops in both engines, with the JIT off.
+
+Run with: python benchmarks/bench_arithmetic.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sython_extended import SythonExtended  # noqa: E402
+
+CASES = [
+    ("binary", "(define (poly n acc) (if (= n 0) acc (poly (- n 1) (+ acc (* (- n 1) (/ n 2))))))",
+     "(poly 20000 0)"),
+    ("variadic", "(define (sum3 n acc) (if (<= n 0) acc (sum3 (- n 1) (+ acc n (* n 2) (* n n 3)))))",
+     "(sum3 20000 0)"),
+    ("compare", "(define (count n acc) (if (= n 0) acc (count (- n 1) (if (< 0 (mod n 7) 4) (+ acc 1) acc))))",
+     "(count 20000 0)"),
+]
+
+
+def time_case(engine, definitions, call, repeat=5):
+    best = None
+    for _ in range(repeat):
+        sython = SythonExtended(engine=engine, jit=False)
+        sython.run(definitions)
+        expr = sython.parse(sython.tokenize(call))
+        start = time.perf_counter()
+        result = sython.execute(expr)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    print(f"{'case':>10}  {'compile':>8}  {'eval':>8}")
+    for name, definitions, call in CASES:
+        compiled, expected = time_case('compile', definitions, call)
+        evaluated, result = time_case('eval', definitions, call)
+        assert result == expected, (result, expected)
+        print(f"{name:>10}  {compiled:>7.3f}s  {evaluated:>7.3f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+"""Element-wise math over a large dataset: Sython map over a list vs. array primitives.
+
+Run with: python benchmarks/bench_arrays.py [n]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sython_extended import SythonExtended  # noqa: E402
+from sython_array import numpy  # noqa: E402
+
+PIPELINES = [
+    ("map over list", "(define xs (array->list (array-range {n})))",
+     "(reduce + (map (lambda (x) (sqrt (+ (sin x) 2))) xs))"),
+    ("array", "(define xs (array-range {n}))",
+     "(sum (sqrt (+ (sin xs) 2)))"),
+]
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    print(f"{n:,} elements, array backend: {'numpy' if numpy is not None else 'array.array'}")
+    results = []
+    for name, setup, pipeline in PIPELINES:
+        sython = SythonExtended()
+        sython.run(setup.format(n=n))
+        expr = sython.parse(sython.tokenize(pipeline))
+        start = time.perf_counter()
+        results.append(sython.execute(expr))
+        elapsed = time.perf_counter() - start
+        print(f"{name:>14}: {elapsed:.3f}s")
+    assert abs(results[0] - results[1]) < 1e-6 * abs(results[0]), results
+
+
+if __name__ == '__main__':
+    main()
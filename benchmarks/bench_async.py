@@ -0,0 +1,72 @@
+"""Many I/O-bound scripts at once: one thread per script against one event loop.
+
+Each script waits on (sleep) a few times, standing in for I/O, and does a
+little arithmetic in between. Threads run it with run and a blocking
+sleep; the event loop runs every script with run_async.
+
+Run with: python benchmarks/bench_async.py [--scripts 10 100 1000] [--work 20]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sython_interpreter import SythonInterpreter  # noqa: E402
+
+SCRIPT = """
+(define (work n acc) (if (= n 0) acc (work (- n 1) (+ acc n))))
+(define (step i total) (if (= i 0) total (step (- i 1) (+ total (work {work} 0) (or (sleep {wait}) 0)))))
+(step {steps} 0)
+"""
+
+
+def run_threads(count, source):
+    snapshot = SythonInterpreter().snapshot()
+    results = [None] * count
+
+    def run(i):
+        results[i] = snapshot.fork().run(source)
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, results
+
+
+def run_event_loop(count, source):
+    snapshot = SythonInterpreter().snapshot()
+
+    async def main():
+        return await asyncio.gather(*(snapshot.fork().run_async(source) for _ in range(count)))
+    start = time.perf_counter()
+    results = asyncio.run(main())
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--scripts', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--steps', type=int, default=5, help="waits per script")
+    parser.add_argument('--wait', type=float, default=0.02, help="seconds per wait")
+    parser.add_argument('--work', type=int, default=20, help="loop iterations between waits")
+    args = parser.parse_args()
+    source = SCRIPT.format(wait=args.wait, steps=args.steps, work=args.work)
+    serial = args.steps * args.wait
+
+    print(f"each script waits {serial:.2f}s in total")
+    print(f"{'scripts':>8} {'threads':>9} {'asyncio':>9}")
+    for count in args.scripts:
+        threaded, expected = run_threads(count, source)
+        looped, results = run_event_loop(count, source)
+        assert results == expected, (results[:3], expected[:3])
+        print(f"{count:>8} {threaded:>8.3f}s {looped:>8.3f}s")
+
+
+if __name__ == '__main__':
+    main()
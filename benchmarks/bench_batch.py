@@ -0,0 +1,52 @@
+"""Scripts run per second: one `sython.py script.sy` process each, or `sython.py --batch`.
+
+Run with: python benchmarks/bench_batch.py [--scripts 100] [-j 4]
+"""
+import argparse
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import sython_batch  # noqa: E402
+
+SCRIPT = """(define (fib n) (if (< n 2) n (+ (fib (- n 1)) (fib (- n 2)))))
+(display "script {i}")
+(newline)
+(fib {n})
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--scripts', type=int, default=100)
+    parser.add_argument('-j', '--jobs', type=int, default=None, help="batch workers (default: one per CPU)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(args.scripts):
+            with open(os.path.join(tmp, f'script-{i:04}.sy'), 'w') as f:
+                f.write(SCRIPT.format(i=i, n=10 + i % 5))
+        scripts = sython_batch.find_scripts(tmp)
+
+        start = time.perf_counter()
+        for path in scripts:
+            subprocess.run([sys.executable, os.path.join(ROOT, 'sython.py'), '--no-cache', path],
+                           stdout=subprocess.DEVNULL, check=True)
+        separate = time.perf_counter() - start
+
+        summary = sython_batch.run_batch(scripts, args.jobs, io.StringIO(), use_cache=False)
+        assert summary['failed'] == 0
+
+    print(f"{args.scripts} scripts: process each {separate:.2f}s ({args.scripts / separate:.1f}/s), "
+          f"batch {summary['seconds']:.2f}s ({summary['scripts_per_second']:.1f}/s), "
+          f"{separate / summary['seconds']:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
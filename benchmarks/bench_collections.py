@@ -0,0 +1,74 @@
+"""Deduplicating and joining lists with association lists and with hash tables.
+
+Association lists are searched with car/cdr, so both scripts are O(n^2) with
+them and O(n) with a hash table.
+
+Run with: python benchmarks/bench_collections.py [-n 2000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sython_extended import SythonExtended  # noqa: E402
+
+WITH_LISTS = """
+(define (member? x lst) (if (null? lst) #f (if (= x (car lst)) #t (member? x (cdr lst)))))
+(define (dedupe-into seen lst)
+  (if (null? lst) seen (dedupe-into (if (member? (car lst) seen) seen (cons (car lst) seen)) (cdr lst))))
+(define (lookup key alist) (if (= key (car (car alist))) (car (cdr (car alist))) (lookup key (cdr alist))))
+(define (join keys alist) (map (lambda (key) (lookup key alist)) keys))
+"""
+
+# or is a primitive, so (or (hash-set! ...) seen) sets and then passes seen on
+WITH_HASH_TABLES = """
+(define (dedupe-into seen lst)
+  (if (null? lst) (hash-keys seen) (dedupe-into (or (hash-set! seen (car lst) #t) seen) (cdr lst))))
+(define (index-into table alist)
+  (if (null? alist) table (index-into (or (hash-set! table (car (car alist)) (car (cdr (car alist)))) table)
+                                      (cdr alist))))
+(define (join keys alist)
+  (map (lambda (key) (hash-ref table key)) keys))
+"""
+
+
+def evaluate(sython, code):
+    return sython.execute(sython.parse(sython.tokenize(code)))
+
+
+def time_script(prelude, n, empty, index=None):
+    """Seconds to dedupe n items and to join n keys against an n-entry table, and the results."""
+    sython = SythonExtended()
+    sython.run(prelude)
+    sython.env['items'] = evaluate(sython, f"(map (lambda (i) (mod (* i 7) {n // 2})) (stream->list (range {n})))")
+    sython.env['alist'] = evaluate(sython, f"(map (lambda (i) (list i (* i i))) (stream->list (range {n})))")
+    sython.env['keys'] = evaluate(sython, f"(stream->list (range {n}))")
+    start = time.perf_counter()
+    unique = evaluate(sython, f"(length (dedupe-into {empty} items))")
+    dedupe = time.perf_counter() - start
+    start = time.perf_counter()
+    if index is not None:
+        sython.run(index)
+    total = evaluate(sython, "(reduce + (join keys alist))")
+    return dedupe, time.perf_counter() - start, (unique, total)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', type=int, default=2000, help="list length")
+    args = parser.parse_args()
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10 * args.n))
+
+    list_dedupe, list_join, list_results = time_script(WITH_LISTS, args.n, "(list)")
+    hash_dedupe, hash_join, hash_results = time_script(WITH_HASH_TABLES, args.n, "(make-hash-table)",
+                                                       "(define table (index-into (make-hash-table) alist))")
+    assert list_results == hash_results, (list_results, hash_results)
+    print(f"n={args.n}     {'alist':>8} {'hash':>8}")
+    print(f"dedupe     {list_dedupe:>7.3f}s {hash_dedupe:>7.3f}s ({list_dedupe / hash_dedupe:.0f}x)")
+    print(f"join       {list_join:>7.3f}s {hash_join:>7.3f}s ({list_join / hash_join:.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,32 @@
+"""Compare the compiled-closure engine against the reference evaluator.
+
+Run with: python benchmarks/bench_engines.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sython_extended import SythonExtended  # noqa: E402
+
+DEFINITIONS = "(define (fib n) (if (< n 2) n (+ (fib (- n 1)) (fib (- n 2)))))"
+CALL = "(fib 10)"
+REPEAT = 20
+
+
+def time_engine(engine):
+    sython = SythonExtended(engine=engine)
+    sython.run(DEFINITIONS)
+    expr = sython.parse(sython.tokenize(CALL))
+    return timeit.timeit(lambda: sython.execute(expr), number=REPEAT) / REPEAT
+
+
+def main():
+    print(f"{CALL}, mean of {REPEAT} runs")
+    for engine in ('eval', 'compile'):
+        print(f"{engine:>8}: {time_engine(engine) * 1000:8.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+"""Per-call cost of user-defined functions as the global environment grows.
+
+Run with: python benchmarks/bench_env.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sython_extended import SythonExtended  # noqa: E402
+
+CALLS = 20000
+
+
+def per_call_cost(global_size):
+    sython = SythonExtended()
+    for i in range(global_size):
+        sython.env[f'helper-{i}'] = i
+    sython.run("(define (f x) x)")
+    expr = sython.parse(sython.tokenize("(f 1)"))
+    seconds = timeit.timeit(lambda: sython.evaluate(expr), number=CALLS)
+    return seconds / CALLS * 1e6
+
+
+def main():
+    print(f"{'global bindings':>16}  {'us/call':>8}")
+    for size in (0, 100, 1000, 10000):
+        print(f"{size:>16}  {per_call_cost(size):>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
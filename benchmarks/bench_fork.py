@@ -0,0 +1,74 @@
+"""Interpreters created per second, and memory per interpreter, with and without a snapshot.
+
+Compares a fresh SythonExtended, a fresh one that also runs a prelude, and
+a fork of a snapshot taken after the prelude.
+
+Run with: python benchmarks/bench_fork.py [--functions 50]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sython_extended import SythonExtended  # noqa: E402
+
+
+def make_prelude(functions):
+    """A prelude of small library functions, like an embedding service would load."""
+    lines = ["(define limit 100)"]
+    for i in range(functions):
+        lines.append(f"(define (helper-{i} x y) (if (> x limit) (helper-{i} (- x {i + 1}) y) (+ (* x {i}) y)))")
+    return '\n'.join(lines)
+
+
+def rate(make, seconds=1.0):
+    """Instances made per second."""
+    count = 0
+    start = time.perf_counter()
+    while True:
+        make()
+        count += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            return count / elapsed
+
+
+def memory_per_instance(make, count=200):
+    keep = []
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for _ in range(count):
+        keep.append(make())
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / count
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--functions', type=int, default=50, help="functions defined by the prelude")
+    args = parser.parse_args()
+    prelude = make_prelude(args.functions)
+
+    def with_prelude():
+        sython = SythonExtended()
+        sython.run(prelude)
+        return sython
+
+    base = with_prelude()
+    snapshot = base.snapshot()
+    sandbox = snapshot.fork()
+    assert sandbox.run("(helper-3 150 1)") == base.run("(helper-3 150 1)")
+
+    cases = [("SythonExtended()", SythonExtended), ("+ prelude", with_prelude), ("snapshot.fork()", snapshot.fork)]
+    print(f"{'':>18} {'per second':>11} {'us each':>9} {'KB each':>8}")
+    for name, make in cases:
+        per_second = rate(make)
+        print(f"{name:>18} {per_second:>11.0f} {1e6 / per_second:>9.1f} {memory_per_instance(make) / 1024:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
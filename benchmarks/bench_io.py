@@ -0,0 +1,75 @@
+"""Output-heavy loops with and without the output buffer, and line counting with file-lines.
+
+Output goes to a line-buffered os.devnull, like a terminal, so unbuffered
+display pays for a write per line.
+
+Run with: python benchmarks/bench_io.py [--mb 50]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sython_extended import SythonExtended  # noqa: E402
+
+# or is a primitive, so both display and newline run; they return nothing, so n counts down
+PRINT_LOOP = "(define (show n) (if (= n 0) 0 (show (if (or (display n) (newline)) n (- n 1)))))"
+
+
+def time_output(buffer_size, count):
+    sython = SythonExtended(output_buffer_size=buffer_size)
+    sython.run(PRINT_LOOP)
+    expr = sython.parse(sython.tokenize(f"(show {count})"))
+    stdout = sys.stdout
+    with open(os.devnull, 'w', buffering=1) as devnull:
+        sys.stdout = devnull
+        try:
+            start = time.perf_counter()
+            sython.run_forms([expr])
+            return time.perf_counter() - start
+        finally:
+            sys.stdout = stdout
+
+
+def time_lines(path):
+    sython = SythonExtended()
+    sython.env['path'] = path
+    expr = sython.parse(sython.tokenize("(reduce + (map (lambda (line) 1) (file-lines path)))"))
+    start = time.perf_counter()
+    count = sython.execute(expr)
+    elapsed = time.perf_counter() - start
+    # Again under tracemalloc, which slows everything down
+    tracemalloc.start()
+    sython.execute(expr)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, count, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--lines', type=int, default=100000, help="lines displayed by the output loop")
+    parser.add_argument('--mb', type=int, default=20, help="size of the generated log file")
+    args = parser.parse_args()
+
+    unbuffered = time_output(0, args.lines)
+    buffered = time_output(1 << 16, args.lines)
+    print(f"display {args.lines} lines: unbuffered {unbuffered:.3f}s, buffered {buffered:.3f}s "
+          f"({unbuffered / buffered:.1f}x)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'log.txt')
+        line = "2024-01-01T00:00:00 INFO request served in 12ms\n"
+        with open(path, 'w') as f:
+            f.write(line * (args.mb * (1 << 20) // len(line)))
+        elapsed, count, peak = time_lines(path)
+        print(f"file-lines over {args.mb} MB: {count} lines in {elapsed:.3f}s "
+              f"({args.mb / elapsed:.1f} MB/s), peak traced memory {peak / 1024:.0f} KB")
+
+
+if __name__ == '__main__':
+    main()
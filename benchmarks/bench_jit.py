@@ -0,0 +1,41 @@
+"""Hot user functions with the JIT enabled and disabled.
+
+Run with: python benchmarks/bench_jit.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sython_extended import SythonExtended  # noqa: E402
+
+CASES = [
+    ("tail loop", "(define (loop n acc) (if (= n 0) acc (loop (- n 1) (+ acc 1))))", "(loop 1000000 0)"),
+    ("fib", "(define (fib n) (if (< n 2) n (+ (fib (- n 1)) (fib (- n 2)))))", "(fib 22)"),
+    ("float math", "(define (poly x) (+ (* 3.5 (* x x)) (- (* 2 x) 1)))"
+                   "(define (sum-poly n acc) (if (= n 0) acc (sum-poly (- n 1) (+ acc (poly n)))))",
+     "(sum-poly 200000 0)"),
+]
+
+
+def time_case(definitions, call, jit):
+    sython = SythonExtended(jit=jit)
+    sython.run(definitions)
+    expr = sython.parse(sython.tokenize(call))
+    start = time.perf_counter()
+    result = sython.execute(expr)
+    return time.perf_counter() - start, result
+
+
+def main():
+    print(f"{'case':>12}  {'interpreted':>11}  {'jit':>8}  {'speedup':>7}")
+    for name, definitions, call in CASES:
+        interpreted, expected = time_case(definitions, call, jit=False)
+        jitted, result = time_case(definitions, call, jit=True)
+        assert result == expected, (result, expected)
+        print(f"{name:>12}  {interpreted:>10.3f}s  {jitted:>7.3f}s  {interpreted / jitted:>6.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""Build a list with cons, then walk it with car/cdr, at increasing sizes.
+
+Both loops are tail-recursive Sython, so time per element should stay flat.
+Run with: python benchmarks/bench_lists.py [sizes...]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sython_extended import SythonExtended  # noqa: E402
+
+DEFINITIONS = """
+(define (build n acc) (if (= n 0) acc (build (- n 1) (cons n acc))))
+(define (sum-list lst acc) (if (= lst '()) acc (sum-list (cdr lst) (+ acc (car lst)))))
+"""
+
+
+def time_size(sython, n):
+    build = sython.parse(sython.tokenize(f"(define big (build {n} '()))"))
+    walk = sython.parse(sython.tokenize("(sum-list big 0)"))
+    start = time.perf_counter()
+    sython.execute(build)
+    built = time.perf_counter()
+    assert sython.execute(walk) == n * (n + 1) // 2
+    return built - start, time.perf_counter() - built
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 25000, 50000, 100000]
+    sython = SythonExtended()
+    sython.run(DEFINITIONS)
+    print(f"{'elements':>10}  {'build':>8}  {'walk':>8}  {'us/element':>10}")
+    for n in sizes:
+        build, walk = time_size(sython, n)
+        print(f"{n:>10}  {build:>7.3f}s  {walk:>7.3f}s  {(build + walk) / n * 1e6:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
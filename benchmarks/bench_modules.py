@@ -0,0 +1,68 @@
+"""Interpreter startup with libraries loaded on first use, and a program split into modules.
+
+Run with: python benchmarks/bench_modules.py [--modules 20] [--functions 50]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sython_extended import SythonExtended  # noqa: E402
+from sython_modules import _parsed  # noqa: E402
+
+RUNS = 20
+
+
+def best(func, number):
+    return min(timeit.repeat(func, number=number, repeat=5)) / number
+
+
+def module_source(i, functions):
+    return '\n'.join(f"(define (m{i}-f{j} x) (if (< x 1) {j} (+ x (m{i}-f{j} (- x 1)))))"
+                     for j in range(functions))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--modules', type=int, default=20)
+    parser.add_argument('--functions', type=int, default=50)
+    args = parser.parse_args()
+
+    def construct_eagerly():
+        SythonExtended().load_library('math')
+    eager, lazy = best(construct_eagerly, 2000), best(SythonExtended, 2000)
+    print(f"SythonExtended(): math installed up front {eager * 1e6:.0f}us, on first use {lazy * 1e6:.0f}us")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sources = [module_source(i, args.functions) for i in range(args.modules)]
+        for i, source in enumerate(sources):
+            with open(os.path.join(tmp, f'mod{i}.sy'), 'w') as f:
+                f.write(source)
+        program = ' '.join(f'(import "mod{i}")' for i in range(args.modules))
+        prelude = '\n'.join(sources)
+
+        def run_modules():
+            sython = SythonExtended()
+            sython.module_path = (tmp,)
+            sython.cache_modules = False
+            sython.run(program)
+
+        def run_cold():
+            _parsed.clear()
+            run_modules()
+
+        def run_pasted():
+            SythonExtended().run(prelude)
+
+        cold, warm, pasted = best(run_cold, RUNS), best(run_modules, RUNS), best(run_pasted, RUNS)
+    print(f"{args.modules} modules x {args.functions} functions: "
+          f"pasted into the script {pasted * 1e3:.2f}ms, "
+          f"imported {cold * 1e3:.2f}ms, imported again in the same process {warm * 1e3:.2f}ms "
+          f"({pasted / warm:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Tokenize+parse time on generated programs of increasing size.
+
+'list' drives the token-list API (tokenize, then parse one form at a time,
+which has to shift the remaining list); 'stream' reads forms lazily with
+read_forms and also reports how soon the first form is available.
+
+Run with: python benchmarks/bench_parse.py
+"""
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sython_interpreter import SythonInterpreter  # noqa: E402
+from sython_reader import iter_tokens  # noqa: E402
+
+
+LIST_LIMIT = 1 << 20  # the list API still shifts the token list per form
+
+
+def generate(size_bytes):
+    forms = []
+    total = 0
+    i = 0
+    while total < size_bytes:
+        form = f"(define (helper-{i} x) (if (> x {i}) (* x {i}) (+ x 1))) ; generated\n"
+        forms.append(form)
+        total += len(form)
+        i += 1
+    return ''.join(forms)
+
+
+def parse_all(sython, source):
+    tokens = sython.tokenize(source)
+    while tokens:
+        sython.parse(tokens)
+
+
+def stream_all(sython, source):
+    start = time.perf_counter()
+    first = None
+    for _ in sython.read_forms(iter_tokens(io.StringIO(source))):
+        if first is None:
+            first = time.perf_counter() - start
+    return first
+
+
+def main():
+    sython = SythonInterpreter()
+    print(f"{'size':>8}  {'list':>10}  {'stream':>10}  {'first form':>10}")
+    for size in (64 << 10, 256 << 10, 1 << 20, 4 << 20):
+        source = generate(size)
+        if size <= LIST_LIMIT:
+            start = time.perf_counter()
+            parse_all(sython, source)
+            parse_time = f"{time.perf_counter() - start:>9.3f}s"
+        else:
+            parse_time = f"{'skipped':>10}"
+        start = time.perf_counter()
+        first = stream_all(sython, source)
+        stream_time = time.perf_counter() - start
+        print(f"{size >> 10:>6}KB  {parse_time}  {stream_time:>9.3f}s  {first * 1000:>8.3f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""Serial map vs. pmap over 1, 2, 4, ... worker processes on a CPU-bound numeric map.
+
+Run with: python benchmarks/bench_pmap.py [items] [iterations per item]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sython_interpreter import SythonInterpreter  # noqa: E402
+
+WORK = """
+(define (loop i n acc)
+  (if (= i 0) acc (loop (- i 1) n (+ acc (mod (* i n) 7)))))
+(define (work n) (loop {iterations} n 0))
+"""
+
+
+def timed(sython, code):
+    expr = sython.parse(sython.tokenize(code))
+    start = time.perf_counter()
+    result = sython.execute(expr)
+    return result, time.perf_counter() - start
+
+
+def main():
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 64
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    items_list = f"(stream->list (range {items}))"
+    cpus = os.cpu_count() or 1
+    print(f"{items} items x {iterations} iterations, {cpus} CPU(s)")
+
+    sython = SythonInterpreter()
+    sython.run(WORK.format(iterations=iterations))
+    expected, serial = timed(sython, f"(map work {items_list})")
+    print(f"{'map':>10}  {serial:>7.2f}s")
+
+    workers = 1
+    while workers <= max(cpus, 1):
+        sython = SythonInterpreter(workers=workers)
+        sython.run(WORK.format(iterations=iterations))
+        timed(sython, "(pmap work '(1))")  # start the pool outside the timing
+        result, elapsed = timed(sython, f"(pmap work {items_list})")
+        assert result == expected
+        print(f"{'pmap x' + str(workers):>10}  {elapsed:>7.2f}s  {serial / elapsed:>5.2f}x")
+        sython.close()
+        workers *= 2
+
+
+if __name__ == '__main__':
+    main()
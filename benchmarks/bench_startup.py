@@ -0,0 +1,39 @@
+"""Startup time of `sython.py script.sy` with a cold and a warm parse cache.
+
+Run with: python benchmarks/bench_startup.py
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from bench_parse import generate
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNS = 5
+
+
+def time_run(script, env, *flags):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, os.path.join(ROOT, 'sython.py'), *flags, script],
+                   env=env, stdout=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - start
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, SYTHON_CACHE_DIR=os.path.join(tmp, 'cache'))
+        print(f"{'script':>8}  {'cold':>8}  {'warm':>8}  {'no cache':>8}")
+        for size in (1 << 10, 64 << 10, 512 << 10):
+            script = os.path.join(tmp, f'generated-{size}.sy')
+            with open(script, 'w') as f:
+                f.write(generate(size))
+            cold = min(time_run(script, env, '--clear-cache') for _ in range(RUNS))
+            warm = min(time_run(script, env) for _ in range(RUNS))
+            uncached = min(time_run(script, env, '--no-cache') for _ in range(RUNS))
+            print(f"{size >> 10:>6}KB  {cold:>7.3f}s  {warm:>7.3f}s  {uncached:>7.3f}s")
+
+
+if __name__ == '__main__':
+    main()
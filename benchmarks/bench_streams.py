@@ -0,0 +1,46 @@
+"""Peak memory of a map/filter/reduce pipeline over lists vs. lazy streams.
+
+Run with: python benchmarks/bench_streams.py [sizes...]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sython_extended import SythonExtended  # noqa: E402
+
+PIPELINE = "(reduce + (map (lambda (x) (* x x)) (filter (lambda (x) (= (mod x 3) 0)) {source})))"
+SOURCES = [
+    ("list", "(stream->list (range {n}))"),
+    ("stream", "(range {n})"),
+]
+
+
+def measure(sython, code):
+    expr = sython.parse(sython.tokenize(code))
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = sython.execute(expr)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000]
+    sython = SythonExtended()
+    print(f"{'elements':>10}  {'source':>6}  {'time':>8}  {'peak memory':>12}")
+    for n in sizes:
+        results = set()
+        for name, source in SOURCES:
+            result, elapsed, peak = measure(sython, PIPELINE.format(source=source.format(n=n)))
+            results.add(result)
+            print(f"{n:>10}  {name:>6}  {elapsed:>7.2f}s  {peak / 1024:>9.0f} KB")
+        assert len(results) == 1, results
+
+
+if __name__ == '__main__':
+    main()
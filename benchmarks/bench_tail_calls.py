@@ -0,0 +1,42 @@
+"""Iterations/sec of a tail-recursive loop, and whether it stays off the Python stack.
+
+Run with: python benchmarks/bench_tail_calls.py [-n ITERATIONS] [--engine eval|compile]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sython_extended import SythonExtended  # noqa: E402
+
+LOOP = "(define (loop n acc) (if (= n 0) acc (loop (- n 1) (+ acc 1))))"
+
+
+def iterations_per_second(engine, iterations):
+    sython = SythonExtended(engine=engine)
+    sython.run(LOOP)
+    expr = sython.parse(sython.tokenize(f"(loop {iterations} 0)"))
+    start = time.perf_counter()
+    result = sython.execute(expr)
+    elapsed = time.perf_counter() - start
+    assert result == iterations, result
+    return iterations / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-n', '--iterations', type=int, default=100000)
+    parser.add_argument('--engine', choices=('eval', 'compile'), action='append')
+    options = parser.parse_args()
+    for engine in options.engine or ('eval', 'compile'):
+        try:
+            rate = iterations_per_second(engine, options.iterations)
+            print(f"{engine:>8}: {rate:12,.0f} iterations/sec over {options.iterations:,} iterations")
+        except RecursionError:
+            print(f"{engine:>8}: RecursionError after fewer than {options.iterations:,} iterations")
+
+
+if __name__ == '__main__':
+    main()
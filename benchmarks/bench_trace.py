@@ -0,0 +1,75 @@
+"""Cost of tracing: a recursive function run untraced and with each kind of tracer.
+
+The JSONL tracers write to an in-memory file, so the numbers are the cost of
+the hooks and of formatting the records, not of the disk.
+
+Run with: python benchmarks/bench_trace.py [-n 20]
+"""
+import argparse
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sython_interpreter import SythonInterpreter  # noqa: E402
+from sython_trace import JsonlTracer, SamplingTracer, Tracer  # noqa: E402
+
+FIB = "(define (fib n) (if (< n 2) n (+ (fib (- n 1)) (fib (- n 2)))))"
+RUNS = 3
+
+
+class Counter(Tracer):
+    """Counts calls; the cheapest tracer that still wants every call."""
+    events = frozenset(('call',))
+
+    def __init__(self):
+        self.calls = 0
+
+    def on_call(self, name, args):
+        self.calls += 1
+
+
+def time_fib(n, engine, make_tracer):
+    best = None
+    for _ in range(RUNS):
+        tracer = make_tracer()
+        sython = SythonInterpreter(engine=engine, jit=False, tracer=tracer)
+        sython.run(FIB)
+        expr = sython.parse(sython.tokenize(f"(fib {n})"))
+        start = time.perf_counter()
+        sython.execute(expr)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', type=int, default=20, help="argument to fib")
+    args = parser.parse_args()
+
+    cases = [
+        ("untraced", lambda: None),
+        ("errors only", lambda: JsonlTracer(io.StringIO(), events=('error',))),
+        ("count calls", Counter),
+        ("jsonl calls 1/100", lambda: SamplingTracer(JsonlTracer(io.StringIO()), every=100)),
+        ("jsonl calls", lambda: JsonlTracer(io.StringIO())),
+        ("jsonl everything 1/100", lambda: SamplingTracer(JsonlTracer(io.StringIO(), events=(
+            'enter', 'call', 'return', 'define', 'error')), every=100)),
+    ]
+    print(f"(fib {args.n}), JIT off, best of {RUNS}")
+    print(f"{'':>24} {'compile':>9} {'eval':>9}")
+    baseline = {}
+    for name, make_tracer in cases:
+        row = []
+        for engine in ('compile', 'eval'):
+            elapsed = time_fib(args.n, engine, make_tracer)
+            baseline.setdefault(engine, elapsed)
+            row.append(f"{elapsed:>7.3f}s {elapsed / baseline[engine]:>4.1f}x")
+        print(f"{name:>24} {'  '.join(row)}")
+
+
+if __name__ == '__main__':
+    main()
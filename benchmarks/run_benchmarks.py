@@ -0,0 +1,166 @@
+"""Run the .sy programs in benchmarks/corpus and compare them with a saved baseline.
+
+For each program it reports the parse time, the best wall time of running
+the parsed forms in a fresh interpreter, runs per second and peak traced
+memory. Results can be saved as JSON and later runs compared against them.
+
+Run with:
+    python benchmarks/run_benchmarks.py --output baseline.json
+    python benchmarks/run_benchmarks.py --baseline baseline.json [--threshold 0.1]
+
+The exit status is 1 if any benchmark got slower than the baseline by more
+than the threshold.
+"""
+import argparse
+import gc
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+CORPUS_DIR = os.path.join(BENCH_DIR, 'corpus')
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from bench_parse import generate  # noqa: E402
+from sython_extended import SythonExtended  # noqa: E402
+from sython_interpreter import __version__  # noqa: E402
+from sython_reader import iter_tokens  # noqa: E402
+
+PARSE_SIZE = 1 << 20  # bytes of generated source for the large-file parse
+COMPARED = ('wall', 'parse')
+NOISE_FLOOR = 0.005  # seconds; shorter timings are reported but never flagged
+
+
+def load_corpus(names=None):
+    """(name, source) for each corpus program, plus the generated large file."""
+    programs = []
+    for filename in sorted(os.listdir(CORPUS_DIR)):
+        if filename.endswith('.sy'):
+            with open(os.path.join(CORPUS_DIR, filename)) as f:
+                programs.append((filename[:-3], f.read()))
+    programs.append(('parse_large', generate(PARSE_SIZE)))
+    if names:
+        programs = [(name, source) for name, source in programs if name in names]
+    return programs
+
+
+def parse(sython, source):
+    return list(sython.read_forms(iter_tokens(io.StringIO(source))))
+
+
+def execute(sython, forms):
+    result = None
+    for expr in forms:
+        result = sython.execute(expr)
+    return result
+
+
+def measure(source, repeat, options):
+    parse_times, wall_times = [], []
+    forms = result = None
+    for _ in range(repeat):
+        sython = SythonExtended(**options)
+        gc.collect()  # don't bill one run for the garbage of the last
+        start = time.perf_counter()
+        forms = parse(sython, source)
+        parse_times.append(time.perf_counter() - start)
+
+        sython = SythonExtended(**options)
+        gc.collect()
+        start = time.perf_counter()
+        result = execute(sython, forms)
+        wall_times.append(time.perf_counter() - start)
+
+    # One more run under tracemalloc, which slows everything down
+    tracemalloc.start()
+    sython = SythonExtended(**options)
+    execute(sython, parse(sython, source))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    wall = min(wall_times)
+    return {
+        'wall': wall,
+        'parse': min(parse_times),
+        'ops_per_sec': 1 / wall if wall else None,
+        'peak_kb': peak / 1024,
+        'forms': len(forms),
+        'result': repr(result),
+    }
+
+
+def compare(results, baseline, threshold):
+    """Print each benchmark's change against the baseline; return the regressed names."""
+    regressions = []
+    print(f"\n{'benchmark':<14} {'metric':<6} {'baseline':>10} {'now':>10} {'change':>8}")
+    for name, now in results.items():
+        before = baseline.get(name)
+        if before is None:
+            print(f"{name:<14} (not in baseline)")
+            continue
+        for metric in COMPARED:
+            if not before[metric]:
+                continue
+            change = now[metric] / before[metric] - 1
+            flag = ''
+            if change > threshold and now[metric] >= NOISE_FLOOR:
+                flag = '  REGRESSION'
+                if name not in regressions:
+                    regressions.append(name)
+            print(f"{name:<14} {metric:<6} {before[metric]:>9.4f}s {now[metric]:>9.4f}s {change:>+7.1%}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Sython benchmark corpus.")
+    parser.add_argument('names', nargs='*', help="benchmarks to run (default: all)")
+    parser.add_argument('--repeat', type=int, default=5, help="runs per benchmark; the best is kept")
+    parser.add_argument('--engine', default='compile', choices=('compile', 'eval'))
+    parser.add_argument('--no-jit', action='store_true')
+    parser.add_argument('-O', dest='optimize', type=int, default=0, choices=(0, 1, 2), metavar='LEVEL',
+                        help="optimizer level")
+    parser.add_argument('--output', metavar='FILE', help="write the results as JSON")
+    parser.add_argument('--baseline', metavar='FILE', help="compare against results saved with --output")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="fraction slower than the baseline that counts as a regression")
+    args = parser.parse_args(argv)
+
+    options = {'engine': args.engine, 'jit': not args.no_jit, 'optimize': args.optimize}
+    results = {}
+    print(f"{'benchmark':<14} {'parse':>9} {'wall':>9} {'runs/s':>9} {'peak KB':>10}")
+    for name, source in load_corpus(args.names):
+        stats = results[name] = measure(source, args.repeat, options)
+        print(f"{name:<14} {stats['parse']:>8.4f}s {stats['wall']:>8.4f}s "
+              f"{stats['ops_per_sec'] or 0:>9.1f} {stats['peak_kb']:>10.0f}")
+
+    if args.output:
+        report = {
+            'meta': {
+                'sython': __version__,
+                'python': platform.python_version(),
+                'implementation': platform.python_implementation(),
+                'machine': platform.machine(),
+                'repeat': args.repeat,
+                **options,
+            },
+            'benchmarks': results,
+        }
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if any(baseline['meta'].get(key) != value for key, value in options.items()):
+            print("warning: the baseline was recorded with different interpreter options")
+        if compare(results, baseline['benchmarks'], args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,5 +1,12 @@
+import argparse
+import os
 import sys
+import sython_batch
+import sython_cache
 from sython_extended import SythonExtended  # Import your interpreter class
+from sython_optimizer import OPTIMIZE_LEVELS
+from sython_reader import iter_tokens
+from sython_trace import JsonlTracer, SamplingTracer
 
 def repl():
     """Basic REPL for the Sython interpreter."""
@@ -16,26 +23,114 @@ def repl():
         except Exception as e:
             print(f"Error: {e}")
 
-def run_script(file_path):
-    """Run a .sy script file."""
-    sython = SythonExtended(debug=True)  # Instantiate the interpreter
-    with open(file_path, 'r') as f:
-        code = f.read()
-    result = sython.run(code)  # Use the instance's run method
+def run_script(file_path, use_cache=True, profile=False, stacks_path=None, optimize=0, tracer=None):
+    """Run a .sy script file.
+
+    Parsed forms are cached on disk keyed by the script's content, so later
+    runs of an unchanged script skip tokenizing and parsing; so are those of
+    the modules it imports, which are looked for next to it first. With profile
+    set, a per-function report is printed after the script finishes, and
+    collapsed stacks for flame graphs are written to stacks_path if given.
+    optimize is the optimizer level, 0 to 2, and tracer receives trace events.
+    """
+    sython = SythonExtended(optimize=optimize, tracer=tracer)  # Instantiate the interpreter
+    sython.module_path = (os.path.dirname(os.path.abspath(file_path)),) + sython.module_path
+    sython.cache_modules = use_cache
+    if profile or stacks_path:
+        sython.start_profiling()
+    digest = sython_cache.script_digest(file_path) if use_cache else None
+    forms = sython_cache.load(file_path, digest) if use_cache else None
+    if forms is not None:
+        result = sython.run_forms(forms)
+    else:
+        with open(file_path, 'r') as f:
+            expressions = sython.read_forms(iter_tokens(f))  # Evaluate each form as soon as it is read
+            if use_cache:
+                forms = []
+                expressions = _collecting(expressions, forms)
+            result = sython.run_forms(expressions)
+        if use_cache:
+            sython_cache.store(file_path, digest, forms)
+    profiler = sython.stop_profiling()
     if result is not None:
         print(result)
+    if profile:
+        print(profiler.report())
+    if stacks_path:
+        with open(stacks_path, 'w') as f:
+            f.write('\n'.join(profiler.collapsed_stacks()) + '\n')
+
+def run_batch(directory, jobs=None, report_path=None, use_cache=True, optimize=0):
+    """Run every .sy script under directory over a pool of worker processes.
+
+    A JSON line per script, with its result, output and error, goes to
+    report_path, or to stdout without one; the throughput is printed after.
+    """
+    scripts = sython_batch.find_scripts(directory)
+    report = open(report_path, 'w') if report_path else sys.stdout
+    try:
+        summary = sython_batch.run_batch(scripts, jobs, report, use_cache, {'optimize': optimize})
+    finally:
+        if report_path:
+            report.close()
+    print(f"Ran {summary['scripts']} script(s), {summary['failed']} failed, in {summary['seconds']:.2f}s "
+          f"({summary['scripts_per_second']:.1f} scripts/s)", file=sys.stdout if report_path else sys.stderr)
+    return summary
+
+def _collecting(expressions, forms):
+    # Running a form leaves it as parsed: literals evaluate to copies of what it holds
+    for expr in expressions:
+        forms.append(expr)
+        yield expr
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='sython.py', description="Run a .sy script, or start the REPL without one.")
+    parser.add_argument('script', nargs='?', help="path to a .sy script")
+    parser.add_argument('--no-cache', action='store_true', help="don't read or write the parsed-script cache")
+    parser.add_argument('--clear-cache', action='store_true',
+                        help="remove the cached forms of the script (or the whole cache directory without one)")
+    parser.add_argument('--profile', action='store_true',
+                        help="print the calls and time spent in each function after the script runs")
+    parser.add_argument('--profile-stacks', metavar='FILE',
+                        help="write collapsed call stacks to FILE, for flame graph tools")
+    parser.add_argument('-O', dest='optimize', type=int, choices=OPTIMIZE_LEVELS, default=0, metavar='LEVEL',
+                        help="optimize before running: -O1 folds constants and dead branches, "
+                             "-O2 also inlines primitives and resolves variable references (default -O0)")
+    parser.add_argument('--batch', metavar='DIR', help="run every .sy script under DIR and report on each")
+    parser.add_argument('-j', '--jobs', type=int, metavar='N',
+                        help="worker processes for --batch (default: one per CPU)")
+    parser.add_argument('--report', metavar='FILE', help="write the --batch report to FILE instead of stdout")
+    parser.add_argument('--trace', metavar='FILE',
+                        help="write calls, returns, defines and errors to FILE as JSON lines")
+    parser.add_argument('--trace-every', type=int, default=1, metavar='N',
+                        help="write only every Nth call and return to the --trace file (default 1)")
+    args = parser.parse_args(argv)
 
-def main():
-    if len(sys.argv) > 1:
+    if args.clear_cache:
+        removed = sython_cache.clear(args.script)
+        if args.script is None:
+            print(f"Removed {removed} cached script(s)")
+            return
+    if args.batch is not None:
+        run_batch(args.batch, args.jobs, args.report, use_cache=not args.no_cache, optimize=args.optimize)
+    elif args.script is not None:
         # If a file is provided, run the script
-        script_path = sys.argv[1]
-        if script_path.endswith(".sy"):
-            run_script(script_path)
+        if args.script.endswith(".sy"):
+            trace_file = open(args.trace, 'w') if args.trace else None
+            tracer = JsonlTracer(trace_file) if trace_file else None
+            if tracer is not None and args.trace_every > 1:
+                tracer = SamplingTracer(tracer, args.trace_every)
+            try:
+                run_script(args.script, use_cache=not args.no_cache, profile=args.profile,
+                           stacks_path=args.profile_stacks, optimize=args.optimize, tracer=tracer)
+            finally:
+                if trace_file:
+                    trace_file.close()
         else:
-            print(f"Error: {script_path} is not a .sy file")
+            print(f"Error: {args.script} is not a .sy file")
     else:
         # No arguments provided, launch REPL
         repl()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
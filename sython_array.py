@@ -0,0 +1,230 @@
+import math
+import operator
+from array import array
+from itertools import repeat
+
+try:
+    import numpy
+except ImportError:  # fall back to the standard library's typed arrays
+    numpy = None
+
+
+class SythonArray:
+    """A fixed-length vector of floats whose arithmetic works on all elements at once.
+
+    Backed by a NumPy float64 array when NumPy is installed, otherwise by
+    array.array('d'). Binary operators broadcast a number over every element
+    or combine two arrays of the same length element by element. Comparisons
+    are element-wise too and yield arrays of 1.0 and 0.0.
+    """
+    __slots__ = ('data',)
+
+    def __init__(self, values=()):
+        if numpy is not None:
+            self.data = numpy.asarray(values, dtype=numpy.float64)
+        elif isinstance(values, array) and values.typecode == 'd':
+            self.data = values
+        else:
+            self.data = array('d', values)
+
+    @classmethod
+    def wrap(cls, data):
+        """Wrap backend data without copying it."""
+        result = cls.__new__(cls)
+        result.data = data
+        return result
+
+    def __len__(self):
+        return len(self.data)
+
+    def __iter__(self):
+        return iter(self.data.tolist() if numpy is not None else self.data)
+
+    def tolist(self):
+        return self.data.tolist()
+
+    def _binary(self, other, op, reflected=False):
+        if numpy is not None:
+            other = other.data if type(other) is SythonArray else other
+            return SythonArray.wrap(op(other, self.data) if reflected else op(self.data, other))
+        if type(other) is SythonArray:
+            if len(other) != len(self):
+                raise ValueError(f"Arrays must have the same length, got {len(self)} and {len(other)}")
+            other = other.data
+        else:
+            other = repeat(other, len(self.data))
+        values = map(op, other, self.data) if reflected else map(op, self.data, other)
+        return SythonArray.wrap(array('d', values))
+
+    def __add__(self, other):
+        return self._binary(other, operator.add)
+
+    def __radd__(self, other):
+        return self._binary(other, operator.add, True)
+
+    def __sub__(self, other):
+        return self._binary(other, operator.sub)
+
+    def __rsub__(self, other):
+        return self._binary(other, operator.sub, True)
+
+    def __mul__(self, other):
+        return self._binary(other, operator.mul)
+
+    def __rmul__(self, other):
+        return self._binary(other, operator.mul, True)
+
+    def __truediv__(self, other):
+        return self._binary(other, operator.truediv)
+
+    def __rtruediv__(self, other):
+        return self._binary(other, operator.truediv, True)
+
+    def __mod__(self, other):
+        return self._binary(other, operator.mod)
+
+    def __rmod__(self, other):
+        return self._binary(other, operator.mod, True)
+
+    def _compare(self, other, op):
+        result = self._binary(other, op)
+        if numpy is not None:
+            result.data = result.data.astype(numpy.float64)
+        return result
+
+    def __eq__(self, other):
+        return self._compare(other, operator.eq)
+
+    def __ne__(self, other):
+        return self._compare(other, operator.ne)
+
+    def __lt__(self, other):
+        return self._compare(other, operator.lt)
+
+    def __le__(self, other):
+        return self._compare(other, operator.le)
+
+    def __gt__(self, other):
+        return self._compare(other, operator.gt)
+
+    def __ge__(self, other):
+        return self._compare(other, operator.ge)
+
+    __hash__ = None
+
+    def __bool__(self):
+        raise TypeError("The truth value of an array is ambiguous; reduce it with sum, min or max first")
+
+    def map(self, scalar_fn, numpy_fn=None):
+        """Apply a one-argument function to every element in a single bulk operation."""
+        if numpy is not None and numpy_fn is not None:
+            return SythonArray.wrap(numpy_fn(self.data))
+        return SythonArray.wrap(array('d', map(scalar_fn, self)))
+
+    def any_zero(self):
+        if numpy is not None:
+            return not self.data.all()
+        return 0.0 in self.data
+
+    def __repr__(self):
+        return f"#f64({' '.join(map(str, self))})"
+
+
+NUMERIC_TYPES = (int, float, SythonArray)
+
+
+def is_zero(value):
+    """True if value is zero, or is an array with a zero element."""
+    if type(value) is SythonArray:
+        return value.any_zero()
+    return value == 0
+
+
+def vectorize(scalar_fn, numpy_name):
+    """Make a one-argument math function also apply element-wise to arrays."""
+    numpy_fn = getattr(numpy, numpy_name) if numpy is not None else None
+
+    def fn(x):
+        if type(x) is SythonArray:
+            return x.map(scalar_fn, numpy_fn)
+        return scalar_fn(x)
+    fn.__name__ = numpy_name
+    return fn
+
+
+def array_log(x, base=math.e):
+    if type(x) is SythonArray:
+        if numpy is not None:
+            return SythonArray.wrap(numpy.log(x.data) / math.log(base))
+        return x.map(lambda v: math.log(v, base))
+    return math.log(x, base)
+
+
+def array_pow(x, y):
+    if type(x) is SythonArray or type(y) is SythonArray:
+        if numpy is not None:
+            x = x.data if type(x) is SythonArray else x
+            y = y.data if type(y) is SythonArray else y
+            return SythonArray.wrap(numpy.power(x, y, dtype=numpy.float64))
+        if type(x) is SythonArray:
+            return x._binary(y, math.pow)
+        return y._binary(x, math.pow, True)
+    return math.pow(x, y)
+
+
+def _values(x, name):
+    if type(x) is SythonArray:
+        return x
+    try:
+        return list(x)
+    except TypeError:
+        raise TypeError(f"{name} expects an array or a list of numbers, got: {x}") from None
+
+
+def array_sum(x):
+    if type(x) is SythonArray:
+        return float(x.data.sum()) if numpy is not None else math.fsum(x.data)
+    return sum(_values(x, 'sum'))
+
+
+def array_min(x):
+    if type(x) is SythonArray and numpy is not None and len(x):
+        return float(x.data.min())
+    values = _values(x, 'min')
+    if not len(values):
+        raise ValueError("min of an empty sequence")
+    return min(values)
+
+
+def array_max(x):
+    if type(x) is SythonArray and numpy is not None and len(x):
+        return float(x.data.max())
+    values = _values(x, 'max')
+    if not len(values):
+        raise ValueError("max of an empty sequence")
+    return max(values)
+
+
+def array_mean(x):
+    values = _values(x, 'mean')
+    if not len(values):
+        raise ValueError("mean of an empty sequence")
+    return array_sum(values) / len(values)
+
+
+def array_range(start, stop=None, step=1):
+    """Array of start, start + step, ... below stop; (array-range n) counts from 0."""
+    if stop is None:
+        start, stop = 0, start
+    if numpy is not None:
+        return SythonArray.wrap(numpy.arange(start, stop, step, dtype=numpy.float64))
+    if step == 0:
+        raise ValueError("array-range step must not be zero")
+    count = max(0, math.ceil((stop - start) / step))
+    return SythonArray.wrap(array('d', (start + i * step for i in range(count))))
+
+
+def array_ref(arr, index):
+    if type(arr) is not SythonArray:
+        raise TypeError(f"array-ref expects an array, got: {arr}")
+    return float(arr.data[index])
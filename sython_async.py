@@ -0,0 +1,151 @@
+import asyncio
+import time
+
+from Symbol import String, Symbol
+from sython_collections import Vector
+from sython_environment import Environment
+from sython_jit import CompiledProcedure
+from sython_optimizer import Builtin, Folded, LocalRef
+from sython_procedure import Procedure
+from sython_reader import iter_tokens
+
+YIELD_INTERVAL = 1000  # evaluation steps between giving other tasks a turn
+
+
+class AsyncPrimitive:
+    """A primitive implemented by a coroutine function, awaited by run_async.
+
+    Code run synchronously, such as a function passed to map, can't await
+    it: calling it there runs blocking if given, or raises TypeError.
+    """
+    __slots__ = ('name', 'function', 'blocking')
+
+    def __init__(self, name, function, blocking=None):
+        self.name = name
+        self.function = function
+        self.blocking = blocking
+
+    def __call__(self, *args):
+        if self.blocking is None:
+            raise TypeError(f"Async primitive '{self.name}' can only be called from code run by run_async")
+        return self.blocking(*args)
+
+    def __repr__(self):
+        return f"<async primitive {self.name}>"
+
+
+class SythonAsyncMixin:
+    """Run programs as coroutines, so many scripts can share one event loop.
+
+    run_async walks the parsed expressions like the eval engine, whatever
+    engine the interpreter was created with, and awaits async primitives
+    called from them. Every YIELD_INTERVAL steps it lets the event loop run
+    other tasks, so a long computation doesn't hold up the scripts waiting
+    on I/O. Special forms evaluate their parts with their evaluate_async
+    handler if they have one and their synchronous handler otherwise.
+    """
+
+    def add_async_library(self, env):
+        env['sleep'] = AsyncPrimitive('sleep', asyncio.sleep, time.sleep)
+
+    def register_async_builtin(self, name, function, blocking=None):
+        """Bind name to a coroutine function the program can call like any primitive."""
+        primitive = AsyncPrimitive(name, function, blocking)
+        self.env[Symbol(name)] = primitive
+        return primitive
+
+    async def run_async(self, program):
+        """Run a program like run, awaiting async primitives; returns the last result."""
+        result = None
+        try:
+            for expr in list(self.read_forms(iter_tokens(program))):
+                env = self.env
+                if self.optimizer is not None:
+                    expr = self.optimizer.optimize(expr, env)
+                result = await self.evaluate_async(expr, env)
+                if result is not None:
+                    self.output.write(f"{result}\n")
+        except Exception as error:
+            if 'error' in self.trace_events:
+                self.tracer.on_error(error, self.line_number)
+            raise
+        finally:
+            self.output.flush()
+        return result
+
+    async def evaluate_async(self, expr, env=None):
+        if env is None:
+            env = self.env
+        while True:  # Loop on tail positions, as evaluate does
+            self._async_steps -= 1
+            if not self._async_steps:
+                self._async_steps = YIELD_INTERVAL
+                await asyncio.sleep(0)
+
+            if isinstance(expr, str):  # variable reference or string
+                if type(expr) is String:
+                    return expr
+                return env[expr]
+            elif not isinstance(expr, list):  # constant literal
+                if type(expr) is LocalRef:
+                    return expr.lookup(env)
+                elif type(expr) is Builtin:
+                    if self.rebound_builtins and expr.name in self.rebound_builtins:
+                        return env[expr.name]
+                    return expr.value
+                elif type(expr) is Folded:
+                    rebound = self.rebound_builtins
+                    expr = expr.expr if rebound and not rebound.isdisjoint(expr.names) else expr.value
+                    continue
+                elif type(expr) is Vector:
+                    return expr.copy()
+                return expr
+            op = expr[0]
+
+            if isinstance(op, str):
+                form = self.special_forms.get(op)
+                if form is not None:
+                    handler = form.evaluate_async
+                    value = form.evaluate(expr, env) if handler is None else await handler(expr, env)
+                    if form.tail:
+                        expr = value
+                        continue
+                    return value
+
+            # Function call; names and numbers are looked up without another coroutine
+            proc = env[op] if type(op) is Symbol else await self.evaluate_async(op, env)
+            args = []
+            for arg in expr[1:]:
+                kind = type(arg)
+                if kind is Symbol:
+                    args.append(env[arg])
+                elif kind is int or kind is float:
+                    args.append(arg)
+                else:
+                    args.append(await self.evaluate_async(arg, env))
+            kind = type(proc)
+            if isinstance(proc, CompiledProcedure):
+                proc = proc.procedure  # translated by the JIT, which can't await
+                kind = Procedure
+            if kind is Procedure:
+                expr, env = proc.body, Environment(zip(proc.params, args), proc.env)
+                continue
+            if kind is AsyncPrimitive:
+                return await proc.function(*args)
+            return proc(*args)
+
+    async def _eval_define_async(self, expr, env):
+        if isinstance(expr[1], list):  # nothing to evaluate for a function definition
+            return self._eval_define(expr, env)
+        _, var, exp = expr
+        env[var] = await self.evaluate_async(exp, env)
+        self.assigned(var)
+
+    async def _eval_if_async(self, expr, env):
+        _, condition, then_expr, else_expr = expr
+        return then_expr if await self.evaluate_async(condition, env) else else_expr
+
+    async def _eval_set_async(self, expr, env):
+        _, var, exp = expr
+        env.set(var, await self.evaluate_async(exp, env))
+        self.assigned(var)
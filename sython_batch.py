@@ -0,0 +1,110 @@
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import sython_cache
+import sython_parallel
+from sython_extended import SythonExtended
+from sython_reader import iter_tokens
+
+_snapshot = None  # the worker's loaded interpreter, forked for each script
+
+
+def find_scripts(directory):
+    """The .sy files under directory, in sorted order."""
+    scripts = []
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = sorted(d for d in dirs if d != sython_cache.CACHE_DIR_NAME)
+        scripts.extend(os.path.join(root, name) for name in sorted(files) if name.endswith('.sy'))
+    return scripts
+
+
+def run_one(snapshot, path, use_cache=True):
+    """Run the script at path in a fork of snapshot; returns its report record."""
+    record = {'script': path, 'ok': True, 'result': None, 'stdout': '', 'error': None}
+    stdout = io.StringIO()
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(stdout):
+            sython = snapshot.fork()
+            try:
+                sython.module_path = (os.path.dirname(os.path.abspath(path)),) + sython.module_path
+                sython.cache_modules = use_cache
+                result = sython.run_forms(_load_forms(sython, path, use_cache))
+            finally:
+                sython.close()  # the pmap workers the script started, if any
+        if result is not None:
+            record['result'] = str(result)
+    except Exception as e:
+        record['ok'] = False
+        record['error'] = f"{type(e).__name__}: {e}"
+    record['stdout'] = stdout.getvalue()
+    record['seconds'] = time.perf_counter() - start
+    return record
+
+
+def _load_forms(sython, path, use_cache):
+    digest = sython_cache.script_digest(path) if use_cache else None
+    forms = sython_cache.load(path, digest) if use_cache else None
+    if forms is None:
+        with open(path, 'r') as f:
+            forms = list(sython.read_forms(iter_tokens(f)))
+        if use_cache:
+            sython_cache.store(path, digest, forms)
+    return forms
+
+
+def _snapshot_with_libraries(sython):
+    # Installed once before the snapshot, instead of again in every fork that uses one
+    for library in sython.libraries:
+        if library not in sython.loaded_libraries:
+            sython.load_library(library)
+    return sython.snapshot()
+
+
+def _init_batch_worker(options):
+    global _snapshot
+    sython_parallel._init_worker(SythonExtended, options)
+    _snapshot = _snapshot_with_libraries(sython_parallel.worker_interpreter())
+
+
+def _run_in_worker(path, use_cache):
+    return run_one(_snapshot, path, use_cache)
+
+
+def run_batch(scripts, jobs=None, report=None, use_cache=True, options=None):
+    """Run many scripts over jobs worker processes and write a JSON line per script to report.
+
+    Each worker loads a SythonExtended once and runs every script it is
+    given in a fresh fork of it, so nothing one script defines is seen by the
+    next. Built-in libraries are installed before forking. Modules the scripts import are parsed once per worker. Records are
+    written in the order of scripts as they finish. With jobs 1 the scripts
+    run in this process. Returns a summary of the run.
+    """
+    options = options or {}
+    jobs = jobs or os.cpu_count() or 1
+    report = report or sys.stdout
+    summary = {'scripts': 0, 'failed': 0}
+    start = time.perf_counter()
+    if jobs == 1:
+        snapshot = _snapshot_with_libraries(SythonExtended(**options))
+        records = (run_one(snapshot, path, use_cache) for path in scripts)
+        _write_records(records, report, summary)
+    else:
+        with ProcessPoolExecutor(jobs, initializer=_init_batch_worker, initargs=(options,)) as executor:
+            records = executor.map(_run_in_worker, scripts, [use_cache] * len(scripts))
+            _write_records(records, report, summary)
+    summary['seconds'] = time.perf_counter() - start
+    summary['scripts_per_second'] = summary['scripts'] / summary['seconds'] if summary['seconds'] else 0.0
+    return summary
+
+
+def _write_records(records, report, summary):
+    for record in records:
+        report.write(json.dumps(record) + '\n')
+        summary['scripts'] += 1
+        summary['failed'] += not record['ok']
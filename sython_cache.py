@@ -0,0 +1,89 @@
+import hashlib
+import os
+import pickle
+import sys
+
+from sython_interpreter import __version__
+
+MAGIC = b'SYC2'
+CACHE_DIR_NAME = '__sycache__'
+CACHE_SUFFIX = '.syc'
+
+# Anything that changes the shape of parsed forms must change this key
+VERSION_KEY = f'sython-{__version__}-py{sys.version_info[0]}.{sys.version_info[1]}'.encode()
+
+
+def cache_dir_for(script_path):
+    """Directory holding cached forms for script_path.
+
+    $SYTHON_CACHE_DIR if set, otherwise __sycache__ next to the script.
+    """
+    return os.environ.get('SYTHON_CACHE_DIR') or os.path.join(
+        os.path.dirname(os.path.abspath(script_path)), CACHE_DIR_NAME)
+
+
+def cache_path(script_path):
+    name = os.path.splitext(os.path.basename(script_path))[0]
+    return os.path.join(cache_dir_for(script_path), name + CACHE_SUFFIX)
+
+
+def script_digest(script_path, block_size=1 << 20):
+    """Key a cache entry by the script's content and the interpreter version."""
+    digest = hashlib.sha256(VERSION_KEY + b'\0')
+    with open(script_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.digest()
+
+
+def load(script_path, digest):
+    """Return the cached parsed forms for a script with this digest, or None on a miss."""
+    try:
+        with open(cache_path(script_path), 'rb') as f:
+            header = f.read(len(MAGIC) + len(digest))
+            if header != MAGIC + digest:
+                return None
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return None
+
+
+def store(script_path, digest, forms):
+    """Write parsed forms for a script; failures (e.g. read-only dirs) are ignored."""
+    path = cache_path(script_path)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            f.write(MAGIC + digest)
+            pickle.dump(forms, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)  # readers never see a half-written file
+    except (OSError, pickle.PicklingError, RecursionError):
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def clear(script_path=None, cache_dir=None):
+    """Remove the cache entry for script_path, or every entry in cache_dir.
+
+    Returns the number of files removed.
+    """
+    if script_path is not None:
+        paths = [cache_path(script_path)]
+    else:
+        cache_dir = cache_dir or os.environ.get('SYTHON_CACHE_DIR') or CACHE_DIR_NAME
+        try:
+            paths = [os.path.join(cache_dir, name) for name in os.listdir(cache_dir)
+                     if name.endswith(CACHE_SUFFIX)]
+        except OSError:
+            paths = []
+    removed = 0
+    for path in paths:
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError:
+            pass
+    return removed
@@ -0,0 +1,185 @@
+from sython_pair import NIL, Pair, from_iterable
+
+
+class Vector:
+    """A fixed-length, mutable sequence with O(1) indexed access: #(1 2 3).
+
+    Not a Python list, which the evaluator would take for a call; a vector
+    in source code is a constant like a number. Vectors compare equal to
+    Python lists and tuples with equal elements, as lists do.
+    """
+    __slots__ = ('items',)
+
+    def __init__(self, items=()):
+        self.items = list(items)
+
+    def copy(self):
+        """A new vector with the same elements, nested vectors copied too.
+
+        What a vector literal evaluates to, so changing the result doesn't
+        change the program.
+        """
+        return Vector(item.copy() if type(item) is Vector else item for item in self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __eq__(self, other):
+        if type(other) is Vector:
+            return self.items == other.items
+        if isinstance(other, (list, tuple)):
+            return self.items == list(other)
+        return NotImplemented
+
+    __hash__ = None  # mutable
+
+    def __repr__(self):
+        return f"#({' '.join(map(str, self.items))})"
+
+
+class HashTable(dict):
+    """A mutable table from keys to values with O(1) lookup and update.
+
+    Keys are compared by type and value, so numbers, strings, symbols and
+    lists all work as keys, and "a" and 'a, or 1, 1.0 and #t, are different
+    keys. Entries are stored under (type, key).
+    """
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        return dict.__getitem__(self, (type(key), key))
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, (type(key), key), value)
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, (type(key), key))
+
+    def __contains__(self, key):
+        return dict.__contains__(self, (type(key), key))
+
+    def get(self, key, default=None):
+        return dict.get(self, (type(key), key), default)
+
+    def pop(self, key, *default):
+        return dict.pop(self, (type(key), key), *default)
+
+    def __iter__(self):
+        return (key for _, key in dict.__iter__(self))
+
+    def keys(self):
+        return list(self)
+
+    def items(self):
+        return [(key, value) for (_, key), value in dict.items(self)]
+
+    def entries(self):
+        """The (key value) lists of the table, in insertion order."""
+        return from_iterable(Pair(key, Pair(value, NIL)) for key, value in self.items())
+
+    def __repr__(self):
+        return f"#hash({' '.join(str(Pair(key, value)) for key, value in self.items())})"
+
+
+class SythonCollectionsMixin:
+    """Vectors and hash tables.
+
+    map over a vector gives a vector, and over a hash table calls the
+    function with each key and value and gives a list. Indexing outside a
+    vector raises IndexError and looking up a missing key without a default
+    raises KeyError.
+    """
+
+    def add_collections_library(self, env):
+        env['make-vector'] = lambda n, fill=0: Vector([fill] * n)
+        env['vector'] = lambda *items: Vector(items)
+        env['vector?'] = lambda x: type(x) is Vector
+        env['vector-length'] = self._vector_length
+        env['vector-ref'] = self._vector_ref
+        env['vector-set!'] = self._vector_set
+        env['vector->list'] = self._vector_to_list
+        env['list->vector'] = lambda lst: Vector(lst)
+
+        env['make-hash-table'] = HashTable
+        env['hash-table?'] = lambda x: type(x) is HashTable
+        env['hash-ref'] = self._hash_ref
+        env['hash-set!'] = self._hash_set
+        env['hash-update!'] = self._hash_update
+        env['hash-has-key?'] = self._hash_has_key
+        env['hash-remove!'] = self._hash_remove
+        env['hash-count'] = self._hash_count
+        env['hash-keys'] = self._hash_keys
+        env['hash-values'] = self._hash_values
+        env['hash->list'] = self._hash_to_list
+        env['hash-for-each'] = self._hash_for_each
+
+    def _check_vector(self, v, name):
+        if type(v) is not Vector:
+            raise TypeError(f"{name} expects a vector, got: {v} at line {self.line_number}")
+        return v
+
+    def _check_index(self, v, index, name):
+        items = self._check_vector(v, name).items
+        if type(index) is not int or not 0 <= index < len(items):
+            raise IndexError(f"{name}: index {index} out of range for a vector of length {len(items)} "
+                             f"at line {self.line_number}")
+        return items
+
+    def _vector_length(self, v):
+        return len(self._check_vector(v, 'vector-length').items)
+
+    def _vector_ref(self, v, index):
+        return self._check_index(v, index, 'vector-ref')[index]
+
+    def _vector_set(self, v, index, value):
+        self._check_index(v, index, 'vector-set!')[index] = value
+
+    def _vector_to_list(self, v):
+        return from_iterable(self._check_vector(v, 'vector->list').items)
+
+    def _check_table(self, table, name):
+        if type(table) is not HashTable:
+            raise TypeError(f"{name} expects a hash table, got: {table} at line {self.line_number}")
+        return table
+
+    def _hash_ref(self, table, key, *default):
+        """(hash-ref table key [default]): the value for key, or default if it has none."""
+        try:
+            return self._check_table(table, 'hash-ref')[key]
+        except KeyError:
+            if default:
+                return default[0]
+            raise KeyError(f"hash-ref: no value for key {key} at line {self.line_number}") from None
+
+    def _hash_has_key(self, table, key):
+        return key in self._check_table(table, 'hash-has-key?')
+
+    def _hash_count(self, table):
+        return len(self._check_table(table, 'hash-count'))
+
+    def _hash_keys(self, table):
+        return from_iterable(self._check_table(table, 'hash-keys'))
+
+    def _hash_values(self, table):
+        return from_iterable(self._check_table(table, 'hash-values').values())
+
+    def _hash_to_list(self, table):
+        return self._check_table(table, 'hash->list').entries()
+
+    def _hash_set(self, table, key, value):
+        self._check_table(table, 'hash-set!')[key] = value
+
+    def _hash_update(self, table, key, func, *default):
+        """(hash-update! table key func [default]): set key to func of its value, or of default."""
+        self._check_table(table, 'hash-update!')[key] = func(self._hash_ref(table, key, *default))
+
+    def _hash_remove(self, table, key):
+        self._check_table(table, 'hash-remove!').pop(key, None)
+
+    def _hash_for_each(self, table, func):
+        """Call (func key value) for every entry, in insertion order."""
+        for key, value in list(self._check_table(table, 'hash-for-each').items()):
+            func(key, value)
@@ -0,0 +1,293 @@
+from Symbol import String
+from sython_environment import Environment
+from sython_procedure import Procedure, TailCall, call_procedure, run_tail_calls
+from sython_pair import to_datum
+from sython_collections import Vector
+from sython_memo import MemoizedProcedure
+from sython_numeric import NUMBER_TYPES, NUMERIC_OPERATORS
+from sython_stream import Promise
+from sython_optimizer import Builtin, Folded, LocalRef
+from sython_trace import CALL_EVENTS, traced_code
+
+
+class SythonCompilerMixin:
+    """Compile parsed expressions into trees of Python closures.
+
+    Each closure takes an environment and returns the value of its
+    expression. Special forms are looked up in the interpreter's
+    special_forms table once, at compile time, so running the compiled tree
+    only does the work that depends on the environment.
+
+    Calls in tail position of a procedure body return a TailCall instead of
+    recursing; Procedure.__call__ unwinds them in a loop.
+    """
+
+    def compile(self, expr, tail=False):
+        """Compile a parsed expression into a closure taking an environment."""
+        if isinstance(expr, str):  # variable reference or string
+            if type(expr) is String:
+                value = expr
+                return lambda env: value
+            name = expr
+            return lambda env: env[name]
+        elif not isinstance(expr, list):  # constant literal
+            if type(expr) is LocalRef:
+                return self._compile_local_ref(expr)
+            elif type(expr) is Vector:
+                return lambda env: expr.copy()  # a fresh vector each time, as for (vector ...)
+            elif type(expr) is Builtin:
+                return self._compile_builtin_ref(expr)
+            elif type(expr) is Folded:
+                return self._compile_folded(expr, tail)
+            value = expr
+            return lambda env: value
+
+        op = expr[0]
+        if isinstance(op, str):
+            form = self.special_forms.get(op)
+            if form is not None:
+                return form.compile(expr, tail)
+            if op in NUMERIC_OPERATORS:
+                return self._compile_numeric(expr, tail)
+        elif type(op) is Builtin and op.name in NUMERIC_OPERATORS:
+            return self._compile_numeric(expr, tail)
+        return self._compile_call(expr, tail)
+
+    def _compile_traced(self, expr, tail=False):
+        """compile, for code that reports each expression to the tracer as it starts."""
+        code = SythonCompilerMixin.compile(self, expr, tail)
+        on_enter = self.tracer.on_enter
+
+        def traced(env):
+            on_enter(expr, env)
+            return code(env)
+        return traced
+
+    def _compile_local_ref(self, ref):
+        name = ref.name
+        if ref.depth == 1:
+            return lambda env: env.outer[name]
+        elif ref.depth == 2:
+            return lambda env: env.outer.outer[name]
+        return ref.lookup
+
+    def _compile_builtin_ref(self, ref):
+        name, value, rebound = ref.name, ref.value, self.rebound_builtins
+        return lambda env: env[name] if rebound and name in rebound else value
+
+    def _compile_folded(self, folded, tail):
+        names, rebound = folded.names, self.rebound_builtins
+        original = self.compile(folded.expr, tail)
+        if type(folded.value) in NUMBER_TYPES or type(folded.value) is bool:
+            value = folded.value
+            return lambda env: original(env) if rebound and not rebound.isdisjoint(names) else value
+        code = self.compile(folded.value, tail)
+        return lambda env: original(env) if rebound and not rebound.isdisjoint(names) else code(env)
+
+    def _compile_quote(self, expr, tail):
+        value = to_datum(expr[1])
+        if type(value) is Vector:
+            return lambda env: value.copy()
+        return lambda env: value
+
+    def _compile_define(self, expr, tail):
+        if isinstance(expr[1], list):  # function definition: (define (name params) body)
+            _, (name, *params), body = expr
+            make_procedure = self._compile_lambda(params, body, name)
+            jit = self.jit
+
+            def define_function(env):
+                proc = make_procedure(env)
+                if jit is not None:
+                    jit.watch(proc)
+                env[name] = proc
+            return self._assigning(name, self._traced_define(name, define_function))
+        else:  # variable definition: (define var expr)
+            _, var, exp = expr
+            value = self.compile(exp)
+
+            def define_variable(env):
+                env[var] = value(env)
+            return self._assigning(var, self._traced_define(var, define_variable))
+
+    def _compile_define_memo(self, expr, tail):
+        _, (name, *params), body = expr
+        make_procedure = self._compile_lambda(params, body, name)
+
+        def define_memo(env):
+            # Recursive calls look the name up, so they go through the cache too
+            env[name] = MemoizedProcedure(make_procedure(env))
+        return self._assigning(name, self._traced_define(name, define_memo))
+
+    def _compile_set(self, expr, tail):
+        _, var, exp = expr
+        value = self.compile(exp)
+        return self._assigning(var, lambda env: env.set(var, value(env)))
+
+    def _traced_define(self, name, define):
+        """Make a define report the value it binds, if the tracer wants defines."""
+        if 'define' not in self.trace_events:
+            return define
+        on_define = self.tracer.on_define
+
+        def traced_define(env):
+            define(env)
+            on_define(name, env[name])
+        return traced_define
+
+    def _assigning(self, name, assign):
+        """Make an assignment report the name to assigned() if it may be a primitive's."""
+        if name not in self.builtins and self._library_defining(name) is None:
+            return assign
+
+        def assign_primitive(env):
+            result = assign(env)
+            self.assigned(name)
+            return result
+        return assign_primitive
+
+    def _compile_if(self, expr, tail):
+        _, condition, then_expr, else_expr = expr
+        condition = self.compile(condition)
+        then_expr = self.compile(then_expr, tail)
+        else_expr = self.compile(else_expr, tail)
+        return lambda env: then_expr(env) if condition(env) else else_expr(env)
+
+    def _compile_delay(self, expr, tail):
+        _, body = expr
+        body = self.compile(body)
+        return lambda env: Promise(lambda: body(env))
+
+    def _compile_lambda_form(self, expr, tail):
+        _, params, body = expr
+        return self._compile_lambda(params, body)
+
+    def _compile_lambda(self, params, body, name='lambda'):
+        code = self.compile_body(body, name)
+        return lambda env: Procedure(params, body, env, code, name)
+
+    def compile_body(self, body, name='lambda'):
+        """Code for a Procedure running body, reporting calls and returns if the tracer wants them."""
+        code = self.compile(body, tail=True)
+        if self.trace_events & CALL_EVENTS:
+            code = traced_code(self.tracer, code, name)
+        return code
+
+    def _compile_numeric(self, expr, tail):
+        """Apply binary arithmetic and comparisons to two plain numbers without calling the primitive.
+
+        Other operands, other arities, division (which checks for zero) and
+        operators the program has rebound go through an ordinary call.
+        """
+        head = expr[0]
+        name = head.name if type(head) is Builtin else head
+        builtin = self.builtins.get(name)
+        if len(expr) != 3 or builtin is None or name == '/':
+            return self._compile_call(expr, tail)
+        native = NUMERIC_OPERATORS[name]
+        a, b = self.compile(expr[1]), self.compile(expr[2])
+
+        def numeric(env):
+            fn = env[name]
+            x, y = a(env), b(env)
+            if fn is builtin and type(x) in NUMBER_TYPES and type(y) in NUMBER_TYPES:
+                return native(x, y)
+            if tail and type(fn) is Procedure:
+                return TailCall(fn, (x, y))
+            return fn(x, y)
+        if type(head) is not Builtin:
+            return numeric
+        looked_up, rebound = numeric, self.rebound_builtins
+
+        def inlined(env):
+            # Known to be the primitive, until the program assigns the name
+            if rebound and name in rebound:
+                return looked_up(env)
+            x, y = a(env), b(env)
+            if type(x) in NUMBER_TYPES and type(y) in NUMBER_TYPES:
+                return native(x, y)
+            return builtin(x, y)
+        return inlined
+
+    def _compile_call(self, expr, tail):
+        args = [self.compile(arg) for arg in expr[1:]]
+        head = expr[0]
+        if type(head) is Builtin:
+            return self._compile_builtin_call(head, args, self._compile_applied(self.compile(head.name), args, tail))
+        return self._compile_applied(self.compile(head), args, tail)
+
+    def _compile_applied(self, proc, args, tail):
+        if tail:
+            return self._compile_tail_call(proc, args)
+        # Procedures are run here rather than through Procedure.__call__, one Python frame fewer per
+        # call so deep non-tail recursion fits the recursion limit; the common small arities are
+        # specialized to avoid building argument lists
+        if len(args) == 1:
+            a, = args
+
+            def call(env):
+                fn = proc(env)
+                if type(fn) is not Procedure or Procedure.__call__ is not call_procedure:
+                    return fn(a(env))
+                result = fn.code(Environment(zip(fn.params, (a(env),)), fn.env))
+                return result if type(result) is not TailCall else run_tail_calls(result)
+            return call
+        elif len(args) == 2:
+            a, b = args
+
+            def call(env):
+                fn = proc(env)
+                if type(fn) is not Procedure or Procedure.__call__ is not call_procedure:
+                    return fn(a(env), b(env))
+                result = fn.code(Environment(zip(fn.params, (a(env), b(env))), fn.env))
+                return result if type(result) is not TailCall else run_tail_calls(result)
+            return call
+
+        def call(env):
+            fn = proc(env)
+            values = [arg(env) for arg in args]
+            if type(fn) is not Procedure or Procedure.__call__ is not call_procedure:
+                return fn(*values)
+            result = fn.code(Environment(zip(fn.params, values), fn.env))
+            return result if type(result) is not TailCall else run_tail_calls(result)
+        return call
+
+    def _compile_builtin_call(self, head, args, looked_up):
+        # An inlined primitive: no lookup, and never a Procedure, so never a TailCall; once the
+        # program assigns the name, looked_up calls whatever it is bound to
+        fn, name, rebound = head.value, head.name, self.rebound_builtins
+        if len(args) == 1:
+            a, = args
+            return lambda env: looked_up(env) if rebound and name in rebound else fn(a(env))
+        elif len(args) == 2:
+            a, b = args
+            return lambda env: looked_up(env) if rebound and name in rebound else fn(a(env), b(env))
+        return lambda env: looked_up(env) if rebound and name in rebound else fn(*[arg(env) for arg in args])
+
+    def _compile_tail_call(self, proc, args):
+        if len(args) == 1:
+            a, = args
+
+            def tail_call(env):
+                fn = proc(env)
+                if type(fn) is Procedure:
+                    return TailCall(fn, (a(env),))
+                return fn(a(env))
+            return tail_call
+        elif len(args) == 2:
+            a, b = args
+
+            def tail_call(env):
+                fn = proc(env)
+                if type(fn) is Procedure:
+                    return TailCall(fn, (a(env), b(env)))
+                return fn(a(env), b(env))
+            return tail_call
+
+        def tail_call(env):
+            fn = proc(env)
+            values = [arg(env) for arg in args]
+            if type(fn) is Procedure:
+                return TailCall(fn, values)
+            return fn(*values)
+        return tail_call
@@ -0,0 +1,77 @@
+class Environment(dict):
+    """A single frame of variable bindings with a pointer to its enclosing frame.
+
+    Lookups that miss in the local frame walk the chain of outer frames, so a
+    function call only needs to allocate a small frame for its parameters
+    instead of copying the whole global environment.
+    """
+    __slots__ = ('outer',)
+
+    def __init__(self, bindings=(), outer=None):
+        super().__init__(bindings)
+        self.outer = outer
+
+    def __missing__(self, name):
+        # Only reached when the name is not bound in this frame
+        root = self
+        env = self.outer
+        while env is not None:
+            if dict.__contains__(env, name):
+                return dict.__getitem__(env, name)
+            root = env
+            env = env.outer
+        return root.unbound(name)
+
+    def find(self, name):
+        """Return the innermost frame in which name is bound."""
+        env = self
+        while True:
+            if dict.__contains__(env, name):
+                return env
+            if env.outer is None:
+                env.unbound(name)  # raises, unless it binds name here
+                return env
+            env = env.outer
+
+    def unbound(self, name):
+        """Called on the outermost frame for a name no frame binds: its value, or NameError."""
+        raise NameError(f"Unbound symbol: {name}")
+
+    def lookup(self, name):
+        return self[name]
+
+    def define(self, name, value):
+        """Bind name in this frame, shadowing any outer binding."""
+        self[name] = value
+
+    def set(self, name, value):
+        """Rebind an existing variable in the frame where it is defined (set!)."""
+        self.find(name)[name] = value
+
+    def __repr__(self):
+        return f"<Environment {len(self)} bindings, outer={'yes' if self.outer is not None else 'no'}>"
+
+
+class GlobalEnvironment(Environment):
+    """The outermost frame, which calls autoload(name) before giving up on a name.
+
+    autoload returns True if it bound the name in this frame, for example by
+    installing the library that defines it. Membership tests and get() go
+    through it too, so a name a library would bind is found before first use.
+    """
+    __slots__ = ('autoload',)
+
+    def __init__(self, bindings=(), autoload=None):
+        super().__init__(bindings)
+        self.autoload = autoload
+
+    def unbound(self, name):
+        if self.autoload is not None and self.autoload(name):
+            return dict.__getitem__(self, name)
+        return Environment.unbound(self, name)
+
+    def __contains__(self, name):
+        return dict.__contains__(self, name) or (self.autoload is not None and self.autoload(name))
+
+    def get(self, name, default=None):
+        return dict.__getitem__(self, name) if name in self else default
@@ -3,6 +3,5 @@ from sython_math import SythonMathMixin
 
 # Create a composite interpreter that includes the mixin
 class SythonExtended(SythonInterpreter, SythonMathMixin):
-    def __init__(self):
-        super().__init__()
-        self.add_math_library(self.env)
\ No newline at end of file
+    # Installed the first time a program uses one of its names, or by (import math)
+    libraries = {**SythonInterpreter.libraries, 'math': SythonMathMixin.add_math_library}
@@ -0,0 +1,24 @@
+from Symbol import Symbol
+
+
+class SpecialForm:
+    """How the interpreter handles one special form, such as if or define.
+
+    compile(expr, tail) returns a closure taking an environment, for the
+    compiled engine. evaluate(expr, env) returns the form's value for the eval
+    engine; for a tail form it instead returns the expression to evaluate
+    next in the same environment, so evaluate can loop instead of recursing.
+    evaluate_async, if given, is a coroutine function doing the same for
+    run_async; forms without one are evaluated synchronously there.
+    """
+    __slots__ = ('name', 'compile', 'evaluate', 'tail', 'evaluate_async')
+
+    def __init__(self, name, compile, evaluate, tail=False, evaluate_async=None):
+        self.name = Symbol(name)
+        self.compile = compile
+        self.evaluate = evaluate
+        self.tail = tail
+        self.evaluate_async = evaluate_async
+
+    def __repr__(self):
+        return f"<special form {self.name}>"
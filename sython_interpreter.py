@@ -1,49 +1,158 @@
 import operator
-from Symbol import Symbol
+from Symbol import String, Symbol
+from sython_environment import Environment, GlobalEnvironment
+from sython_compiler import SythonCompilerMixin
+from sython_numeric import SythonNumericMixin
+from sython_io import DEFAULT_BUFFER_SIZE, OutputPort, SythonIOMixin
+from sython_async import YIELD_INTERVAL, SythonAsyncMixin
+from sython_collections import HashTable, SythonCollectionsMixin, Vector
+from sython_modules import SythonModuleMixin, default_module_path
+from sython_forms import SpecialForm
+from sython_optimizer import Builtin, Folded, LocalRef, Optimizer
+from sython_procedure import Procedure
+from sython_reader import iter_tokens
+from sython_pair import NIL, Nil, Pair, cons, from_iterable, to_datum
+from sython_jit import JIT_THRESHOLD, NATIVE_OPS, SythonJit
+from sython_memo import DEFAULT_MAXSIZE, MemoizedProcedure
+from sython_profiler import Profiler
+from sython_parallel import ProcessPool, in_pool_worker
+from sython_snapshot import Snapshot
+from sython_trace import CALL_EVENTS, PrintTracer, traced_code
+from sython_array import SythonArray
+from sython_stream import (Promise, Stream, force, list_to_stream, stream_filter, stream_map,
+                           stream_range, stream_reduce, stream_take)
 
-class SythonInterpreter:
-    def __init__(self, debug=False):
-        self.env = self.standard_env()
-        self.debug = debug  # Add a debug flag
+__version__ = '0.1.0'
+
+ENGINES = ('compile', 'eval')
+
+QUOTE = object()  # parser marker for a pending ' prefix
+VECTOR = object()  # parser marker opening a #( vector literal
+
+class SythonInterpreter(SythonCompilerMixin, SythonNumericMixin, SythonIOMixin, SythonAsyncMixin,
+                        SythonCollectionsMixin, SythonModuleMixin):
+    def __init__(self, debug=False, engine='compile', jit=True, jit_threshold=JIT_THRESHOLD, workers=None,
+                 optimize=0, output_buffer_size=DEFAULT_BUFFER_SIZE, tracer=None):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine '{engine}', expected one of {ENGINES}")
+        self.special_forms = {form.name: form for form in self.builtin_special_forms()}
+        # Interned keys, so lookups of parsed symbols match on identity; libraries load on first use
+        self.env = GlobalEnvironment(((Symbol(name), value) for name, value in self.standard_env().items()),
+                                     self._autoload)
+        self.debug = debug  # print every trace event
+        # Receives trace events; hooks go only where its events need them, see _install_tracer
+        self.tracer = PrintTracer() if debug and tracer is None else tracer
+        self.trace_events = self.tracer.events if self.tracer is not None else frozenset()
+        self.output_buffer_size = output_buffer_size
+        # Where display writes; unbuffered in debug mode so it interleaves with the debug lines
+        self.output = OutputPort(buffer_size=0 if debug else output_buffer_size)
+        self.engine = engine  # 'compile' runs compiled closures, 'eval' walks the AST
+        # Translate hot defined functions to Python; only the compiled engine uses it.
+        # Translated functions report no events, so tracing expressions or calls turns it off.
+        if self.trace_events & (CALL_EVENTS | {'enter'}):
+            jit = False
+        self.jit = SythonJit(self, jit_threshold) if jit and engine == 'compile' else None
         self.line_number = 1  # Initialize line number
+        self.builtins = {}
+        self.mark_builtins()
+        # Names of primitives the program has assigned since; code that inlined them looks the names up instead
+        self.rebound_builtins = set()
+        # Rewrites expressions before they run; level 0 runs them as parsed
+        self.optimizer = Optimizer(self, optimize) if optimize else None
+        self.workers = workers  # processes used by pmap; None means one per CPU
+        self._pool = None  # started by the first pmap and kept for later calls
+        self.profiler = None  # the running Profiler, if any
+        self._async_steps = YIELD_INTERVAL  # run_async steps left before it yields to the event loop
+        self.module_path = default_module_path()  # directories import looks in, after the importing module's
+        self.modules = {}  # path -> Module, for each module imported so far
+        self.loaded_libraries = frozenset()  # names of the libraries installed in env
+        self.cache_modules = True  # keep parsed modules in the parse cache on disk
+        self._importing = ()  # paths of the modules being imported, innermost last
+        self._tokenized = [], []  # the last list tokenize() returned, and the (line, column) of each of its tokens
+        if self.tracer is not None:
+            self._install_tracer()
 
     # Tokenizer: Convert source code into a list of tokens
     def tokenize(self, source_code):
-        # Reset line number for each tokenization
-        self.line_number = 1
-        lines = source_code.split('\n')
-        tokens = []
-
-        for line in lines:
-            line = line.split(';')[0]  # Ignore comments
-            line = line.replace("'", " ' ")  # Ensure quote is treated as a separate token
-            tokens_line = line.replace('(', ' ( ').replace(')', ' ) ').split()
-            tokens.extend(tokens_line)
-            self.line_number += 1  # Increment line number for each line
-
-        if self.debug:
-            print(f"[DEBUG] Tokens: {tokens}")
+        tokens, positions = [], []
+        for token, line, column in iter_tokens(source_code):
+            tokens.append(token)
+            positions.append((line, column))
+            self.line_number = line
+        self._tokenized = tokens, positions
         return tokens
 
     # Parser: Convert tokens into a nested list (abstract syntax tree)
     def parse(self, tokens):
-        if len(tokens) == 0:
-            raise SyntaxError("unexpected EOF while reading at line {self.line_number}")
-        token = tokens.pop(0)
-        if token == '(':
-            L = []
-            while tokens[0] != ')':
-                L.append(self.parse(tokens))
-            tokens.pop(0)  # pop off ')'
-            if self.debug:
-                print(f"[DEBUG] Parsed expression: {L}")
-            return L
-        elif token == ')':
-            raise SyntaxError("unexpected ')' at line {self.line_number}")
-        elif token == "'":  # Handle quoted expressions
-            return ['quote', self.parse(tokens)]
-        else:
-            return self.atom(token)
+        """Parse one expression from the front of a token list, consuming its tokens.
+
+        Errors in what is left of the last list tokenize() returned report
+        where in the source they are; in any other list the tokens are
+        counted as columns of line 1.
+        """
+        consumed = 0
+        tokenized, positions = self._tokenized
+        start = len(positions) - len(tokens)  # tokens parsed from the front of the tokenized list
+        if tokens is not tokenized or start < 0:
+            positions = None
+
+        def positioned():
+            nonlocal consumed
+            for token in tokens:
+                line, column = positions[start + consumed] if positions is not None else (1, consumed + 1)
+                consumed += 1
+                yield token, line, column
+
+        for expr in self.read_forms(positioned()):
+            del tokens[:consumed]
+            return expr
+        raise SyntaxError(f"unexpected EOF while reading at line {self.line_number}")
+
+    def read_forms(self, tokens):
+        """Lazily yield each top-level expression from (token, line, column) tuples.
+
+        Uses an explicit stack of open lists instead of recursion, so deeply
+        nested input cannot exhaust the Python stack, and each form is yielded
+        as soon as its closing parenthesis is read.
+        """
+        stack = []  # open lists and pending quote markers, innermost last
+        opened = []  # (line, column) of each open parenthesis
+        for token, line, column in tokens:
+            self.line_number = line
+            if token == '(':
+                stack.append([])
+                opened.append((line, column))
+                continue
+            elif token == '#(':  # vector literal: its elements are data, as if quoted
+                stack.append([VECTOR])
+                opened.append((line, column))
+                continue
+            elif token == "'":  # Handle quoted expressions
+                stack.append(QUOTE)
+                continue
+            elif token == ')':
+                if not stack or stack[-1] is QUOTE:
+                    raise SyntaxError(f"unexpected ')' at line {line}, column {column}")
+                expr = stack.pop()
+                opened.pop()
+                if expr and expr[0] is VECTOR:
+                    expr = Vector(map(to_datum, expr[1:]))
+                elif len(expr) == 2 and expr[0] == 'quote':
+                    expr[1] = to_datum(expr[1])
+            else:
+                expr = self.atom(token)
+            while stack and stack[-1] is QUOTE:
+                stack.pop()
+                expr = ['quote', to_datum(expr)]
+            if stack:
+                stack[-1].append(expr)
+            else:
+                yield expr
+        if opened:
+            line, column = opened[-1]
+            raise SyntaxError(f"unexpected EOF while reading list opened at line {line}, column {column}")
+        if stack:
+            raise SyntaxError(f"unexpected EOF after quote at line {self.line_number}")
 
     # Convert token to a number if possible, otherwise keep as a symbol
     def atom(self, token):
@@ -55,163 +164,410 @@ class SythonInterpreter:
             except ValueError:
                 # Check if it's a string (starts and ends with quotes)
                 if token.startswith('"') and token.endswith('"'):
-                    return token  # Keep the quotes for now, evaluate will handle them later
+                    return String(token[1:-1])
                 else:
                     return Symbol(token)  # Anything else is treated as a symbol
 
      # Define the map function
 
     def _map_fn(self, func, lst):
-        """Applies a function to each element in the list."""
-        return [func(x) for x in lst]
+        """Applies a function to each element in the list; streams stay lazy."""
+        if type(lst) is Stream:
+            return stream_map(func, lst)
+        if type(lst) is Vector:
+            return Vector(map(func, lst.items))
+        if type(lst) is HashTable:
+            return from_iterable(func(key, value) for key, value in lst.items())
+        return from_iterable(func(x) for x in lst)
 
     def _filter_fn(self, predicate, lst):
         """Custom filter function implementation."""
-        if not isinstance(lst, list):
+        if type(lst) is Stream:
+            return stream_filter(predicate, lst)
+        if type(lst) is Vector:
+            return Vector(x for x in lst.items if predicate(x))
+        if not isinstance(lst, (Pair, Nil, list)):
             raise TypeError("filter expects a list as the second argument")
         # Apply the predicate (lambda) to each element and filter those that return True
-        return [x for x in lst if predicate(x)]
+        return from_iterable(x for x in lst if predicate(x))
 
     def _reduce_fn(self, func, lst):
-        """Reduce the list using the provided function."""
-        if not lst:
-            raise ValueError("Cannot reduce an empty list")
-        result = lst[0]
-        for item in lst[1:]:
-            result = func(result, item)
-        return result
+        """Reduce the list (or stream) using the provided function, one element at a time."""
+        return stream_reduce(func, lst)
+
+    def process_pool(self):
+        """The worker processes behind pmap, started on first use."""
+        if self._pool is None:
+            options = {'engine': self.engine, 'jit': self.jit is not None,
+                       'optimize': self.optimizer.level if self.optimizer else 0}
+            if self.jit is not None:
+                options['jit_threshold'] = self.jit.threshold
+            self._pool = ProcessPool(type(self), options, self.workers)
+        return self._pool
+
+    def close(self):
+        """Write out buffered output and shut down the pmap worker processes, if any were started."""
+        self.output.flush()
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
+    def snapshot(self):
+        """Capture the global state, prelude definitions included, for cheap copies: snapshot().fork()."""
+        return Snapshot(self)
+
+    def start_profiling(self):
+        """Start recording per-function call counts and times; returns the Profiler."""
+        if self.profiler is None:
+            self.profiler = Profiler(self).start()
+        return self.profiler
+
+    def stop_profiling(self):
+        """Stop profiling and return the Profiler holding the results (None if not started)."""
+        profiler, self.profiler = self.profiler, None
+        if profiler is not None:
+            profiler.stop()
+        return profiler
+
+    def _pmap_fn(self, func, lst):
+        """Like map, but calls func on the items in parallel worker processes."""
+        if not isinstance(lst, (Pair, Nil, list, Stream)):
+            raise TypeError(f"pmap expects a list as the second argument, got: {lst} at line {self.line_number}")
+        if in_pool_worker():  # no nested pools
+            return from_iterable(map(func, lst))
+        return from_iterable(self.process_pool().map(func, lst, self.env))
+
+    def _pfor_each_fn(self, func, lst):
+        """Call func on every item in parallel worker processes, for its effects."""
+        self._pmap_fn(func, lst)
+
+    def _car(self, lst):
+        if type(lst) is not Pair:
+            raise TypeError(f"car expects a non-empty list, got: {lst} at line {self.line_number}")
+        return lst.car
+
+    def _cdr(self, lst):
+        if type(lst) is not Pair:
+            raise TypeError(f"cdr expects a non-empty list, got: {lst} at line {self.line_number}")
+        return lst.cdr
+
+    def _memoize_fn(self, func, maxsize=DEFAULT_MAXSIZE):
+        """Wrap a function with an LRU cache of its results: (memoize f [maxsize])."""
+        return MemoizedProcedure(func, maxsize)
+
+    def _memo_stats_fn(self, func):
+        """Return (hits misses maxsize size) for a memoized function."""
+        if not isinstance(func, MemoizedProcedure):
+            raise TypeError(f"memo-stats expects a memoized function, got: {func} at line {self.line_number}")
+        return from_iterable(func.cache_info())
+
+    def _memo_clear_fn(self, func):
+        if not isinstance(func, MemoizedProcedure):
+            raise TypeError(f"memo-clear! expects a memoized function, got: {func} at line {self.line_number}")
+        func.cache_clear()
 
     def _length(self, x):
-        if isinstance(x, (list, str)):
+        if isinstance(x, (Pair, Nil, list, str, SythonArray, Vector, HashTable)):
             return len(x)
         else:
             raise TypeError(f"Argument must be a list or string at line {self.line_number}")
 
-    def _display_fn(self, *args):
-        """Custom display function for the interpreter."""
-        output = ' '.join(map(str, args))  # Convert all arguments to strings
-        print(output, end='')  # Print without a newline
-        return None  # Typically, display does not return a value
-
     # Standard environment with basic operations
     def standard_env(self):
         env = {
-            '+': operator.add,
-            '-': operator.sub,
-            '*': operator.mul,
-            '/': operator.truediv,
             'mod': operator.mod,        # Modulo operation
-            '=': operator.eq,           # Equal to
-            '<': operator.lt,           # Less than
-            '>': operator.gt,           # Greater than
             'and': lambda x, y: x and y,  # Logical AND
             'or': lambda x, y: x or y,    # Logical OR
             'not': operator.not_,       # Logical NOT
-            'car': lambda lst: lst[0],  # First element of a list
-            'cdr': lambda lst: lst[1:], # Rest of the list after the first element
-            'cons': lambda x, y: [x] + (y if isinstance(y, list) else [y]),  # Create a new list with x as head and y as tail
+            'car': self._car,           # First element of a list
+            'cdr': self._cdr,           # Rest of the list after the first element, shared
+            'cons': cons,               # New list with x as head and y as tail
+            'list': lambda *items: from_iterable(items),
+            'null?': lambda x: x is NIL,
+            'pair?': lambda x: type(x) is Pair,
             'length': self._length,
             '#t': True,                 # True value
             '#f': False,                # False value
-            'display': self._display_fn,
             'map': self._map_fn,  # Add map to the environment
             'filter': self._filter_fn,
             'reduce': self._reduce_fn,
+            'pmap': self._pmap_fn,
+            'pfor-each': self._pfor_each_fn,
+            'force': force,
+            'range': stream_range,
+            'stream-map': stream_map,
+            'stream-filter': stream_filter,
+            'stream-take': stream_take,
+            'stream-reduce': stream_reduce,
+            'stream->list': from_iterable,
+            'list->stream': list_to_stream,
+            'stream?': lambda x: type(x) is Stream,
+            'memoize': self._memoize_fn,
+            'memo-stats': self._memo_stats_fn,
+            'memo-clear!': self._memo_clear_fn,
         }
+        self.add_numeric_library(env)  # + - * / = < > <= >=
+        self.add_io_library(env)  # display, newline, flush and file input
+        self.add_async_library(env)  # sleep
+        self.add_collections_library(env)  # vectors and hash tables
         return env
 
-    # Create a new environment with parameters bound to argument values
-    def extend_env(self, params, args):
-        new_env = self.env.copy()  # Copy the current environment
-        new_env.update(zip(params, args))
-        return new_env
+    # Create a new frame with parameters bound to argument values
+    def extend_env(self, params, args, outer=None):
+        if outer is None:
+            outer = self.env
+        return Environment(zip(params, args), outer)
+
+    def make_procedure(self, params, body, env, name='lambda'):
+        """Create a closure that evaluates body in a new frame on top of env."""
+        return Procedure(params, body, env, lambda frame: self.evaluate(body, frame), name)
+
+    def _make_traced_procedure(self, params, body, env, name='lambda'):
+        """make_procedure, for code that reports its calls and returns."""
+        code = traced_code(self.tracer, lambda frame: self.evaluate(body, frame), name)
+        return Procedure(params, body, env, code, name)
+
+    def _install_tracer(self):
+        """Use the traced versions of evaluate, compile and make_procedure where the tracer's events need them.
+
+        Without a tracer the plain versions run, with no checks for one.
+        Defines and calls compiled by the compiled engine check the tracer's
+        events as they are compiled; errors are reported by run_forms.
+        """
+        events = self.trace_events
+        if events - {'error'}:
+            self.evaluate = self._evaluate_traced
+        if 'enter' in events:
+            self.compile = self._compile_traced
+        if events & CALL_EVENTS:
+            self.make_procedure = self._make_traced_procedure
+
+    def assigned(self, name):
+        """Called after define or set! assigns name, so code that inlined a primitive by that name stops using it.
+
+        Functions the JIT translated go back to the interpreter when an
+        operator they use natively is assigned.
+        """
+        if name in self.builtins:
+            self.rebound_builtins.add(name)
+            if self.jit is not None and name in NATIVE_OPS:
+                self.jit.invalidate()
+
+    def mark_builtins(self):
+        """Record the current global bindings as primitives the optimizer may inline.
+
+        Extensions that add primitives call this once they have added them.
+        """
+        self.builtins = dict(dict.items(self.env))
+
+    def builtin_special_forms(self):
+        return [
+            SpecialForm('quote', self._compile_quote, self._eval_quote),
+            SpecialForm('define', self._compile_define, self._eval_define, evaluate_async=self._eval_define_async),
+            SpecialForm('define-memo', self._compile_define_memo, self._eval_define_memo),
+            SpecialForm('set!', self._compile_set, self._eval_set, evaluate_async=self._eval_set_async),
+            SpecialForm('if', self._compile_if, self._eval_if, tail=True, evaluate_async=self._eval_if_async),
+            SpecialForm('delay', self._compile_delay, self._eval_delay),
+            SpecialForm('lambda', self._compile_lambda_form, self._eval_lambda),
+            SpecialForm('import', self._compile_import, self._eval_import),
+        ]
+
+    def register_special_form(self, name, evaluate=None, compile=None, tail=False):
+        """Add a special form: a form whose arguments are passed unevaluated.
+
+        evaluate(expr, env) gets the whole form and returns its value (or,
+        with tail=True, the expression to evaluate in its place).
+        compile(expr, tail) returns a closure taking an environment. Give at
+        least one; the other engine falls back to it.
+        """
+        if evaluate is None and compile is None:
+            raise ValueError(f"Special form '{name}' needs an evaluate or a compile handler")
+        if compile is None:
+            if tail:
+                compile = lambda expr, tail: lambda env: self.compile(evaluate(expr, env), tail)(env)
+            else:
+                compile = lambda expr, tail: lambda env: evaluate(expr, env)
+        if evaluate is None:
+            if tail:
+                raise ValueError(f"Tail special form '{name}' needs an evaluate handler")
+            evaluate = lambda expr, env: compile(expr, False)(env)
+        form = SpecialForm(name, compile, evaluate, tail)
+        self.special_forms[form.name] = form
+        return form
+
+    def _eval_quote(self, expr, env):
+        value = to_datum(expr[1])
+        return value.copy() if type(value) is Vector else value
+
+    def _eval_define(self, expr, env):
+        if isinstance(expr[1], list):  # function definition: (define (name params) body)
+            _, (name, *params), body = expr
+            env[name] = self.make_procedure(params, body, env, name)
+            self.assigned(name)
+        else:  # variable definition: (define var expr)
+            _, var, exp = expr
+            env[var] = self.evaluate(exp, env)
+            self.assigned(var)
+
+    # Memoized function definition: (define-memo (name params) body)
+    def _eval_define_memo(self, expr, env):
+        _, (name, *params), body = expr
+        env[name] = MemoizedProcedure(self.make_procedure(params, body, env, name))
+        self.assigned(name)
+
+    # Delayed evaluation: (delay expr), evaluated once by force
+    def _eval_delay(self, expr, env):
+        return Promise(lambda body=expr[1]: self.evaluate(body, env))
+
+    # Conditionals: (if condition then-expr else-expr); returns the branch to evaluate
+    def _eval_if(self, expr, env):
+        _, condition, then_expr, else_expr = expr
+        return then_expr if self.evaluate(condition, env) else else_expr
+
+    def _eval_lambda(self, expr, env):
+        _, params, body = expr
+        return self.make_procedure(params, body, env)
+
+    # Assignment to an existing variable: (set! var expr)
+    def _eval_set(self, expr, env):
+        _, var, exp = expr
+        env.set(var, self.evaluate(exp, env))
+        self.assigned(var)
 
     # Evaluator: Evaluate the parsed expression in an environment
-    def evaluate(self, expr, env=None, is_tail=False):
+    def evaluate(self, expr, env=None):
         if env is None:
             env = self.env
-        while True:  # Use a loop to simulate TCO instead of recursive calls
-            
+        while True:  # Loop on tail positions instead of recursing, so tail calls run in constant stack
             if isinstance(expr, str):  # variable reference or string
-                if expr.startswith('"') and expr.endswith('"'):
-                    if self.debug:
-                        print(f"[DEBUG] Evaluating string literal: {expr}")
-                    return expr[1:-1]  # Return the string literal without the quotes
-                elif self.debug:
-                    print(f"[DEBUG] Evaluating variable: {expr}")
+                if type(expr) is String:
+                    return expr
                 return env[expr]
             elif not isinstance(expr, list):  # constant literal
-                if self.debug:
-                    print(f"[DEBUG] Evaluating constant: {expr}")
+                if type(expr) is LocalRef:
+                    return expr.lookup(env)
+                elif type(expr) is Builtin:
+                    if self.rebound_builtins and expr.name in self.rebound_builtins:
+                        return env[expr.name]
+                    return expr.value
+                elif type(expr) is Folded:
+                    rebound = self.rebound_builtins
+                    expr = expr.expr if rebound and not rebound.isdisjoint(expr.names) else expr.value
+                    continue
+                elif type(expr) is Vector:
+                    return expr.copy()
                 return expr
             op = expr[0]
 
-            if self.debug:
-                print(f"[DEBUG] Evaluating expression: {expr}")
-
-            # Handle variable or function definitions
-            if op == 'quote':
-                return expr[1]
-            elif op == 'define':
-                if isinstance(expr[1], list):  # function definition: (define (name params) body)
-                    _, (name, *params), body = expr
-                    env[name] = lambda *args: self.evaluate(body, self.extend_env(params, args))
-                    if self.debug:
-                        print(f"[DEBUG] Defined function {name} with params {params}")
-                    return None
-                else:  # variable definition: (define var expr)
-                    _, var, exp = expr
-                    env[var] = self.evaluate(exp, env)
-                    if self.debug:
-                        print(f"[DEBUG] Defined variable {var} with value {env[var]}")
-                    return None
-
-            # Handle conditionals: (if condition then-expr else-expr)
-            elif op == 'if':
-                _, condition, then_expr, else_expr = expr
-                expr = then_expr if self.evaluate(condition, env) else else_expr
-                continue  # Tail call optimization: continue with new expression
-
-
-            # Handle lambda expressions
-            elif op == 'lambda':
-                _, params, body = expr
-                return lambda *args: self.evaluate(body, self.extend_env(params, args))
-
-            # Handle arithmetic operations
-            elif op in {'+', '-', '*', '/'}:
-                args = [self.evaluate(arg, env) for arg in expr[1:]]
-                # Check if all arguments are numbers
-                if not all(isinstance(arg, (int, float)) for arg in args):
-                    raise TypeError(f"Operator '{op}' requires all arguments to be numbers, got: {args} at line {self.line_number}")
-                
-                if op == '/':
-                    if args[1] == 0:
-                        raise ZeroDivisionError("Division by zero is undefined at line {self.line_number}")  # Raise an error for division by zero
-                    return args[0] / args[1]
-
-            # Function call
+            if isinstance(op, str):
+                form = self.special_forms.get(op)
+                if form is not None:
+                    if form.tail:
+                        expr = form.evaluate(expr, env)
+                        continue  # Tail call optimization: continue with new expression
+                    return form.evaluate(expr, env)
+
+            # Function call; arithmetic is a primitive too, so each operand is evaluated once
             proc = self.evaluate(expr[0], env)
             args = [self.evaluate(arg, env) for arg in expr[1:]]
-            if is_tail:
-                expr = proc(*args)
-                continue  # Tail call optimization: continue with new expression
-            else:
-                return proc(*args)
+            if type(proc) is Procedure:
+                # Tail call optimization: continue with the body in a new frame
+                expr, env = proc.body, Environment(zip(proc.params, args), proc.env)
+                continue
+            return proc(*args)
+
+    def _evaluate_traced(self, expr, env=None):
+        """evaluate, reporting expressions, calls, returns and defines to the tracer."""
+        if env is None:
+            env = self.env
+        tracer = self.tracer
+        events = self.trace_events
+        enter, call, defines = 'enter' in events, 'call' in events, 'define' in events
+        running = None  # the function whose body this loop went on to evaluate, if any
+        while True:
+            if enter:
+                tracer.on_enter(expr, env)
+            if isinstance(expr, str):
+                value = expr if type(expr) is String else env[expr]
+                break
+            elif not isinstance(expr, list):
+                if type(expr) is LocalRef:
+                    value = expr.lookup(env)
+                elif type(expr) is Vector:
+                    value = expr.copy()
+                elif type(expr) is Folded:
+                    rebound = self.rebound_builtins
+                    expr = expr.expr if rebound and not rebound.isdisjoint(expr.names) else expr.value
+                    continue
+                elif type(expr) is Builtin:
+                    value = env[expr.name] if expr.name in self.rebound_builtins else expr.value
+                else:
+                    value = expr
+                break
+            op = expr[0]
+
+            if isinstance(op, str):
+                form = self.special_forms.get(op)
+                if form is not None:
+                    if form.tail:
+                        expr = form.evaluate(expr, env)
+                        continue
+                    value = form.evaluate(expr, env)
+                    if defines and (op == 'define' or op == 'define-memo'):
+                        name = expr[1][0] if isinstance(expr[1], list) else expr[1]
+                        tracer.on_define(name, env[name])
+                    break
+
+            proc = self.evaluate(op, env)
+            args = [self.evaluate(arg, env) for arg in expr[1:]]
+            if type(proc) is Procedure:
+                if call:
+                    tracer.on_call(proc.name, args)
+                running = proc
+                expr, env = proc.body, Environment(zip(proc.params, args), proc.env)
+                continue
+            value = proc(*args)
+            break
+        if running is not None and 'return' in events:  # earlier functions tail called it
+            tracer.on_return(running.name, value)
+        return value
+
+    # Execute a parsed expression with the configured engine
+    def execute(self, expr, env=None):
+        if env is None:
+            env = self.env
+        if self.optimizer is not None:
+            expr = self.optimizer.optimize(expr, env)
+        if self.engine == 'eval':
+            return self.evaluate(expr, env)
+        return self.compile(expr)(env)
 
     # Process each expression separately in the program
-    def run(self, program):
-        """Run the given Scheme program in the provided environment."""
-        if self.debug:
-            print(f"Running program: {program}")
-        tokens = self.tokenize(program)
-        expressions = []
-        while tokens:
-            expressions.append(self.parse(tokens))
-        for expr in expressions:
-            result = self.evaluate(expr)
-            if result is not None:  # Skip None results
-                print(result)
-        if self.debug:
-            print(f"Results: {result}")
-        return result
\ No newline at end of file
+    def run(self, program, stream=False):
+        """Run the given Scheme program in the provided environment.
+
+        With stream=True each top-level expression is evaluated as soon as it
+        is parsed, and program may also be an open text file, which is read in
+        blocks so memory stays bounded. Otherwise the whole program is parsed
+        before the first expression runs.
+        """
+        expressions = self.read_forms(iter_tokens(program))
+        if not stream:
+            expressions = list(expressions)
+        return self.run_forms(expressions)
+
+    def run_forms(self, expressions):
+        """Execute already parsed expressions in order, printing each non-None result."""
+        result = None
+        try:
+            for expr in expressions:
+                result = self.execute(expr)
+                if result is not None:  # Skip None results
+                    self.output.write(f"{result}\n")
+        except Exception as error:
+            if 'error' in self.trace_events:
+                self.tracer.on_error(error, self.line_number)
+            raise
+        finally:
+            self.output.flush()  # whatever happened, show what was displayed
+        return result
@@ -0,0 +1,147 @@
+import sys
+
+from sython_stream import Stream
+
+DEFAULT_BUFFER_SIZE = 1 << 16  # characters an output port collects before writing them out
+BLOCK_SIZE = 1 << 20  # bytes read from an input file at a time
+
+
+class EofObject:
+    """Returned by read-line at the end of a file."""
+    __slots__ = ()
+
+    def __repr__(self):
+        return "#<eof>"
+
+
+EOF = EofObject()
+
+
+class OutputPort:
+    """Collects written text and passes it on to a file in large writes.
+
+    Text is written out when buffer_size characters have collected, on
+    flush and on close. With file None it goes to whatever sys.stdout is at
+    that moment, so redirecting sys.stdout still captures it.
+    """
+    __slots__ = ('file', 'buffer_size', 'chunks', 'size')
+
+    def __init__(self, file=None, buffer_size=DEFAULT_BUFFER_SIZE):
+        self.file = file
+        self.buffer_size = buffer_size
+        self.chunks = []
+        self.size = 0
+
+    def write(self, text):
+        self.chunks.append(text)
+        self.size += len(text)
+        if self.size >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        file = sys.stdout if self.file is None else self.file
+        if self.chunks:
+            file.write(''.join(self.chunks))
+            self.chunks = []
+            self.size = 0
+        file.flush()
+
+    def close(self):
+        self.flush()
+        if self.file is not None:
+            self.file.close()
+
+    def __repr__(self):
+        return f"#<output-port {getattr(self.file, 'name', 'stdout')}>"
+
+
+class InputPort:
+    """Reads a text file one line at a time, in blocks of BLOCK_SIZE bytes."""
+    __slots__ = ('file',)
+
+    def __init__(self, file):
+        self.file = file
+
+    @classmethod
+    def open(cls, path):
+        return cls(open(path, 'r', buffering=BLOCK_SIZE))
+
+    def read_line(self):
+        """The next line without its newline, or EOF."""
+        line = self.file.readline()
+        if not line:
+            return EOF
+        return line[:-1] if line[-1] == '\n' else line
+
+    def close(self):
+        self.file.close()
+
+    def __repr__(self):
+        return f"#<input-port {getattr(self.file, 'name', 'stdin')}>"
+
+
+def _read_lines(path):
+    with open(path, 'r', buffering=BLOCK_SIZE) as f:
+        for line in f:
+            yield line[:-1] if line[-1] == '\n' else line
+
+
+def file_lines(path):
+    """A stream of the lines of a file; each walk reads it again from the start."""
+    return Stream(lambda: _read_lines(path))
+
+
+class SythonIOMixin:
+    """Output through a buffered port, and line-at-a-time file input.
+
+    display and newline write to the current output port, which holds text
+    until it has output_buffer_size characters, flush is called or the
+    program finishes. with-output-to-file points the current port at a file while a
+    function runs. file-lines reads a file lazily as a stream, so a file of
+    any size can be filtered and reduced in bounded memory.
+    """
+
+    def add_io_library(self, env):
+        env['display'] = self._display_fn
+        env['newline'] = self._newline_fn
+        env['flush'] = self._flush_fn
+        env['with-output-to-file'] = self._with_output_to_file_fn
+        env['open-input-file'] = InputPort.open
+        env['read-line'] = self._read_line_fn
+        env['close-port'] = self._close_port_fn
+        env['eof-object?'] = lambda x: x is EOF
+        env['file-lines'] = file_lines
+
+    def _display_fn(self, *args):
+        """Custom display function for the interpreter."""
+        self.output.write(' '.join(map(str, args)))  # Convert all arguments to strings, no newline
+        return None  # Typically, display does not return a value
+
+    def _newline_fn(self):
+        self.output.write('\n')
+
+    def _flush_fn(self):
+        self.output.flush()
+
+    def _with_output_to_file_fn(self, path, thunk):
+        """Call thunk with display and newline writing to the file at path; returns its result."""
+        previous = self.output
+        self.output = OutputPort(open(path, 'w'), self.output_buffer_size)
+        try:
+            return thunk()
+        finally:
+            port, self.output = self.output, previous
+            port.close()
+
+    def _read_line_fn(self, port=None):
+        if port is None:
+            self.output.flush()  # show any prompt before waiting for input
+            port = InputPort(sys.stdin)
+        elif type(port) is not InputPort:
+            raise TypeError(f"read-line expects an input port, got: {port} at line {self.line_number}")
+        return port.read_line()
+
+    def _close_port_fn(self, port):
+        if type(port) not in (InputPort, OutputPort):
+            raise TypeError(f"close-port expects a port, got: {port} at line {self.line_number}")
+        port.close()
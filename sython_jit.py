@@ -0,0 +1,285 @@
+import math
+
+from Symbol import String, Symbol
+from sython_collections import Vector
+from sython_pair import to_datum
+from sython_optimizer import Builtin, Folded, LocalRef
+from sython_procedure import Procedure
+from sython_numeric import NUMBER_TYPES
+
+JIT_THRESHOLD = 1000  # calls before a defined function is translated
+
+# Sython operator -> Python operator, used while the name is still bound to its builtin
+ARITHMETIC = {'+': '+', '-': '-', '*': '*', '/': '/'}
+COMPARISONS = {'=': '==', '<': '<', '>': '>', '<=': '<=', '>=': '>=', 'mod': '%'}
+NATIVE_OPS = frozenset(ARITHMETIC) | frozenset(COMPARISONS)
+
+
+def _plain(expr):
+    """expr with the optimizer's resolved references turned back into names."""
+    if type(expr) is LocalRef or type(expr) is Builtin:
+        return expr.name
+    if type(expr) is Folded:
+        return _plain(expr.expr)
+    if isinstance(expr, list) and expr and expr[0] != 'quote':
+        return [_plain(item) for item in expr]
+    return expr
+
+
+class Untranslatable(Exception):
+    """Raised for a form the JIT leaves to the interpreter."""
+
+
+class CompiledProcedure:
+    """A hot Procedure's translation, bound in its place.
+
+    Each translation is a subclass with the generated function as __call__,
+    so a call runs it without a Python frame in between. Everything else
+    looks like the procedure, which is kept for pickling, forking and
+    deoptimizing.
+    """
+    __slots__ = ('procedure', 'source')
+
+    def __init__(self, procedure, source):
+        self.procedure = procedure
+        self.source = source
+
+    @property
+    def name(self):
+        return self.procedure.name
+
+    def __repr__(self):
+        return repr(self.procedure)
+
+
+class SythonJit:
+    """Translate hot user-defined functions into Python source.
+
+    Functions created by define count their calls. When one crosses the
+    threshold its body is translated into a Python function, run through
+    compile() and swapped into the binding the define created, as a
+    CompiledProcedure. Arithmetic and comparisons become native operators
+    and self tail calls become a while loop. Self calls check the name is
+    still bound to the translation and make an ordinary call otherwise, so
+    rebinding it works as it does in the interpreter. Functions using forms the translator does not know
+    keep running in the interpreter.
+    """
+
+    def __init__(self, interpreter, threshold=JIT_THRESHOLD):
+        self.interpreter = interpreter
+        self.threshold = threshold
+        self.promoted = []  # (env, name, procedure, compiled) swapped in so far
+        self.paused = False  # set while profiling, so calls keep going through Procedure
+
+    def watch(self, proc):
+        """Wrap proc.code so it counts calls and promotes proc once it is hot."""
+        code = proc.code
+        remaining = self.threshold
+
+        def counting(frame):
+            nonlocal remaining
+            remaining -= 1
+            if remaining == 0:
+                proc.code = code  # stop counting whether or not translation works
+                self.promote(proc)
+            return code(frame)
+        proc.code = counting
+
+    def promote(self, proc):
+        env, name = proc.env, proc.name
+        if self.paused:
+            return
+        if not (dict.__contains__(env, name) and dict.__getitem__(env, name) is proc):
+            return  # rebound since it was defined
+        try:
+            compiled = self.translate(proc)
+        except Untranslatable:
+            return
+        env[name] = compiled
+        self.promoted.append((env, name, proc, compiled))
+
+    def invalidate(self):
+        """Put the interpreted procedures back, e.g. after a builtin operator is redefined."""
+        for env, name, proc, compiled in self.promoted:
+            if dict.__contains__(env, name) and dict.__getitem__(env, name) is compiled:
+                env[name] = proc
+        self.promoted = []
+
+    def translate(self, proc):
+        """Return a CompiledProcedure equivalent to calling proc."""
+        return _Translator(self.interpreter, proc).function()
+
+
+class _Translator:
+    def __init__(self, interpreter, proc):
+        self.interpreter = interpreter
+        self.proc = proc
+        self.env = proc.env
+        self.locals = {param: f'p{i}' for i, param in enumerate(proc.params)}
+        self.constants = {}
+        builtins = interpreter.builtins
+        self.native = {op for op in NATIVE_OPS
+                       if op not in self.locals and op in builtins and self._binding(op) is builtins[op]}
+
+    def _binding(self, name):
+        try:
+            return self.env[name]
+        except NameError:
+            return None
+
+    def function(self):
+        params = list(self.locals.values())
+        body = _plain(self.proc.body)
+        # A body calling nothing but operators and itself can't rebind its name, so checking once is enough
+        self.pure = not self._calls_out(body)
+        self.self_calls = False
+        body = self.tail(body, '        ')
+        lines = [f'def compiled(self, *args):',
+                 f'    if len(args) != {len(params)}:',
+                 f'        return _fallback(*args)',
+                 f'    {", ".join(params)}{"," if len(params) == 1 else ""} = args' if params else '    pass']
+        if self.pure and self.self_calls:
+            lines.append(f'    bound = _env[{self.constant(Symbol(self.proc.name))}] is _self')
+        lines.append(f'    while True:')
+        lines += body
+        namespace = {
+            '_fallback': self.proc,
+            '_env': self.env,
+            '_NUMBER': NUMBER_TYPES,
+            **self.constants,
+        }
+        source = '\n'.join(lines)
+        exec(compile(source, f'<sython-jit {self.proc.name}>', 'exec'), namespace)
+        function = namespace['compiled']
+        function.__name__ = function.__qualname__ = str(self.proc.name)
+        cls = type(str(self.proc.name), (CompiledProcedure,), {'__slots__': (), '__call__': function})
+        namespace['_self'] = compiled = cls(self.proc, source)
+        return compiled
+
+    def constant(self, value):
+        name = f'_k{len(self.constants)}'
+        self.constants[name] = value
+        return name
+
+    # Statements for an expression in tail position of the body
+    def tail(self, expr, indent):
+        if isinstance(expr, list) and expr and expr[0] == 'if' and 'if' not in self.locals:
+            if len(expr) != 4:
+                raise Untranslatable(expr)
+            _, condition, then_expr, else_expr = expr
+            condition, _ = self.expr(condition)
+            return ([f'{indent}if {condition}:'] + self.tail(then_expr, indent + '    ') +
+                    [f'{indent}else:'] + self.tail(else_expr, indent + '    '))
+        if isinstance(expr, list) and expr and self._is_self_call(expr):
+            args = [self.expr(arg)[0] for arg in expr[1:]]
+            if len(args) != len(self.locals):
+                raise Untranslatable(expr)
+            # Loop only while the name still means this function; the interpreter looks it up on every call
+            proc, _ = self.expr(expr[0])
+            lines = [f'{indent}if {"not bound" if self.pure else f"{proc} is not _self"}:',
+                     f'{indent}    return {proc}({", ".join(args)})']
+            self.self_calls = True
+            if args:
+                lines.append(f'{indent}{", ".join(self.locals.values())} = {", ".join(args)}')
+            return lines + [f'{indent}continue']
+        if isinstance(expr, list) and expr and not self._is_special(expr[0]):
+            # A tail call into another Sython function would grow the Python
+            # stack where the interpreter trampolines it
+            callee = expr[0]
+            if not isinstance(callee, str) or callee in self.locals or isinstance(self._binding(callee), Procedure):
+                raise Untranslatable(expr)
+        value, _ = self.expr(expr)
+        return [f'{indent}return {value}']
+
+    def _is_self_call(self, expr):
+        name = expr[0]
+        return (isinstance(name, str) and name == self.proc.name and name not in self.locals
+                and self._binding(name) is self.proc)
+
+    def _calls_out(self, expr):
+        """Whether running expr may call anything but native operators and this function."""
+        if not isinstance(expr, list) or not expr or expr[0] == 'quote':
+            return False
+        op = expr[0]
+        if not (isinstance(op, str) and op not in self.locals and
+                (op == 'if' or op in self.native or self._is_self_call(expr))):
+            return True
+        return any(self._calls_out(item) for item in expr[1:])
+
+    def _is_special(self, op):
+        return isinstance(op, str) and op not in self.locals and (
+            op in self.interpreter.special_forms or op in self.native)
+
+    # Python expression for expr and its kind: 'number', 'param' or 'any'
+    def expr(self, expr):
+        if isinstance(expr, str):
+            if type(expr) is String:
+                return self.constant(expr), 'any'
+            if expr in self.locals:
+                return self.locals[expr], 'param'
+            return f'_env[{self.constant(Symbol(expr))}]', 'any'  # the interned key matches on identity
+        elif type(expr) in NUMBER_TYPES:
+            if type(expr) is float and not math.isfinite(expr):
+                return self.constant(expr), 'number'
+            return repr(expr), 'number'
+        elif type(expr) is Vector:
+            return f'{self.constant(expr)}.copy()', 'any'
+        elif not isinstance(expr, list):
+            return self.constant(expr), 'any'
+        if not expr:
+            raise Untranslatable(expr)
+
+        op = expr[0]
+        if isinstance(op, str) and op not in self.locals:
+            if op == 'quote':
+                value = to_datum(expr[1])
+                if type(value) is Vector:
+                    return f'{self.constant(value)}.copy()', 'any'
+                return self.constant(value), 'any'
+            elif op == 'if':
+                if len(expr) != 4:
+                    raise Untranslatable(expr)
+                condition, _ = self.expr(expr[1])
+                then_expr, then_kind = self.expr(expr[2])
+                else_expr, else_kind = self.expr(expr[3])
+                kind = 'number' if then_kind == else_kind == 'number' else 'any'
+                return f'({then_expr} if {condition} else {else_expr})', kind
+            elif op in self.interpreter.special_forms:
+                raise Untranslatable(expr)  # define, lambda, set! and forms added by extensions
+            elif op in ARITHMETIC:
+                return self.arithmetic(expr)
+            elif op == 'mod' and op in self.native and len(expr) == 3:
+                (a, a_kind), (b, b_kind) = self.expr(expr[1]), self.expr(expr[2])
+                kind = 'number' if a_kind == b_kind == 'number' else 'any'
+                return f'({a} % {b})', kind
+            elif op in self.native and len(expr) >= 3:
+                # Python chains comparisons the way the builtins do: (< a b c) is a < b < c
+                operands = f' {COMPARISONS[op]} '.join(self.expr(arg)[0] for arg in expr[1:])
+                return f'({operands})', 'any'
+
+        proc, _ = self.expr(op)
+        args = ', '.join(self.expr(arg)[0] for arg in expr[1:])
+        if self._is_self_call(expr):
+            self.self_calls = True
+            guard = 'bound' if self.pure else f'{proc} is _self'
+            return f'(compiled(_self, {args}) if {guard} else {proc}({args}))', 'any'
+        return f'{proc}({args})', 'any'
+
+    def arithmetic(self, expr):
+        op = expr[0]
+        if op not in self.native:
+            raise Untranslatable(expr)
+        operands = [self.expr(arg) for arg in expr[1:]]
+        # The builtin checks its arguments the way the interpreter does
+        checked = f'{self.constant(self.interpreter.builtins[op])}({", ".join(value for value, _ in operands)})'
+        if len(operands) != 2 or any(kind == 'any' for _, kind in operands):
+            return checked, 'number'
+        if op == '/' and not (type(expr[2]) in NUMBER_TYPES and expr[2] != 0):
+            return checked, 'number'  # only the builtin raises the interpreter's ZeroDivisionError
+        (a, _), (b, _) = operands
+        native = f'{a} {ARITHMETIC[op]} {b}'
+        # Parameters are plain local reads, so test their types inline
+        checks = ' and '.join(f'type({value}) in _NUMBER' for value, kind in operands if kind == 'param')
+        if checks:
+            return f'({native} if {checks} else {checked})', 'number'
+        return f'({native})', 'number'
@@ -1,4 +1,7 @@
 import math
+from sython_array import (SythonArray, array_log, array_max, array_mean, array_min, array_pow,
+                          array_range, array_ref, array_sum, vectorize)
+from sython_pair import from_iterable
 
 
 class SythonMathMixin:
@@ -6,16 +9,30 @@ class SythonMathMixin:
             env['pi'] = math.pi
             env['e'] = math.e
 
-            # Add basic functions
-            env['sin'] = lambda x: math.sin(x)
-            env['cos'] = lambda x: math.cos(x)
-            env['sqrt'] = lambda x: math.sqrt(x)
-            env['log'] = lambda x, base=math.e: math.log(x, base)  # Default to natural log
-            env['pow'] = lambda x, y: math.pow(x, y)
+            # Add basic functions; these also apply element-wise to arrays
+            env['sin'] = vectorize(math.sin, 'sin')
+            env['cos'] = vectorize(math.cos, 'cos')
+            env['sqrt'] = vectorize(math.sqrt, 'sqrt')
+            env['log'] = array_log  # Default to natural log
+            env['pow'] = array_pow
 
             # Add more as needed, e.g. factorial, tan, etc.
-            env['tan'] = lambda x: math.tan(x)
-            env['abs'] = lambda x: abs(x)
+            env['tan'] = vectorize(math.tan, 'tan')
+            env['abs'] = vectorize(abs, 'abs')
             env['round'] = lambda x: round(x)
-            env['floor'] = lambda x: math.floor(x)
-            env['ceil'] = lambda x: math.ceil(x)
\ No newline at end of file
+            env['floor'] = vectorize(math.floor, 'floor')
+            env['ceil'] = vectorize(math.ceil, 'ceil')
+
+            # Numeric arrays: bulk arithmetic instead of one interpreted call per element
+            env['array'] = lambda *values: SythonArray(values)
+            env['list->array'] = lambda lst: SythonArray(list(lst))
+            env['array->list'] = lambda arr: from_iterable(arr)
+            env['array-range'] = array_range
+            env['array-ref'] = array_ref
+            env['array?'] = lambda x: type(x) is SythonArray
+
+            # Reductions over arrays or lists of numbers
+            env['sum'] = array_sum
+            env['min'] = array_min
+            env['max'] = array_max
+            env['mean'] = array_mean
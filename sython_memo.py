@@ -0,0 +1,91 @@
+from collections import OrderedDict, namedtuple
+
+from Symbol import String, Symbol
+from sython_pair import NIL, Nil, Pair
+
+DEFAULT_MAXSIZE = 1024
+
+# Hashable values keyed directly, with their type
+ATOM_TYPES = frozenset((int, float, complex, bool, str, String, Symbol))
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class Unhashable(Exception):
+    """Raised by freeze for arguments with no hashable equivalent."""
+
+
+def freeze(value):
+    """Return a hashable key for value.
+
+    Atoms are keyed with their type, so 1, 1.0 and #t, or "a" and 'a, get
+    different keys; lists and other containers are keyed by their contents.
+    """
+    kind = type(value)
+    if kind in ATOM_TYPES:
+        return kind, value
+    if kind is Pair:
+        items, tail = value._split()
+        key = tuple(map(freeze, items))
+        return key if tail is NIL else (Pair, key, freeze(tail))  # improper; no element freezes to a type
+    if kind is Nil or isinstance(value, (list, tuple)):
+        return tuple(map(freeze, value))
+    if isinstance(value, dict):
+        return frozenset((freeze(k), freeze(v)) for k, v in value.items())
+    if isinstance(value, (set, frozenset)):
+        return frozenset(map(freeze, value))
+    try:
+        hash(value)
+    except TypeError:
+        raise Unhashable(value) from None
+    return kind, value
+
+
+class MemoizedProcedure:
+    """Cache the results of a pure function, evicting the least recently used.
+
+    Arguments are the cache key, each with its type, so arguments Python
+    considers equal but Sython doesn't get separate entries. Lists are
+    keyed by their contents; calls with arguments that can't be keyed at all
+    go straight to the function. maxsize=None makes the cache unbounded.
+    """
+    __slots__ = ('func', 'name', 'maxsize', 'cache', 'hits', 'misses')
+
+    def __init__(self, func, maxsize=DEFAULT_MAXSIZE, name=None):
+        if maxsize is not None and (not isinstance(maxsize, int) or maxsize < 1):
+            raise ValueError(f"memoize expects a positive cache size, got: {maxsize}")
+        self.func = func
+        self.name = name or getattr(func, 'name', None) or getattr(func, '__name__', 'lambda')
+        self.maxsize = maxsize
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, *args):
+        try:
+            key = tuple(map(freeze, args))
+        except Unhashable:
+            self.misses += 1
+            return self.func(*args)
+        cache = self.cache
+        try:
+            result = cache[key]
+        except KeyError:
+            self.misses += 1
+            result = cache[key] = self.func(*args)
+            if self.maxsize is not None and len(cache) > self.maxsize:
+                cache.popitem(last=False)
+        else:
+            self.hits += 1
+            cache.move_to_end(key)
+        return result
+
+    def cache_info(self):
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self.cache))
+
+    def cache_clear(self):
+        self.cache.clear()
+        self.hits = self.misses = 0
+
+    def __repr__(self):
+        return f"<memoized procedure {self.name}>"
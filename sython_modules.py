@@ -0,0 +1,202 @@
+import os
+
+from Symbol import String, Symbol
+from sython_environment import Environment
+from sython_reader import iter_tokens
+
+MODULE_SUFFIX = '.sy'
+
+_parsed = {}  # module path -> ((mtime, size), forms), shared by every interpreter in the process
+_library_names = {}  # library install function -> the names it binds
+
+
+class Module:
+    """A loaded .sy file: its name, where it was found, the frame it ran in and the names it exports.
+
+    The exports are the names the file's own top-level defines bind; what
+    it imports is bound in its frame too, but not exported.
+    """
+    __slots__ = ('name', 'path', 'env', 'exports')
+
+    def __init__(self, name, path, env, exports):
+        self.name = name
+        self.path = path
+        self.env = env
+        self.exports = exports
+
+    def bindings(self):
+        """The exported names and their current values."""
+        return {name: self.env[name] for name in self.exports}
+
+    def __repr__(self):
+        return f"<module {self.name}>"
+
+
+def defined_names(forms):
+    """The names bound by the top-level defines among forms."""
+    names = []
+    for expr in forms:
+        if isinstance(expr, list) and len(expr) == 3 and expr[0] in ('define', 'define-memo'):
+            name = expr[1][0] if isinstance(expr[1], list) else expr[1]
+            if type(name) is Symbol and name not in names:
+                names.append(name)
+    return tuple(names)
+
+
+def default_module_path():
+    """The current directory, then the directories listed in $SYTHON_PATH."""
+    extra = os.environ.get('SYTHON_PATH', '')
+    return ('.',) + tuple(directory for directory in extra.split(os.pathsep) if directory)
+
+
+def read_module(interpreter, path, use_cache=True):
+    """The parsed forms of the file at path.
+
+    A file is parsed at most once per process while it is unchanged, and
+    with use_cache the forms also go through the parse cache on disk, so a
+    new process doesn't parse it again either.
+    """
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _parsed.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    import sython_cache  # not at the top: it imports the interpreter, which imports this module
+    digest = sython_cache.script_digest(path) if use_cache else None
+    forms = sython_cache.load(path, digest) if use_cache else None
+    if forms is None:
+        with open(path, 'r') as f:
+            forms = list(interpreter.read_forms(iter_tokens(f)))
+        if use_cache:
+            sython_cache.store(path, digest, forms)
+    _parsed[path] = (key, forms)
+    return forms
+
+
+class SythonModuleMixin:
+    """Split programs into files with (import "lib/strings"), and load built-in libraries lazily.
+
+    A built-in library is a function install(interpreter, bindings) that
+    adds its primitives to a dict, registered by name in libraries. It is
+    installed in the global environment the first time a program looks up
+    one of its names, or imports it with (import name), so an interpreter
+    only pays for the libraries it uses. Installing never replaces a
+    binding the program already made.
+
+    Any other import names a .sy file, looked for relative to the importing
+    module, then in each directory of module_path. A module runs once per
+    interpreter, in its own frame under the global environment. Importing it
+    binds the names its own top-level defines bind where the import is, each
+    as prefix/name with (import "lib/strings" as prefix); what the module
+    imports itself stays in its frame.
+    """
+    libraries = {}  # name -> install function; replaced, never changed in place, so snapshots can share it
+
+    def register_library(self, name, install):
+        """Make a library importable, and installed on the first use of one of its names."""
+        self.libraries = {**self.libraries, name: install}
+
+    def load_library(self, name):
+        """Install a registered library in the global environment, once; returns its bindings."""
+        install = self.libraries[name]
+        bindings = {}
+        install(self, bindings)
+        _library_names.setdefault(install, frozenset(bindings))
+        if name not in self.loaded_libraries:
+            self.loaded_libraries = self.loaded_libraries | {name}
+            installed = []
+            for key, value in bindings.items():
+                symbol = Symbol(key)
+                if not dict.__contains__(self.env, symbol):
+                    self.env[symbol] = value
+                    self.builtins[symbol] = value  # primitives, as if bound from the start
+                    installed.append(symbol)
+            if self.profiler is not None:  # a library registered after profiling started
+                self.profiler.wrap_primitives(installed)
+        return bindings
+
+    def _autoload(self, name):
+        # Called by the global environment for a name it doesn't have
+        library = self._library_defining(name)
+        if library is None:
+            return False
+        self.load_library(library)
+        return dict.__contains__(self.env, name)
+
+    def _library_defining(self, name):
+        """The name of a library not loaded yet that binds name, or None."""
+        for library, install in self.libraries.items():
+            if library in self.loaded_libraries:
+                continue
+            names = _library_names.get(install)
+            if names is None:
+                scratch = {}
+                install(self, scratch)
+                names = _library_names[install] = frozenset(scratch)
+            if name in names:
+                return library
+        return None
+
+    def import_module(self, spec, env=None, prefix=None):
+        """Import a library by name, or a module by name or path, into env (the global environment by default)."""
+        if env is None:
+            env = self.env
+        if type(spec) is not String and spec in self.libraries:
+            bindings = self.load_library(spec)
+            if prefix is None and env is self.env:
+                return  # installed there already
+        else:
+            bindings = self._load_module(spec).bindings()
+        for name, value in bindings.items():
+            name = Symbol(f"{prefix}/{name}") if prefix is not None else Symbol(name)
+            env[name] = value
+            if value is not self.builtins.get(name):
+                self.assigned(name)
+
+    def _load_module(self, spec):
+        path = self._find_module(spec)
+        module = self.modules.get(path)
+        if module is not None:
+            return module
+        if path in self._importing:
+            raise ImportError(f"Circular import of {spec} at line {self.line_number}")
+        line, importing = self.line_number, self._importing
+        forms = read_module(self, path, self.cache_modules)
+        module = Module(os.path.splitext(os.path.basename(path))[0], path, Environment(outer=self.env),
+                        defined_names(forms))
+        self._importing = importing + (path,)
+        try:
+            for expr in forms:
+                self.execute(expr, module.env)
+        finally:
+            self._importing = importing
+            self.line_number = line
+        self.modules[path] = module
+        return module
+
+    def _find_module(self, spec):
+        relative = str(spec)
+        if not relative.endswith(MODULE_SUFFIX):
+            relative += MODULE_SUFFIX
+        directories = [os.path.dirname(self._importing[-1])] if self._importing else []
+        directories.extend(self.module_path)
+        for directory in directories:
+            path = os.path.abspath(os.path.join(directory, relative))
+            if os.path.isfile(path):
+                return path
+        raise ModuleNotFoundError(f"No module {spec} in {directories} at line {self.line_number}")
+
+    def _import_form(self, expr):
+        # (import name) or (import name as prefix)
+        if len(expr) == 2 or (len(expr) == 4 and expr[2] == 'as' and type(expr[3]) is Symbol):
+            if isinstance(expr[1], str):
+                return expr[1], expr[3] if len(expr) == 4 else None
+        raise SyntaxError(f"import expects (import name) or (import name as prefix) at line {self.line_number}")
+
+    def _eval_import(self, expr, env):
+        spec, prefix = self._import_form(expr)
+        self.import_module(spec, env, prefix)
+
+    def _compile_import(self, expr, tail):
+        spec, prefix = self._import_form(expr)
+        return lambda env: self.import_module(spec, env, prefix)
@@ -0,0 +1,117 @@
+import operator
+from functools import reduce
+
+from sython_array import NUMERIC_TYPES, is_zero
+
+NUMBER_TYPES = frozenset((int, float))  # plain numbers, which skip the argument checks
+
+# Sython operator -> the Python operator it applies to two numbers
+ARITHMETIC_OPERATORS = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+}
+COMPARISON_OPERATORS = {
+    '=': operator.eq,
+    '<': operator.lt,
+    '>': operator.gt,
+    '<=': operator.le,
+    '>=': operator.ge,
+}
+NUMERIC_OPERATORS = {**ARITHMETIC_OPERATORS, **COMPARISON_OPERATORS}
+
+
+class SythonNumericMixin:
+    """Variadic arithmetic and comparison primitives.
+
+    (+ 1 2 3) adds left to right, (- x) negates, (/ x) is 1/x, and (+) and
+    (*) are 0 and 1. Arithmetic arguments must be numbers or arrays, and
+    division checks every divisor for zero, so both engines and the JIT raise
+    the same errors. Comparisons chain: (< a b c) is true when each argument
+    is less than the next.
+    """
+
+    def add_numeric_library(self, env):
+        env['+'] = self._add
+        env['-'] = self._sub
+        env['*'] = self._mul
+        env['/'] = self._div
+        env['='] = self._num_eq
+        env['<'] = self._lt
+        env['>'] = self._gt
+        env['<='] = self._le
+        env['>='] = self._ge
+
+    def _check_numbers(self, op, args):
+        for arg in args:
+            if not isinstance(arg, NUMERIC_TYPES):
+                raise TypeError(f"Operator '{op}' requires all arguments to be numbers, got: {list(args)} at line {self.line_number}")
+
+    def _check_arity(self, op, args):
+        if not args:
+            raise TypeError(f"Operator '{op}' expects at least one argument at line {self.line_number}")
+
+    def _add(self, *args):
+        if len(args) == 2 and type(args[0]) in NUMBER_TYPES and type(args[1]) in NUMBER_TYPES:
+            return args[0] + args[1]
+        self._check_numbers('+', args)
+        return reduce(operator.add, args) if args else 0
+
+    def _mul(self, *args):
+        if len(args) == 2 and type(args[0]) in NUMBER_TYPES and type(args[1]) in NUMBER_TYPES:
+            return args[0] * args[1]
+        self._check_numbers('*', args)
+        return reduce(operator.mul, args) if args else 1
+
+    def _sub(self, *args):
+        if len(args) == 2 and type(args[0]) in NUMBER_TYPES and type(args[1]) in NUMBER_TYPES:
+            return args[0] - args[1]
+        self._check_numbers('-', args)
+        self._check_arity('-', args)
+        return reduce(operator.sub, args) if len(args) > 1 else -args[0]
+
+    def _div(self, *args):
+        if len(args) == 2 and type(args[0]) in NUMBER_TYPES and type(args[1]) in NUMBER_TYPES and args[1]:
+            return args[0] / args[1]
+        self._check_numbers('/', args)
+        self._check_arity('/', args)
+        if len(args) == 1:
+            args = (1,) + args
+        for divisor in args[1:]:
+            if is_zero(divisor):
+                raise ZeroDivisionError(f"Division by zero is undefined at line {self.line_number}")
+        return reduce(operator.truediv, args)
+
+    # Chained comparison; two arguments are compared directly, element-wise for arrays
+    def _compare(self, op, name, args):
+        self._check_arity(name, args)
+        for a, b in zip(args, args[1:]):
+            if not op(a, b):
+                return False
+        return True
+
+    def _num_eq(self, *args):
+        if len(args) == 2:
+            return args[0] == args[1]
+        return self._compare(operator.eq, '=', args)
+
+    def _lt(self, *args):
+        if len(args) == 2:
+            return args[0] < args[1]
+        return self._compare(operator.lt, '<', args)
+
+    def _gt(self, *args):
+        if len(args) == 2:
+            return args[0] > args[1]
+        return self._compare(operator.gt, '>', args)
+
+    def _le(self, *args):
+        if len(args) == 2:
+            return args[0] <= args[1]
+        return self._compare(operator.le, '<=', args)
+
+    def _ge(self, *args):
+        if len(args) == 2:
+            return args[0] >= args[1]
+        return self._compare(operator.ge, '>=', args)
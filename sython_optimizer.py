@@ -0,0 +1,236 @@
+from Symbol import String, Symbol
+
+OPTIMIZE_LEVELS = (0, 1, 2)
+
+# Primitives without side effects, so calls on constant arguments can be made ahead of time
+PURE_BUILTINS = frozenset(('+', '-', '*', '/', 'mod', '=', '<', '>', '<=', '>=', 'not', 'and', 'or',
+                           'sqrt', 'sin', 'cos', 'tan', 'log', 'pow', 'abs', 'floor', 'ceil', 'round'))
+
+CONSTANT_TYPES = (int, float, bool)  # values folding may produce and consume
+
+# Special forms the optimizer knows the scoping of; anything else is left alone
+KNOWN_FORMS = frozenset(('quote', 'define', 'define-memo', 'set!', 'if', 'delay', 'lambda'))
+
+
+class LocalRef:
+    """A variable reference resolved to the frame that binds it, depth frames out."""
+    __slots__ = ('name', 'depth')
+
+    def __init__(self, name, depth):
+        self.name = name
+        self.depth = depth
+
+    def lookup(self, env):
+        for _ in range(self.depth):
+            env = env.outer
+        return env[self.name]
+
+    def __reduce__(self):
+        return Symbol, (str(self.name),)  # other processes rebuild the frames, so send the name
+
+    def __repr__(self):
+        return f"{self.name}@{self.depth}"
+
+
+class Builtin:
+    """A primitive inlined in place of its name, which nothing shadows.
+
+    Once the program assigns the name, the node looks it up like any other
+    (see the interpreter's rebound_builtins).
+    """
+    __slots__ = ('name', 'value')
+
+    def __init__(self, name, value):
+        self.name = name
+        self.value = value
+
+    def __reduce__(self):
+        return Symbol, (str(self.name),)
+
+    def __repr__(self):
+        return str(self.name)
+
+
+class Folded:
+    """What an expression comes to given the primitives it uses: a constant, or the branch of an if that runs.
+
+    expr is the expression it stands for, run instead once the program has
+    assigned any of the names the primitives in names are bound to.
+    """
+    __slots__ = ('value', 'names', 'expr')
+
+    def __init__(self, value, names, expr):
+        self.value = value
+        self.names = names
+        self.expr = expr
+
+    def __reduce__(self):
+        return _source, (self.expr,)  # other processes optimize for themselves
+
+    def __repr__(self):
+        return repr(self.value)
+
+
+def _source(expr):
+    return expr
+
+
+def _constant(expr):
+    # (value, names of the primitives it depends on) for a constant, otherwise None
+    if type(expr) in CONSTANT_TYPES:
+        return expr, frozenset()
+    if type(expr) is Folded and type(expr.value) in CONSTANT_TYPES:
+        return expr.value, expr.names
+    return None
+
+
+class _Unknown(Exception):
+    """Raised for a form whose scoping the optimizer can't see through."""
+
+
+def _body_defines(expr, found):
+    # Names a define in this body binds in the frame running it (not in nested lambdas)
+    if not isinstance(expr, list) or not expr or expr[0] in ('quote', 'lambda'):
+        return found
+    if expr[0] in ('define', 'define-memo') and len(expr) == 3:
+        target = expr[1]
+        if isinstance(target, list):
+            found.add(target[0])
+            return found  # the function body is its own frame
+        found.add(target)
+    for item in expr[1:]:
+        _body_defines(item, found)
+    return found
+
+
+def _assigned(expr, found):
+    # Every name a define or set! anywhere in expr may rebind
+    if not isinstance(expr, list) or not expr or expr[0] == 'quote':
+        return found
+    if expr[0] in ('define', 'define-memo', 'set!') and len(expr) == 3:
+        target = expr[1]
+        found.add(target[0] if isinstance(target, list) and target else target)
+    for item in expr:
+        _assigned(item, found)
+    return found
+
+
+class Optimizer:
+    """Rewrite parsed expressions into cheaper equivalent ones before they run.
+
+    Level 1 folds calls of pure primitives on constant arguments, replaces
+    builtin constants such as #t and pi with their values, and drops the dead
+    branch of an if whose test is constant. Level 2 also inlines the value
+    of every primitive that no binding shadows and resolves references made
+    inside functions to the frame that binds them, so a lookup doesn't walk
+    the chain of frames in between. Level 0 leaves expressions untouched.
+
+    A form that defines or sets a primitive's name anywhere, and every form
+    run after it, treats that name as user code. Code optimized before the
+    program assigns the name keeps working: Builtin and Folded nodes check
+    the interpreter's rebound_builtins and fall back to the plain name or
+    expression.
+    """
+
+    def __init__(self, interpreter, level):
+        if level not in OPTIMIZE_LEVELS:
+            raise ValueError(f"Unknown optimization level {level}, expected one of {OPTIMIZE_LEVELS}")
+        self.interpreter = interpreter
+        self.level = level
+        self.assigned = set()  # names the form being optimized defines or sets
+
+    def optimize(self, expr, env):
+        """Return an optimized copy of expr, to be run in env."""
+        if not self.level:
+            return expr
+        self.assigned = _assigned(expr, set())
+        try:
+            return self._expr(expr, env, [])
+        except _Unknown:
+            return expr
+
+    def _expr(self, expr, env, scopes):
+        if isinstance(expr, str):
+            return expr if type(expr) is String else self._ref(expr, env, scopes)
+        if not isinstance(expr, list) or not expr:
+            return expr
+        op = expr[0]
+        if isinstance(op, str):
+            if op in self.interpreter.special_forms:
+                return self._special(expr, env, scopes)
+        head = self._expr(op, env, scopes)
+        args = [self._expr(arg, env, scopes) for arg in expr[1:]]
+        if isinstance(op, str):
+            return self._fold(op, head, args, env, scopes, expr)
+        return [head] + args
+
+    def _ref(self, name, env, scopes):
+        for depth, scope in enumerate(reversed(scopes)):
+            if name in scope:
+                return LocalRef(name, depth) if self.level >= 2 and depth else name
+        value = self._builtin(name, env, scopes)
+        if value is not None:
+            if type(value) in CONSTANT_TYPES:
+                return Folded(value, frozenset((name,)), name)
+            if self.level >= 2 and callable(value):
+                return Builtin(name, value)
+        if self.level >= 2 and scopes:
+            return LocalRef(name, len(scopes))  # the frame the outermost function was created in
+        return name
+
+    def _builtin(self, name, env, scopes):
+        """The builtin name is bound to, if no binding shadows it; otherwise None."""
+        if name in self.assigned or name in self.interpreter.rebound_builtins or any(name in scope for scope in scopes):
+            return None
+        try:
+            value = env[name]  # may install the library that defines it
+        except NameError:
+            return None
+        builtin = self.interpreter.builtins.get(name)
+        return value if builtin is not None and value is builtin else None
+
+    def _fold(self, name, head, args, env, scopes, expr):
+        constants = [_constant(arg) for arg in args]
+        if name in PURE_BUILTINS and None not in constants:
+            function = self._builtin(name, env, scopes)
+            if function is not None:
+                try:
+                    value = function(*[value for value, _ in constants])
+                except Exception:
+                    pass  # leave it to raise at run time, as before
+                else:
+                    if type(value) in CONSTANT_TYPES:
+                        return Folded(value, frozenset((name,)).union(*[names for _, names in constants]), expr)
+        return [head] + args
+
+    def _special(self, expr, env, scopes):
+        op = expr[0]
+        if op not in KNOWN_FORMS:
+            raise _Unknown(op)
+        if op == 'quote':
+            return expr
+        elif op in ('define', 'define-memo') and len(expr) == 3 and isinstance(expr[1], list):
+            _, (name, *params), body = expr
+            return [op, expr[1], self._function_body(params, body, env, scopes)]
+        elif op == 'lambda' and len(expr) == 3:
+            _, params, body = expr
+            return [op, params, self._function_body(params, body, env, scopes)]
+        elif op in ('define', 'set!') and len(expr) == 3:
+            return [op, expr[1], self._expr(expr[2], env, scopes)]
+        elif op == 'if' and len(expr) == 4:
+            condition = self._expr(expr[1], env, scopes)
+            constant = _constant(condition) or ((condition, frozenset()) if type(condition) is String else None)
+            if constant is not None:
+                value, names = constant
+                branch = self._expr(expr[2] if value else expr[3], env, scopes)
+                return Folded(branch, names, expr) if names else branch
+            return [op, condition, self._expr(expr[2], env, scopes), self._expr(expr[3], env, scopes)]
+        elif op == 'delay' and len(expr) == 2:
+            return [op, self._expr(expr[1], env, scopes)]
+        raise _Unknown(expr)  # malformed; let it fail the way it always has
+
+    def _function_body(self, params, body, env, scopes):
+        if not isinstance(params, list):
+            raise _Unknown(params)
+        scope = _body_defines(body, set(params))
+        return self._expr(body, env, scopes + [scope])
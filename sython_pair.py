@@ -0,0 +1,141 @@
+class Nil:
+    """The empty list. There is exactly one instance, NIL."""
+    __slots__ = ()
+
+    def __bool__(self):
+        return False
+
+    def __len__(self):
+        return 0
+
+    def __iter__(self):
+        return iter(())
+
+    def __eq__(self, other):
+        if isinstance(other, (list, tuple)):
+            return len(other) == 0
+        return other is self
+
+    def __hash__(self):
+        return hash(())
+
+    def __reduce__(self):
+        return 'NIL'  # pickle as a reference to the module-level singleton
+
+    def __repr__(self):
+        return '()'
+
+
+NIL = Nil()
+
+
+class Pair:
+    """An immutable cons cell. Chains of pairs ending in NIL are Sython lists.
+
+    car, cdr and cons are O(1) and lists built with cons share their tails.
+    Pairs compare equal to Python lists and tuples with equal elements, so
+    results can be checked against plain Python data.
+    """
+    __slots__ = ('car', 'cdr')
+
+    def __init__(self, car, cdr):
+        self.car = car
+        self.cdr = cdr
+
+    def __iter__(self):
+        pair = self
+        while type(pair) is Pair:
+            yield pair.car
+            pair = pair.cdr
+
+    def __len__(self):
+        n = 0
+        pair = self
+        while type(pair) is Pair:
+            n += 1
+            pair = pair.cdr
+        return n
+
+    def __bool__(self):
+        return True  # never walk the list just to test truthiness
+
+    def __eq__(self, other):
+        if isinstance(other, (list, tuple)):
+            other = from_iterable(other)
+        elif not isinstance(other, Pair):
+            return NotImplemented
+        a, b = self, other
+        while True:
+            if a is b:
+                return True
+            if type(a) is not Pair:
+                return type(b) is not Pair and a == b
+            if type(b) is not Pair or a.car != b.car:
+                return False
+            a, b = a.cdr, b.cdr
+
+    def __hash__(self):
+        items, tail = self._split()
+        return hash(items) if tail is NIL else hash((items, tail))
+
+    def _split(self):
+        """Return the elements as a tuple and the final cdr (NIL for proper lists)."""
+        items = []
+        pair = self
+        while type(pair) is Pair:
+            items.append(pair.car)
+            pair = pair.cdr
+        return tuple(items), pair
+
+    def __reduce__(self):
+        # Pickle flat rather than as a chain of nested pairs, which would
+        # recurse once per element
+        return from_iterable, self._split()
+
+    def __repr__(self):
+        items, tail = self._split()
+        text = ' '.join(map(str, items))
+        if tail is not NIL:
+            text += f' . {tail}'
+        return f'({text})'
+
+    __str__ = __repr__
+
+
+def cons(x, y):
+    """Prepend x to the list y in O(1), sharing y as the tail."""
+    if type(y) is Pair or y is NIL:
+        return Pair(x, y)
+    if isinstance(y, (list, tuple)):
+        return Pair(x, from_iterable(y))
+    return Pair(x, Pair(y, NIL))  # (cons 1 2) has always built the list (1 2)
+
+
+def from_iterable(items, tail=NIL):
+    """Build a Sython list from any Python iterable in a single pass."""
+    head = last = None
+    for item in items:
+        pair = Pair(item, NIL)
+        if last is None:
+            head = pair
+        else:
+            last.cdr = pair  # only while building, before anyone else sees it
+        last = pair
+    if head is None:
+        return tail
+    last.cdr = tail
+    return head
+
+
+def to_datum(value):
+    """Convert nested Python lists and tuples into Sython lists."""
+    if isinstance(value, (list, tuple)):
+        return from_iterable(map(to_datum, value))
+    return value
+
+
+def to_python(value):
+    """Convert nested Sython lists into Python lists."""
+    if type(value) is Pair or value is NIL:
+        return [to_python(item) for item in value]
+    return value
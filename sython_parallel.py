@@ -0,0 +1,174 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from Symbol import String
+from sython_environment import Environment
+from sython_jit import Untranslatable
+from sython_memo import MemoizedProcedure
+from sython_optimizer import Folded, LocalRef
+from sython_procedure import Procedure
+
+CHUNKS_PER_WORKER = 4  # enough chunks to even out uneven work without paying per-item IPC
+
+_worker = None  # the interpreter Sython closures are rebuilt against in this process
+_in_pool = False  # True inside pool workers, which run pmap serially
+
+
+class BuiltinRef:
+    """A primitive captured by a closure, sent by name and looked up again on arrival."""
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+    def __reduce__(self):
+        return BuiltinRef, (self.name,)
+
+
+def _is_sython_function(value):
+    return type(value) in (Procedure, MemoizedProcedure) or hasattr(value, 'procedure')
+
+
+def free_symbols(expr, found=None):
+    """Names referenced anywhere in expr, excluding quoted data and string literals."""
+    if found is None:
+        found = set()
+    if isinstance(expr, str):
+        if type(expr) is not String:
+            found.add(expr)
+    elif type(expr) is LocalRef:
+        found.add(expr.name)
+    elif type(expr) is Folded:
+        free_symbols(expr.expr, found)
+    elif isinstance(expr, list) and expr:
+        if expr[0] == 'quote':
+            return found
+        for item in expr:
+            free_symbols(item, found)
+    return found
+
+
+def _builtin_names(env):
+    """Map id() of each primitive bound in env's global frame to its first name there."""
+    while env.outer is not None:
+        env = env.outer
+    builtins = {}
+    for name, value in dict.items(env):
+        if callable(value) and not _is_sython_function(value):
+            builtins.setdefault(id(value), name)
+    return builtins
+
+
+def portable(func, env):
+    """func in a form that can be sent to a worker: primitives are sent by name."""
+    if hasattr(func, 'procedure'):
+        return func.procedure  # a JIT-translated function; the worker translates its own
+    if not _is_sython_function(func):
+        name = _builtin_names(env).get(id(func))
+        if name is not None:
+            return BuiltinRef(name)
+    return func
+
+
+def captured_bindings(proc):
+    """The bindings proc's body needs from its defining environment, made picklable.
+
+    Sython functions are kept (and pickled in turn), primitives become
+    BuiltinRefs, and anything else is sent by value.
+    """
+    captured = {}
+    for name in free_symbols(proc.body) - set(proc.params):
+        try:
+            value = proc.env[name]
+        except NameError:
+            continue  # e.g. a special form name, or unbound until the call fails
+        captured[name] = value.procedure if hasattr(value, 'procedure') else value
+
+    builtins = _builtin_names(proc.env)  # after the lookups, which may have installed a library
+    for name, value in captured.items():
+        if id(value) in builtins:
+            captured[name] = BuiltinRef(builtins[id(value)])
+    return captured
+
+
+def rebuild_procedure(params, body, name):
+    # The environment and code are filled in by Procedure.__setstate__
+    return Procedure(params, body, None, None, name)
+
+
+def restore_procedure(proc, captured):
+    interpreter = worker_interpreter()
+    env = Environment(outer=interpreter.env)
+    for name, value in captured.items():
+        env[name] = interpreter.env[value.name] if type(value) is BuiltinRef else value
+    proc.env = env
+    if interpreter.engine == 'eval':
+        proc.code = lambda frame, body=proc.body: interpreter.evaluate(body, frame)
+    else:
+        proc.code = interpreter.compile_body(proc.body, proc.name)
+        if interpreter.jit is not None:
+            interpreter.jit.watch(proc)  # recursive functions capture themselves, so they can be promoted
+
+
+def worker_interpreter():
+    """The interpreter unpickled closures run in, created on first use outside a pool."""
+    global _worker
+    if _worker is None:
+        from sython_extended import SythonExtended
+        _worker = SythonExtended()
+    return _worker
+
+
+def _init_worker(interpreter_class, options):
+    global _worker, _in_pool
+    _worker = interpreter_class(**options)
+    _in_pool = True
+
+
+def _run_chunk(func, items):
+    if type(func) is BuiltinRef:
+        func = _worker.env[func.name]
+    elif type(func) is Procedure and _worker.jit is not None:
+        # Every item is a call, so translate the function up front
+        try:
+            func = _worker.jit.translate(func)
+        except Untranslatable:
+            pass
+    try:
+        return [func(item) for item in items]
+    finally:
+        _worker.output.flush()  # anything the function displayed
+
+
+class ProcessPool:
+    """A pool of worker processes, each with its own interpreter, kept warm between calls.
+
+    Functions are pickled as their parameters, body and captured bindings and
+    rebuilt in the worker. Items are sent in chunks and results come back in
+    the order of the input.
+    """
+
+    def __init__(self, interpreter_class, options, workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                            initargs=(interpreter_class, options))
+
+    def map(self, func, items, env, chunksize=None):
+        """Results of func(item) for each item, in order; env is where func was looked up."""
+        func = portable(func, env)
+        items = list(items)
+        if chunksize is None:
+            chunksize = max(1, -(-len(items) // (self.workers * CHUNKS_PER_WORKER)))
+        futures = [self.executor.submit(_run_chunk, func, items[i:i + chunksize])
+                   for i in range(0, len(items), chunksize)]
+        results = []
+        for future in futures:
+            results.extend(future.result())
+        return results
+
+    def close(self):
+        self.executor.shutdown()
+
+
+def in_pool_worker():
+    return _in_pool
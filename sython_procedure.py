@@ -0,0 +1,62 @@
+from sython_environment import Environment
+
+
+class TailCall:
+    """A call in tail position, returned to the caller's trampoline instead of made."""
+    __slots__ = ('proc', 'args')
+
+    def __init__(self, proc, args):
+        self.proc = proc
+        self.args = args
+
+
+class Procedure:
+    """A user-defined function created by define or lambda.
+
+    code runs the body in a frame binding params; it may return a TailCall,
+    which __call__ keeps unwinding in a loop so tail-recursive Sython
+    functions run in constant Python stack depth.
+    """
+    __slots__ = ('params', 'body', 'env', 'code', 'name')
+
+    def __init__(self, params, body, env, code, name='lambda'):
+        self.params = params  # parameter names
+        self.body = body      # body expression (AST)
+        self.env = env        # defining frame
+        self.code = code      # callable running the body in a given frame
+        self.name = name
+
+    def __call__(self, *args):
+        proc = self
+        while True:
+            result = proc.code(Environment(zip(proc.params, args), proc.env))
+            if type(result) is not TailCall:
+                return result
+            proc, args = result.proc, result.args
+            if type(proc) is not Procedure:
+                return proc(*args)
+
+    def __reduce__(self):
+        # Sent to other processes as data; the code is compiled again on arrival
+        from sython_parallel import captured_bindings, rebuild_procedure
+        return rebuild_procedure, (self.params, self.body, self.name), captured_bindings(self)
+
+    def __setstate__(self, captured):
+        from sython_parallel import restore_procedure
+        restore_procedure(self, captured)
+
+    def __repr__(self):
+        return f"<procedure {self.name}>"
+
+
+call_procedure = Procedure.__call__  # replaced on the class while a profiler is running
+
+
+def run_tail_calls(result):
+    """Make the calls a TailCall stands for until one returns a value, as Procedure.__call__ does."""
+    while type(result) is TailCall:
+        proc, args = result.proc, result.args
+        if type(proc) is not Procedure:
+            return proc(*args)
+        result = proc.code(Environment(zip(proc.params, args), proc.env))
+    return result
@@ -0,0 +1,177 @@
+import sys
+from time import perf_counter
+
+from sython_procedure import Procedure, TailCall
+from sython_environment import Environment
+from sython_async import AsyncPrimitive
+
+_active = None  # Procedure.__call__ is patched for one profiler at a time
+
+
+class FunctionStats:
+    """Totals for one function name: calls, inclusive and exclusive seconds, net memory blocks."""
+    __slots__ = ('name', 'kind', 'calls', 'inclusive', 'exclusive', 'blocks', 'active')
+
+    def __init__(self, name, kind):
+        self.name = name
+        self.kind = kind      # 'function', 'primitive' or 'jit'
+        self.calls = 0
+        self.inclusive = 0.0  # time with callees, counted once across recursive calls
+        self.exclusive = 0.0  # time in the function itself
+        self.blocks = 0       # memory blocks still allocated when its calls returned
+        self.active = 0       # calls currently on the stack
+
+
+class _Node:
+    # One node of the call tree, for collapsed stacks
+    __slots__ = ('children', 'self_time')
+
+    def __init__(self):
+        self.children = {}
+        self.self_time = 0.0
+
+
+class Profiler:
+    """Record where a running interpreter spends its time, per function.
+
+    While started, Procedure calls go through a timing version of
+    Procedure.__call__, and every primitive in the global environment is
+    replaced by a timing wrapper. Stopping restores both, so an interpreter
+    that is not being profiled runs exactly the code it always did. Calls
+    made by the eval engine are inlined into evaluate and are not seen;
+    only primitives are timed there. Primitives inlined by the optimizer
+    (-O2) are not seen either. The JIT does not translate functions while
+    profiling. Libraries not loaded yet are installed when profiling
+    starts, so their primitives are timed too and installing them isn't
+    billed to the function that first used one.
+    """
+
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        self.stats = {}
+        self.root = _Node()
+        self.stack = []  # [stats, start, child time, blocks at start, node] per active call
+        self.wrapped = []  # (name, primitive, wrapper) bound in the global environment
+        self.original_call = None
+
+    def start(self):
+        global _active
+        if _active is not None:
+            raise RuntimeError("A profiler is already running in this process")
+        _active = self
+        self.original_call = Procedure.__call__
+        Procedure.__call__ = self._profiled_call()
+        interpreter = self.interpreter
+        for library in interpreter.libraries:
+            if library not in interpreter.loaded_libraries:
+                interpreter.load_library(library)
+        self.wrap_primitives(list(dict.keys(interpreter.env)))
+        if self.interpreter.jit is not None:
+            self.interpreter.jit.paused = True
+        return self
+
+    def wrap_primitives(self, names):
+        """Replace the primitives bound to names in the global environment by timing wrappers."""
+        env = self.interpreter.env
+        for name in names:
+            value = dict.get(env, name)
+            if callable(value) and type(value) is not Procedure and type(value) is not AsyncPrimitive:
+                kind = 'jit' if hasattr(value, 'procedure') else 'primitive'
+                wrapper = self._wrap(name, kind, value)
+                env[name] = wrapper
+                self.wrapped.append((name, value, wrapper))
+
+    def stop(self):
+        global _active
+        if _active is not self:
+            return self
+        Procedure.__call__ = self.original_call
+        env = self.interpreter.env
+        for name, value, wrapper in self.wrapped:
+            if dict.get(env, name) is wrapper:
+                env[name] = value
+        self.wrapped = []
+        if self.interpreter.jit is not None:
+            self.interpreter.jit.paused = False
+        _active = None
+        return self
+
+    def _function_stats(self, name, kind):
+        stats = self.stats.get((name, kind))
+        if stats is None:
+            stats = self.stats[(name, kind)] = FunctionStats(name, kind)
+        return stats
+
+    def _enter(self, stats):
+        parent = self.stack[-1][4] if self.stack else self.root
+        node = parent.children.get(stats.name)
+        if node is None:
+            node = parent.children[stats.name] = _Node()
+        stats.calls += 1
+        stats.active += 1
+        self.stack.append([stats, perf_counter(), 0.0, sys.getallocatedblocks(), node])
+
+    def _exit(self):
+        stats, start, child_time, blocks, node = self.stack.pop()
+        blocks = sys.getallocatedblocks() - blocks
+        elapsed = perf_counter() - start
+        stats.active -= 1
+        if not stats.active:  # outermost call of a recursion
+            stats.inclusive += elapsed
+            stats.blocks += blocks
+        stats.exclusive += elapsed - child_time
+        node.self_time += elapsed - child_time
+        if self.stack:
+            self.stack[-1][2] += elapsed
+
+    def _wrap(self, name, kind, function):
+        stats = self._function_stats(name, kind)
+        enter, exit = self._enter, self._exit
+
+        def profiled(*args):
+            enter(stats)
+            try:
+                return function(*args)
+            finally:
+                exit()
+        profiled.__name__ = getattr(function, '__name__', name)
+        return profiled
+
+    def _profiled_call(self):
+        function_stats, enter, exit = self._function_stats, self._enter, self._exit
+
+        def __call__(proc, *args):
+            # Procedure.__call__ with each trip round the trampoline timed as one call
+            while True:
+                enter(function_stats(proc.name, 'function'))
+                try:
+                    result = proc.code(Environment(zip(proc.params, args), proc.env))
+                finally:
+                    exit()
+                if type(result) is not TailCall:
+                    return result
+                proc, args = result.proc, result.args
+                if type(proc) is not Procedure:
+                    return proc(*args)
+        return __call__
+
+    def report(self, sort='exclusive', limit=None):
+        """The stats as a table, most expensive first."""
+        rows = sorted(self.stats.values(), key=lambda s: getattr(s, sort), reverse=True)
+        rows = [s for s in rows if s.calls][:limit]
+        lines = [f"{'calls':>10}  {'total s':>9}  {'self s':>9}  {'per call us':>11}  {'blocks':>8}  function"]
+        for s in rows:
+            lines.append(f"{s.calls:>10}  {s.inclusive:>9.4f}  {s.exclusive:>9.4f}  "
+                         f"{s.exclusive / s.calls * 1e6:>11.2f}  {s.blocks:>8}  {s.name} ({s.kind})")
+        return '\n'.join(lines)
+
+    def collapsed_stacks(self):
+        """Lines of 'outer;inner microseconds' for flame graph tools."""
+        lines = []
+        pending = [((name,), node) for name, node in self.root.children.items()]
+        while pending:
+            path, node = pending.pop()
+            if node.self_time:
+                lines.append(f"{';'.join(map(str, path))} {round(node.self_time * 1e6)}")
+            pending.extend((path + (name,), child) for name, child in node.children.items())
+        return sorted(lines)
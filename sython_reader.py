@@ -0,0 +1,72 @@
+import re
+
+# One alternative per token class; 'partial' catches a string literal that
+# runs past the end of the buffered input and needs the next chunk.
+TOKEN_RE = re.compile(r'''
+    (?P<space>\s+)
+  | (?P<comment>;[^\n]*)
+  | (?P<string>"(?:[^"\\]|\\.)*")
+  | (?P<punct>\#\(|[()'])
+  | (?P<atom>[^\s()'";]+)
+  | (?P<partial>".*)
+''', re.VERBOSE | re.DOTALL)
+
+# Token classes that may continue past the end of a chunk
+CONTINUABLE = frozenset(('comment', 'atom', 'partial'))
+
+CHUNK_SIZE = 1 << 16
+
+
+def _chunks(source, chunk_size):
+    if isinstance(source, str):
+        yield source
+    elif hasattr(source, 'read'):  # file-like object: read in large blocks
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    else:  # any other iterable of strings, e.g. lines
+        yield from source
+
+
+def iter_tokens(source, chunk_size=CHUNK_SIZE):
+    """Lazily yield (token, line, column) tuples from source code.
+
+    source may be a string, an open text file or an iterable of strings.
+    Files are read in blocks of chunk_size characters, so memory use does not
+    grow with the size of the input. Lines and columns start at 1.
+    """
+    buffer = ''
+    line, column = 1, 1
+    chunks = _chunks(source, chunk_size)
+    at_eof = False
+    while not at_eof:
+        chunk = next(chunks, None)
+        if chunk is None:
+            at_eof = True
+        else:
+            buffer += chunk
+        pos, end = 0, len(buffer)
+        while pos < end:
+            match = TOKEN_RE.match(buffer, pos)
+            kind = match.lastgroup
+            if match.end() == end and not at_eof and kind in CONTINUABLE:
+                break  # the token may continue in the next chunk
+            text = match.group()
+            if kind == 'partial':
+                raise SyntaxError(f"unterminated string starting at line {line}, column {column}")
+            if kind != 'space' and kind != 'comment':
+                yield text, line, column
+            if kind == 'space' or kind == 'string':
+                newlines = text.count('\n')
+                if newlines:
+                    line += newlines
+                    column = len(text) - text.rfind('\n')
+                else:
+                    column += len(text)
+            else:
+                column += len(text)
+            pos = match.end()
+        buffer = buffer[pos:]
+
@@ -0,0 +1,200 @@
+from types import MethodType
+
+from sython_collections import HashTable, Vector
+from sython_environment import Environment, GlobalEnvironment
+from sython_forms import SpecialForm
+from sython_io import OutputPort
+from sython_jit import CompiledProcedure, SythonJit
+from sython_memo import MemoizedProcedure
+from sython_modules import Module
+from sython_optimizer import Builtin, Folded, Optimizer
+from sython_procedure import Procedure
+
+# Interpreter attributes a fork builds for itself instead of copying
+FRESH = frozenset(('env', 'special_forms', 'builtins', 'jit', 'optimizer', 'output', '_pool', 'profiler',
+                   'line_number', 'modules', 'rebound_builtins', '_tokenized'))
+
+
+class _Copier:
+    """Copy bindings from one interpreter's world into another's.
+
+    Primitives bound to the old interpreter are bound to the new one.
+    Procedures are copied along with the frames they close over, and get
+    their code from the new interpreter the first time they are called;
+    primitives the optimizer inlined in their bodies are rebound too.
+    Vectors and hash tables are copied with what they hold. With new None
+    procedures are copied without code, as templates. Any
+    other value is shared. Each object is copied once, so bindings that
+    share a value still share it afterwards.
+    """
+
+    def __init__(self, old, new):
+        self.old = old
+        self.new = new
+        self.copies = {}  # id of an original -> its copy
+        self.frames = {}  # id of an original frame -> its copy
+        # Only level 2 inlines primitives into bodies, and templates keep them as they are
+        self.rebind_bodies = new is not None and old.optimizer is not None and old.optimizer.level >= 2
+
+    def value(self, value):
+        copy = self.copies.get(id(value))
+        if copy is not None:
+            return copy
+        kind = type(value)
+        if kind is MethodType and value.__self__ is self.old:
+            if self.new is None:
+                return value
+            copy = MethodType(value.__func__, self.new)
+        elif kind is Procedure:
+            body = self.body(value.body) if self.rebind_bodies else value.body
+            copy = self.copies[id(value)] = Procedure(value.params, body, None, None, value.name)
+            copy.env = self.frame(value.env)  # may hold copy itself, so it is registered first
+            if self.new is not None:
+                copy.code = _compile_on_call(self.new, copy)
+        elif kind is MemoizedProcedure:
+            copy = MemoizedProcedure(self.value(value.func), value.maxsize, value.name)
+        elif kind is Vector:
+            copy = self.copies[id(value)] = Vector()
+            copy.items = [self.value(item) for item in value.items]
+        elif kind is HashTable:
+            copy = self.copies[id(value)] = HashTable()
+            for key, item in value.items():
+                copy[key] = self.value(item)
+        elif kind is Module:
+            copy = Module(value.name, value.path, self.frame(value.env), value.exports)
+        elif isinstance(value, CompiledProcedure):
+            copy = self.value(value.procedure)  # translated by the JIT; the fork translates its own
+        else:
+            return value
+        self.copies[id(value)] = copy
+        return copy
+
+    def body(self, expr):
+        """expr with its inlined primitives bound to the new interpreter; unchanged parts are shared."""
+        if type(expr) is Builtin:
+            value = self.value(expr.value)
+            return expr if value is expr.value else Builtin(expr.name, value)
+        if type(expr) is Folded:
+            value = self.value(expr.value)
+            return expr if value is expr.value else Folded(value, expr.names, expr.expr)
+        if isinstance(expr, list) and expr and expr[0] != 'quote':
+            items = [self.body(item) for item in expr]
+            if any(item is not original for item, original in zip(items, expr)):
+                return items
+        return expr
+
+    def frame(self, env):
+        if env is None:
+            return None
+        copy = self.frames.get(id(env))
+        if copy is None:
+            copy = self.frames[id(env)] = Environment()
+            copy.outer = self.frame(env.outer)
+            for name, value in dict.items(env):
+                copy[name] = self.value(value)
+        return copy
+
+
+def _compile_on_call(interpreter, proc):
+    """Code for proc that compiles its body on the first call, so forking doesn't compile anything."""
+    def first_call(frame):
+        if interpreter.engine == 'eval':
+            proc.code = interpreter.make_procedure(proc.params, proc.body, None, proc.name).code
+        else:
+            proc.code = interpreter.compile_body(proc.body, proc.name)
+        if interpreter.jit is not None:
+            interpreter.jit.watch(proc)
+        return proc.code(frame)
+    return first_call
+
+
+class Snapshot:
+    """The state of an interpreter at one moment, for starting new interpreters from.
+
+    Taking a snapshot copies the global bindings, primitives, the user
+    definitions of a prelude and all. fork() makes a new interpreter from it
+    without running standard_env or the prelude again: values are shared,
+    primitives are bound to the new interpreter, and procedures are copied
+    and compiled the first time the fork calls them. What a fork defines or
+    sets stays in that fork, and so do changes to the vectors and hash tables
+    it was given, which are copied. Other values such as lists are shared,
+    which is safe because Sython has no way to modify them.
+
+    Special forms registered with a plain function keep calling it, so they
+    still refer to the interpreter they were written for.
+    """
+
+    def __init__(self, interpreter):
+        if interpreter.profiler is not None:
+            raise RuntimeError("Stop profiling before taking a snapshot")
+        self.cls = type(interpreter)
+        self.owner = interpreter
+        self.jit_threshold = interpreter.jit.threshold if interpreter.jit is not None else None
+        self.optimize = interpreter.optimizer.level if interpreter.optimizer is not None else 0
+        self.special_forms = list(interpreter.special_forms.values())
+
+        copier = _Copier(interpreter, None)
+        self.globals = copier.frame(interpreter.env)
+        # Sort everything once: shared values are copied in one go, the rest one by one
+        self.state = self._sort(copier, ((key, value) for key, value in vars(interpreter).items()
+                                         if key not in FRESH))
+        self.bindings = self._sort(copier, dict.items(interpreter.env))
+        self.builtins = self._sort(copier, interpreter.builtins.items())
+        self.modules = {path: copier.value(module) for path, module in interpreter.modules.items()}
+        self.rebound_builtins = frozenset(interpreter.rebound_builtins)
+
+    def _sort(self, copier, bindings):
+        """Split bindings into a dict of shared values, primitives to bind and other values to copy."""
+        shared, methods, copied = {}, [], []
+        for name, value in bindings:
+            template = copier.value(value)
+            if type(value) is MethodType and value.__self__ is self.owner:
+                methods.append((name, value.__func__, id(value)))
+            elif template is value:
+                shared[name] = value
+            else:
+                copied.append((name, template))
+        return shared, methods, copied
+
+    def fork(self):
+        """A new interpreter in the state the snapshot was taken in."""
+        interpreter = self.cls.__new__(self.cls)
+        owner = self.owner
+        copier = _Copier(owner, interpreter)
+        copies = copier.copies
+
+        def bind(target, sorted_bindings):
+            shared, methods, copied = sorted_bindings
+            target.update(shared)
+            for name, func, key in methods:
+                method = copies.get(key)
+                if method is None:
+                    method = copies[key] = MethodType(func, interpreter)
+                target[name] = method  # one object per primitive, so identity checks hold
+            for name, value in copied:
+                target[name] = copier.value(value)
+
+        interpreter.env = env = GlobalEnvironment(autoload=interpreter._autoload)
+        copier.frames[id(self.globals)] = env
+        bind(interpreter.__dict__, self.state)
+        bind(env, self.bindings)
+        interpreter.builtins = {}
+        bind(interpreter.builtins, self.builtins)
+        interpreter.modules = {path: copier.value(module) for path, module in self.modules.items()}
+        interpreter.rebound_builtins = set(self.rebound_builtins)
+
+        def rebind(handler):
+            if type(handler) is MethodType and handler.__self__ is owner:
+                return MethodType(handler.__func__, interpreter)
+            return handler
+        interpreter.special_forms = {form.name: SpecialForm(form.name, rebind(form.compile), rebind(form.evaluate),
+                                                            form.tail, rebind(form.evaluate_async))
+                                     for form in self.special_forms}
+        interpreter.jit = SythonJit(interpreter, self.jit_threshold) if self.jit_threshold is not None else None
+        interpreter.optimizer = Optimizer(interpreter, self.optimize) if self.optimize else None
+        interpreter.output = OutputPort(buffer_size=0 if interpreter.debug else interpreter.output_buffer_size)
+        interpreter._pool = None
+        interpreter.profiler = None
+        interpreter.line_number = 1
+        interpreter._tokenized = [], []
+        return interpreter
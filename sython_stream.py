@@ -0,0 +1,95 @@
+from itertools import islice
+
+
+class Promise:
+    """A delayed expression, evaluated by force at most once."""
+    __slots__ = ('thunk', 'value', 'forced')
+
+    def __init__(self, thunk):
+        self.thunk = thunk
+        self.value = None
+        self.forced = False
+
+    def force(self):
+        if not self.forced:
+            self.value = self.thunk()
+            self.forced = True
+            self.thunk = None  # let the captured environment go
+        return self.value
+
+    def __repr__(self):
+        return f"#<promise {'forced' if self.forced else 'pending'}>"
+
+
+def force(value):
+    """Force a promise; any other value is returned as is."""
+    return value.force() if type(value) is Promise else value
+
+
+class Stream:
+    """A lazy sequence backed by Python iterators.
+
+    Holds a function returning a fresh iterator, so a stream can be walked
+    more than once and each walk recomputes its elements one at a time
+    instead of materializing them.
+    """
+    __slots__ = ('iterate',)
+
+    def __init__(self, iterate):
+        self.iterate = iterate
+
+    def __iter__(self):
+        return self.iterate()
+
+    def __repr__(self):
+        return "#<stream>"
+
+
+def stream_range(start, stop=None, step=1):
+    """(range n), (range start stop) or (range start stop step)."""
+    if stop is None:
+        start, stop = 0, start
+    if all(type(x) is int for x in (start, stop, step)):
+        return Stream(lambda: iter(range(start, stop, step)))
+    if step == 0:
+        raise ValueError("range step must not be zero")
+
+    def floats():
+        value = start
+        while (value < stop) if step > 0 else (value > stop):
+            yield value
+            value += step
+    return Stream(floats)
+
+
+def stream_map(func, *sequences):
+    return Stream(lambda: map(func, *sequences))
+
+
+def stream_filter(predicate, sequence):
+    return Stream(lambda: filter(predicate, sequence))
+
+
+def stream_take(n, sequence):
+    return Stream(lambda: islice(sequence, n))
+
+
+_NO_INITIAL = object()
+
+
+def stream_reduce(func, sequence, initial=_NO_INITIAL):
+    """Fold a sequence from the left, pulling one element at a time."""
+    items = iter(sequence)
+    result = initial
+    if result is _NO_INITIAL:
+        try:
+            result = next(items)
+        except StopIteration:
+            raise ValueError("Cannot reduce an empty list") from None
+    for item in items:
+        result = func(result, item)
+    return result
+
+
+def list_to_stream(sequence):
+    return Stream(lambda: iter(sequence))
@@ -76,5 +76,10 @@ class TestSchemeInterpreter(unittest.TestCase):
         self.sy.run("(define x 10)")
         self.assertEqual(self.sy.run("x"), 10)
 
+class TestSchemeInterpreterEvalEngine(TestSchemeInterpreter):
+    """Run the same suite against the reference tree-walking evaluator."""
+    def setUp(self):
+        self.sy = SythonInterpreter(engine='eval')
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
@@ -0,0 +1,169 @@
+import json
+import time
+
+from Symbol import String
+from sython_procedure import TailCall
+
+EVENTS = frozenset(('enter', 'call', 'return', 'define', 'error'))
+CALL_EVENTS = frozenset(('call', 'return'))
+
+
+def format_expr(expr):
+    """Source text for a parsed expression."""
+    if isinstance(expr, list):
+        return f"({' '.join(map(format_expr, expr))})"
+    if type(expr) is String:
+        return f'"{expr}"'
+    return str(expr)
+
+
+def traced_code(tracer, code, name):
+    """Wrap the code of a procedure so it reports its calls and returns to tracer."""
+    calls, returns = 'call' in tracer.events, 'return' in tracer.events
+
+    def traced(frame):
+        if calls:
+            tracer.on_call(name, list(dict.values(frame)))
+        value = code(frame)
+        if returns and type(value) is not TailCall:  # a tail call returns for it
+            tracer.on_return(name, value)
+        return value
+    return traced
+
+
+class Tracer:
+    """Receives events from a running interpreter; subclasses override the hooks they need.
+
+    events names the events the tracer wants. The interpreter reads it once,
+    when it is created, and only puts hooks for those events in the code it
+    runs, so an interpreter without a tracer, or with one that only wants
+    errors, runs exactly the code it would otherwise.
+
+    on_enter(expr, env) is called as each expression starts evaluating,
+    on_call(name, args) as the body of a defined function starts and
+    on_return(name, value) as it finishes. A function whose body ends in a
+    tail call doesn't return on its own: the function it called returns for
+    it. on_define(name, value) follows each define, and on_error(error, line)
+    is called with an exception that ends a top-level expression.
+    """
+    events = EVENTS
+
+    def on_enter(self, expr, env):
+        pass
+
+    def on_call(self, name, args):
+        pass
+
+    def on_return(self, name, value):
+        pass
+
+    def on_define(self, name, value):
+        pass
+
+    def on_error(self, error, line):
+        pass
+
+
+class PrintTracer(Tracer):
+    """Print every event to stdout; what SythonInterpreter(debug=True) uses."""
+
+    def __init__(self, events=EVENTS):
+        self.events = frozenset(events)
+
+    def _print(self, message):
+        print(f"[DEBUG] {message}")
+
+    def on_enter(self, expr, env):
+        self._print(f"Evaluating {format_expr(expr)}")
+
+    def on_call(self, name, args):
+        self._print(f"Calling {name} with ({' '.join(map(str, args))})")
+
+    def on_return(self, name, value):
+        self._print(f"{name} returned {value}")
+
+    def on_define(self, name, value):
+        self._print(f"Defined {name} as {value}")
+
+    def on_error(self, error, line):
+        self._print(f"{type(error).__name__} at line {line}: {error}")
+
+
+class JsonlTracer(Tracer):
+    """Write each event as a line of JSON to a text file.
+
+    Every record has the event name and the wall-clock time; values are
+    written as their display text, cut to max_length characters. By default
+    only calls, returns, defines and errors are written, since an enter event
+    for every expression costs far more than the rest.
+    """
+
+    def __init__(self, file, events=('call', 'return', 'define', 'error'), max_length=200):
+        self.file = file
+        self.events = frozenset(events)
+        self.max_length = max_length
+
+    def _text(self, value):
+        text = value if type(value) is str else str(value)
+        return text if len(text) <= self.max_length else text[:self.max_length] + '...'
+
+    def _write(self, record):
+        record['time'] = time.time()
+        self.file.write(json.dumps(record) + '\n')
+
+    def on_enter(self, expr, env):
+        self._write({'event': 'enter', 'expr': self._text(format_expr(expr))})
+
+    def on_call(self, name, args):
+        self._write({'event': 'call', 'name': name, 'args': [self._text(arg) for arg in args]})
+
+    def on_return(self, name, value):
+        self._write({'event': 'return', 'name': name, 'value': self._text(value)})
+
+    def on_define(self, name, value):
+        self._write({'event': 'define', 'name': name, 'value': self._text(value)})
+
+    def on_error(self, error, line):
+        self._write({'event': 'error', 'error': f"{type(error).__name__}: {error}", 'line': line})
+
+
+class SamplingTracer(Tracer):
+    """Pass every every-th enter, call and return event on to another tracer, and all defines and errors.
+
+    Each kind of event is counted separately, so a sampled return doesn't
+    necessarily belong to a sampled call. The cost of what tracer does with
+    an event is divided by every; the interpreter still calls the hooks.
+    """
+
+    def __init__(self, tracer, every=100):
+        if every < 1:
+            raise ValueError(f"every must be at least 1, got {every}")
+        self.tracer = tracer
+        self.every = every
+        self.events = tracer.events
+        self._enters = self._calls = self._returns = every
+
+    def on_enter(self, expr, env):
+        self._enters -= 1
+        if not self._enters:
+            self._enters = self.every
+            self.tracer.on_enter(expr, env)
+
+    def on_call(self, name, args):
+        self._calls -= 1
+        if not self._calls:
+            self._calls = self.every
+            self.tracer.on_call(name, args)
+
+    def on_return(self, name, value):
+        self._returns -= 1
+        if not self._returns:
+            self._returns = self.every
+            self.tracer.on_return(name, value)
+
+    def on_define(self, name, value):
+        self.tracer.on_define(name, value)
+
+    def on_error(self, error, line):
+        self.tracer.on_error(error, line)
+
@@ -0,0 +1,88 @@
+import math
+import unittest
+from sython_extended import SythonExtended
+from sython_array import SythonArray
+
+
+class TestSythonArray(unittest.TestCase):
+    def setUp(self):
+        self.sy = SythonExtended()
+        self.sy.run("(define a (array 1 2 3 4))")
+
+    def assertArray(self, code, expected):
+        result = self.sy.run(code)
+        self.assertIsInstance(result, SythonArray)
+        for actual, wanted in zip(result, expected, strict=True):
+            self.assertAlmostEqual(actual, wanted, places=9)
+
+    def test_broadcast_arithmetic(self):
+        self.assertArray("(+ a 1)", [2, 3, 4, 5])
+        self.assertArray("(- 10 a)", [9, 8, 7, 6])
+        self.assertArray("(* a a)", [1, 4, 9, 16])
+        self.assertArray("(/ a 2)", [0.5, 1, 1.5, 2])
+        self.assertArray("(/ 12 a)", [12, 6, 4, 3])
+        self.assertArray("(mod a 2)", [1, 0, 1, 0])
+
+    def test_math_functions(self):
+        self.assertArray("(sqrt a)", [math.sqrt(x) for x in (1, 2, 3, 4)])
+        self.assertArray("(sin a)", [math.sin(x) for x in (1, 2, 3, 4)])
+        self.assertArray("(cos a)", [math.cos(x) for x in (1, 2, 3, 4)])
+        self.assertArray("(log a)", [math.log(x) for x in (1, 2, 3, 4)])
+        self.assertArray("(log (array 100 1000) 10)", [2, 3])
+        self.assertArray("(pow a 2)", [1, 4, 9, 16])
+        self.assertArray("(pow 2 a)", [2, 4, 8, 16])
+        self.assertArray("(abs (- a 3))", [2, 1, 0, 1])
+        self.assertArray("(floor (/ a 3))", [0, 0, 1, 1])
+        self.assertArray("(ceil (/ a 3))", [1, 1, 1, 2])
+
+    def test_comparisons(self):
+        self.assertArray("(< a 3)", [1, 1, 0, 0])
+        self.assertArray("(> a 3)", [0, 0, 0, 1])
+        self.assertArray("(= a (array 1 0 3 0))", [1, 0, 1, 0])
+        with self.assertRaises(TypeError):
+            self.sy.run("(if (> a 2) 1 0)")
+
+    def test_reductions(self):
+        self.assertEqual(self.sy.run("(sum a)"), 10)
+        self.assertEqual(self.sy.run("(min a)"), 1)
+        self.assertEqual(self.sy.run("(max a)"), 4)
+        self.assertEqual(self.sy.run("(mean a)"), 2.5)
+        self.assertEqual(self.sy.run("(sum '(1 2 3))"), 6)
+        self.assertEqual(self.sy.run("(max (list 1 5 2))"), 5)
+        with self.assertRaises(ValueError):
+            self.sy.run("(mean (array))")
+
+    def test_conversions(self):
+        self.assertArray("(list->array '(1 2.5))", [1, 2.5])
+        self.assertEqual(self.sy.run("(array->list a)"), [1.0, 2.0, 3.0, 4.0])
+        self.assertArray("(array-range 3)", [0, 1, 2])
+        self.assertArray("(array-range 1 2 0.25)", [1, 1.25, 1.5, 1.75])
+        self.assertEqual(self.sy.run("(array-ref a 2)"), 3)
+        self.assertEqual(self.sy.run("(length a)"), 4)
+        self.assertEqual(self.sy.run("(map (lambda (x) (* x 10)) a)"), [10, 20, 30, 40])
+        self.assertEqual(str(self.sy.run("(array 1 2)")), "#f64(1.0 2.0)")
+
+    def test_errors(self):
+        with self.assertRaisesRegex(ZeroDivisionError, "Division by zero is undefined"):
+            self.sy.run("(/ 1 (array 1 0))")
+        with self.assertRaisesRegex(TypeError, "requires all arguments to be numbers"):
+            self.sy.run('(+ a "x")')
+        with self.assertRaises(ValueError):
+            self.sy.run("(+ a (array 1 2))")
+
+    def test_arrays_through_jitted_functions(self):
+        sy = SythonExtended(jit_threshold=2)
+        sy.run("(define (scale x k) (* x k))")
+        for _ in range(3):
+            sy.run("(scale 2 3)")
+        result = sy.run("(scale (array 1 2) 3)")
+        self.assertEqual(result.tolist(), [3.0, 6.0])
+
+
+class TestSythonArrayEvalEngine(TestSythonArray):
+    def setUp(self):
+        self.sy = SythonExtended(engine='eval')
+        self.sy.run("(define a (array 1 2 3 4))")
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
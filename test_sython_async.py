@@ -0,0 +1,107 @@
+import asyncio
+import io
+import unittest
+from unittest.mock import patch
+from sython_async import YIELD_INTERVAL, AsyncPrimitive
+from sython_interpreter import SythonInterpreter
+
+
+class TestSythonAsync(unittest.TestCase):
+    engine = 'compile'
+
+    def setUp(self):
+        self.sy = SythonInterpreter(engine=self.engine)
+
+    def run_async(self, code, sy=None):
+        with patch('sys.stdout', new=io.StringIO()):
+            return asyncio.run((sy or self.sy).run_async(code))
+
+    def test_same_results_as_run(self):
+        programs = [
+            "(+ 1 2 3)",
+            "(define (fact n) (if (= n 0) 1 (* n (fact (- n 1))))) (fact 10)",
+            "(define (loop n acc) (if (= n 0) acc (loop (- n 1) (+ acc 1)))) (loop 100000 0)",
+            "(define k 2) (set! k (* k 21)) k",
+            "(map (lambda (x) (* x x)) '(1 2 3))",
+            "(reduce + (filter (lambda (x) (> x 1)) (range 5)))",
+            "(force (delay (car '(a b))))",
+            '(define s "text") s',
+        ]
+        for code in programs:
+            expected = SythonInterpreter().run(code)
+            self.assertEqual(self.run_async(code), expected, code)
+
+    def test_async_builtins_are_awaited(self):
+        async def fetch(key):
+            await asyncio.sleep(0)
+            return key * 2
+        self.assertIsInstance(self.sy.register_async_builtin('fetch', fetch), AsyncPrimitive)
+        self.sy.run("(define (twice-fetched x) (+ (fetch x) (fetch x)))")
+        self.assertEqual(self.run_async("(twice-fetched (fetch 5))"), 40)
+        with self.assertRaisesRegex(TypeError, "can only be called from code run by run_async"):
+            self.sy.run("(fetch 1)")
+
+    def test_scripts_share_the_event_loop(self):
+        order = []
+
+        async def record(name):
+            order.append(name)
+            await asyncio.sleep(0.01)
+            order.append(name)
+
+        async def main():
+            scripts = []
+            for name in ('a', 'b', 'c'):
+                sy = SythonInterpreter(engine=self.engine)
+                sy.register_async_builtin('record', record)
+                scripts.append(sy.run_async(f"(record '{name})"))
+            await asyncio.gather(*scripts)
+        asyncio.run(main())
+        self.assertEqual(order, ['a', 'b', 'c', 'a', 'b', 'c'])
+
+    def test_long_computations_yield(self):
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(1)
+                await asyncio.sleep(0)
+
+        async def main():
+            task = asyncio.create_task(ticker())
+            result = await self.sy.run_async(
+                f"(define (loop n) (if (= n 0) 'done (loop (- n 1)))) (loop {YIELD_INTERVAL * 5})")
+            task.cancel()
+            return result
+        with patch('sys.stdout', new=io.StringIO()):
+            self.assertEqual(asyncio.run(main()), 'done')
+        self.assertGreaterEqual(len(ticks), 5)
+
+    def test_sleep_works_in_both_modes(self):
+        self.assertIsNone(self.sy.run("(sleep 0)"))
+        self.assertIsNone(self.run_async("(sleep 0)"))
+
+    def test_jitted_functions_can_await(self):
+        sy = SythonInterpreter(jit_threshold=3)
+
+        async def double(x):
+            return x * 2
+        sy.run("(define (square x) (* x x))")
+        for _ in range(5):
+            sy.run("(square 2)")
+        sy.register_async_builtin('double', double)
+        self.assertEqual(self.run_async("(square (double 3))", sy), 36)
+
+    def test_errors_propagate(self):
+        with self.assertRaises(ZeroDivisionError):
+            self.run_async("(/ 1 0)")
+        with self.assertRaises(NameError):
+            self.run_async("(undefined-function 1)")
+
+
+class TestSythonAsyncEvalEngine(TestSythonAsync):
+    engine = 'eval'
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import sython
+import sython_batch
+from sython_parallel import ProcessPool
+
+
+class TestSythonBatch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.write_script('a.sy', '(define x 1) (display "hi") (+ x 2)')
+        self.write_script('b.sy', '(+ x 1)')  # x was defined by a.sy, in another fork
+        self.write_script('nested/c.sy', '(/ 1 0)')
+        self.write_script('notes.txt', 'not a script')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_script(self, name, text):
+        path = os.path.join(self.tmp.name, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(text)
+
+    def run_batch(self, jobs):
+        report = io.StringIO()
+        scripts = sython_batch.find_scripts(self.tmp.name)
+        summary = sython_batch.run_batch(scripts, jobs, report, use_cache=False)
+        return summary, [json.loads(line) for line in report.getvalue().splitlines()]
+
+    def check_records(self, summary, records):
+        self.assertEqual(summary['scripts'], 3)
+        self.assertEqual(summary['failed'], 2)
+        self.assertGreater(summary['scripts_per_second'], 0)
+        self.assertEqual([os.path.relpath(r['script'], self.tmp.name) for r in records],
+                         ['a.sy', 'b.sy', os.path.join('nested', 'c.sy')])
+        a, b, c = records
+        self.assertTrue(a['ok'])
+        self.assertEqual(a['result'], "3")
+        self.assertEqual(a['stdout'], "hi3\n")
+        self.assertFalse(b['ok'])
+        self.assertEqual(b['error'], "NameError: Unbound symbol: x")
+        self.assertTrue(c['error'].startswith("ZeroDivisionError"))
+
+    def test_in_process(self):
+        self.check_records(*self.run_batch(1))
+
+    def test_worker_processes(self):
+        self.check_records(*self.run_batch(2))
+
+    def test_script_pools_are_closed(self):
+        self.write_script('d.sy', "(pmap (lambda (x) (* x x)) '(1 2 3))")
+        snapshot = sython_batch.SythonExtended(workers=1).snapshot()
+        with patch.object(ProcessPool, 'close', autospec=True, side_effect=ProcessPool.close) as close:
+            record = sython_batch.run_one(snapshot, os.path.join(self.tmp.name, 'd.sy'), use_cache=False)
+        self.assertEqual(record['result'], "(1 4 9)")
+        close.assert_called_once()
+
+    def test_libraries_are_installed_before_forking(self):
+        self.write_script('e.sy', "(sqrt 16)")
+        with patch.object(sython_batch.SythonExtended, 'load_library', autospec=True,
+                          side_effect=sython_batch.SythonExtended.load_library) as load_library:
+            summary, records = self.run_batch(1)
+        self.assertEqual(records[2]['script'], os.path.join(self.tmp.name, 'e.sy'))
+        self.assertEqual(records[2]['result'], "4.0")
+        self.assertEqual(load_library.call_count, len(sython_batch.SythonExtended.libraries))
+
+    def test_main_writes_report(self):
+        report = os.path.join(self.tmp.name, 'report.jsonl')
+        with patch('sys.stdout', new=io.StringIO()) as fake_out:
+            sython.main(['--batch', self.tmp.name, '-j', '2', '--no-cache', '--report', report])
+        self.assertIn("Ran 3 script(s), 2 failed", fake_out.getvalue())
+        with open(report) as f:
+            self.assertEqual(len(f.readlines()), 3)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
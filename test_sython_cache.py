@@ -0,0 +1,75 @@
+import io
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import sython
+import sython_cache
+from sython_extended import SythonExtended
+from sython_pair import NIL
+
+
+class TestSythonCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.script = os.path.join(self.tmp.name, 'script.sy')
+        self.write("(define (square x) (* x x))\n(display (square 7))\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, source):
+        with open(self.script, 'w') as f:
+            f.write(source)
+
+    def run_script(self, **kwargs):
+        with patch('sys.stdout', new=io.StringIO()) as fake_out:
+            sython.run_script(self.script, **kwargs)
+        return fake_out.getvalue()
+
+    def test_round_trip(self):
+        forms = [['define', 'x', ['quote', NIL]], ['display', '"hi there"']]
+        digest = sython_cache.script_digest(self.script)
+        sython_cache.store(self.script, digest, forms)
+        loaded = sython_cache.load(self.script, digest)
+        self.assertEqual(loaded, forms)
+        self.assertIs(loaded[0][2][1], NIL)
+        self.assertEqual([type(x) for x in loaded[1]], [type(x) for x in forms[1]])
+
+    def test_changed_script_misses(self):
+        sython_cache.store(self.script, sython_cache.script_digest(self.script), [['+', 1, 2]])
+        self.write("(+ 3 4)\n")
+        self.assertIsNone(sython_cache.load(self.script, sython_cache.script_digest(self.script)))
+
+    def test_warm_run_skips_parsing(self):
+        with patch.object(SythonExtended, 'read_forms', autospec=True,
+                          side_effect=SythonExtended.read_forms) as read_forms:
+            self.run_script()
+        self.assertTrue(read_forms.called)
+        self.assertTrue(os.path.exists(sython_cache.cache_path(self.script)))
+        with patch.object(SythonExtended, 'read_forms', side_effect=AssertionError("parsed")):
+            warm = self.run_script()
+        self.assertIn("49", warm)
+
+    def test_warm_run_matches_cold_run(self):
+        self.write("(define v #(0 0 0))\n(display v)\n(vector-set! v 0 99)\n")
+        cold = self.run_script()
+        self.assertEqual(cold, "#(0 0 0)")
+        self.assertEqual(self.run_script(), cold)
+        self.assertEqual(self.run_script(use_cache=False), cold)
+
+    def test_no_cache(self):
+        self.run_script(use_cache=False)
+        self.assertFalse(os.path.exists(sython_cache.cache_path(self.script)))
+
+    def test_cache_dir_override_and_clear(self):
+        cache_dir = os.path.join(self.tmp.name, 'cache')
+        with patch.dict(os.environ, {'SYTHON_CACHE_DIR': cache_dir}):
+            self.run_script()
+            self.assertEqual(os.listdir(cache_dir), ['script.syc'])
+            with patch('sys.stdout', new=io.StringIO()):
+                sython.main(['--clear-cache'])
+            self.assertEqual(os.listdir(cache_dir), [])
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
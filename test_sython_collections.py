@@ -0,0 +1,135 @@
+import io
+import pickle
+import unittest
+from unittest.mock import patch
+from sython_interpreter import SythonInterpreter
+from sython_collections import HashTable, Vector
+
+
+class TestSythonVector(unittest.TestCase):
+    def setUp(self):
+        self.sy = SythonInterpreter()
+
+    def test_literals_are_constants(self):
+        self.assertIsInstance(self.sy.run("#(1 2 3)"), Vector)
+        self.assertEqual(self.sy.run("#(1 (+ 1 2) x)"), [1, ['+', 1, 2], 'x'])
+        self.assertEqual(self.sy.run("'#(1 2)"), [1, 2])
+        self.assertEqual(self.sy.run("(vector 1 (+ 1 2))"), [1, 3])
+
+    def test_indexed_access(self):
+        self.sy.run("(define v (make-vector 3 0))")
+        self.sy.run("(vector-set! v 1 'b)")
+        self.assertEqual(self.sy.run("v"), [0, 'b', 0])
+        self.assertEqual(self.sy.run("(vector-ref v 1)"), 'b')
+        self.assertEqual(self.sy.run("(vector-length v)"), 3)
+        self.assertEqual(self.sy.run("(length v)"), 3)
+        self.assertIs(self.sy.run("(vector? v)"), True)
+        self.assertIs(self.sy.run("(vector? '(1))"), False)
+
+    def test_literals_are_fresh(self):
+        self.sy.run("(define (make) #(0 #(0)))")
+        self.sy.run("(vector-set! (make) 0 1)")
+        self.sy.run("(vector-set! (vector-ref (make) 1) 0 1)")
+        self.assertEqual(self.sy.run("(make)"), [0, Vector([0])])
+        self.sy.run("(define (quoted) '#(0))")
+        self.sy.run("(vector-set! (quoted) 0 1)")
+        self.assertEqual(self.sy.run("(quoted)"), [0])
+
+    def test_index_errors(self):
+        with self.assertRaisesRegex(IndexError, "vector-ref: index 3 out of range for a vector of length 3"):
+            self.sy.run("(vector-ref #(1 2 3) 3)")
+        with self.assertRaisesRegex(IndexError, "index -1"):
+            self.sy.run("(vector-set! #(1 2 3) -1 0)")
+        with self.assertRaisesRegex(TypeError, "vector-ref expects a vector"):
+            self.sy.run("(vector-ref '(1 2) 0)")
+
+    def test_lists_and_higher_order_functions(self):
+        self.assertEqual(self.sy.run("(vector->list #(1 2))"), [1, 2])
+        self.assertIsInstance(self.sy.run("(list->vector '(1 2))"), Vector)
+        self.assertEqual(self.sy.run("(map (lambda (x) (* x x)) #(1 2 3))"), Vector([1, 4, 9]))
+        self.assertIsInstance(self.sy.run("(map (lambda (x) x) #(1))"), Vector)
+        self.assertEqual(self.sy.run("(filter (lambda (x) (> x 1)) #(1 2 3))"), Vector([2, 3]))
+        self.assertEqual(self.sy.run("(reduce + #(1 2 3))"), 6)
+
+    def test_display(self):
+        with patch('sys.stdout', new=io.StringIO()) as fake_out:
+            self.sy.run('(display #(1 "a" (2 3) #(b)))')
+        self.assertEqual(fake_out.getvalue(), "#(1 a (2 3) #(b))")
+
+
+class TestSythonHashTable(unittest.TestCase):
+    def setUp(self):
+        self.sy = SythonInterpreter()
+        self.sy.run("(define h (make-hash-table))")
+
+    def test_set_and_ref(self):
+        self.sy.run("(hash-set! h 'a 1) (hash-set! h \"b\" 2) (hash-set! h '(1 2) 3)")
+        self.assertEqual(self.sy.run("(hash-ref h 'a)"), 1)
+        self.assertEqual(self.sy.run("(hash-ref h \"b\")"), 2)
+        self.assertEqual(self.sy.run("(hash-ref h (list 1 2))"), 3)
+        self.assertEqual(self.sy.run("(hash-ref h 'missing 0)"), 0)
+        with self.assertRaisesRegex(KeyError, "hash-ref: no value for key missing"):
+            self.sy.run("(hash-ref h 'missing)")
+        self.assertIs(self.sy.run("(hash-has-key? h 'a)"), True)
+        self.sy.run("(hash-remove! h 'a)")
+        self.assertIs(self.sy.run("(hash-has-key? h 'a)"), False)
+        self.assertEqual(self.sy.run("(hash-count h)"), 2)
+        self.assertEqual(self.sy.run("(length h)"), 2)
+
+    def test_update(self):
+        self.sy.run("(hash-update! h 'n (lambda (x) (+ x 1)) 0)")
+        self.sy.run("(hash-update! h 'n (lambda (x) (+ x 1)))")
+        self.assertEqual(self.sy.run("(hash-ref h 'n)"), 2)
+        with self.assertRaises(KeyError):
+            self.sy.run("(hash-update! h 'other (lambda (x) x))")
+
+    def test_iteration(self):
+        self.sy.run("(hash-set! h 'a 1) (hash-set! h 'b 2)")
+        self.assertEqual(self.sy.run("(hash-keys h)"), ['a', 'b'])
+        self.assertEqual(self.sy.run("(hash-values h)"), [1, 2])
+        self.assertEqual(self.sy.run("(hash->list h)"), [['a', 1], ['b', 2]])
+        self.assertEqual(self.sy.run("(map (lambda (k v) (* v 10)) h)"), [10, 20])
+        self.sy.run("(define total 0)")
+        self.sy.run("(hash-for-each h (lambda (k v) (set! total (+ total v))))")
+        self.assertEqual(self.sy.env['total'], 3)
+
+    def test_display(self):
+        self.sy.run("(hash-set! h 'a 1) (hash-set! h 'b '(2 3))")
+        self.assertIsInstance(self.sy.env['h'], HashTable)
+        with patch('sys.stdout', new=io.StringIO()) as fake_out:
+            self.sy.run("(display h)")
+        self.assertEqual(fake_out.getvalue(), "#hash((a . 1) (b 2 3))")
+
+    def test_keys_of_different_types(self):
+        self.sy.run('(hash-set! h "a" 1) (hash-set! h 1 \'int) (hash-set! h 1.0 \'float) (hash-set! h #t \'bool)')
+        self.assertEqual(self.sy.run("(hash-ref h 'a 'none)"), 'none')
+        self.assertEqual(self.sy.run('(hash-ref h "a")'), 1)
+        self.assertEqual(self.sy.run("(list (hash-ref h 1) (hash-ref h 1.0) (hash-ref h #t))"), ['int', 'float', 'bool'])
+        self.assertEqual(self.sy.run("(hash-count h)"), 4)
+        self.assertEqual(self.sy.run("(hash-keys h)"), ["a", 1, 1.0, True])
+        copy = pickle.loads(pickle.dumps(self.sy.env['h']))
+        self.assertEqual(copy.items(), self.sy.env['h'].items())
+        self.assertEqual(copy[1.0], 'float')
+
+    def test_errors(self):
+        with self.assertRaisesRegex(TypeError, "hash-ref expects a hash table"):
+            self.sy.run("(hash-ref '(1) 1)")
+
+    def test_dedupe(self):
+        self.sy.run("(define (dedupe-into seen lst)"
+                    "  (if (null? lst) (hash-keys seen)"
+                    "      (dedupe-into (or (hash-set! seen (car lst) #t) seen) (cdr lst))))")
+        self.assertEqual(self.sy.run("(dedupe-into (make-hash-table) '(3 1 3 2 1))"), [3, 1, 2])
+
+class TestSythonVectorEvalEngine(TestSythonVector):
+    def setUp(self):
+        self.sy = SythonInterpreter(engine='eval')
+
+
+class TestSythonHashTableEvalEngine(TestSythonHashTable):
+    def setUp(self):
+        self.sy = SythonInterpreter(engine='eval')
+        self.sy.run("(define h (make-hash-table))")
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -1,5 +1,8 @@
+import pickle
 import unittest
+from Symbol import String, Symbol
 from sython_interpreter import SythonInterpreter
+from sython_pair import NIL
 from io import StringIO
 from unittest.mock import patch
 
@@ -146,5 +149,166 @@ class TestSythonInterpreter(unittest.TestCase):
         self.sy.run("(define multiply (lambda (a b) (* a b)))")
         self.assertEqual(self.sy.run("(reduce multiply '(1 2 3 4))"), 24)
 
+    def test_closures_capture_defining_frame(self):
+        self.sy.run("(define (make-adder n) (lambda (x) (+ x n)))")
+        self.sy.run("(define add5 (make-adder 5))")
+        self.assertEqual(self.sy.run("(add5 10)"), 15)
+        self.assertNotIn('n', self.sy.env)
+
+    def test_set(self):
+        self.sy.run("(define counter 0)")
+        self.sy.run("(define (bump) (set! counter (+ counter 1)))")
+        self.sy.run("(bump)")
+        self.sy.run("(bump)")
+        self.assertEqual(self.sy.run("counter"), 2)
+        with self.assertRaises(NameError):
+            self.sy.run("(set! undefined-var 1)")
+
+    def test_tail_recursion_constant_stack(self):
+        self.sy.run("(define (loop n acc) (if (= n 0) acc (loop (- n 1) (+ acc 1))))")
+        self.assertEqual(self.sy.run("(loop 20000 0)"), 20000)
+
+    def test_mutual_tail_recursion(self):
+        self.sy.run("(define (my-even? n) (if (= n 0) #t (my-odd? (- n 1))))")
+        self.sy.run("(define (my-odd? n) (if (= n 0) #f (my-even? (- n 1))))")
+        self.assertEqual(self.sy.run("(my-even? 10001)"), False)
+
+    def test_tail_call_through_lambda(self):
+        self.sy.run("(define count-down (lambda (n) (if (> n 0) (count-down (- n 1)) 'done)))")
+        self.assertEqual(self.sy.run("(count-down 20000)"), 'done')
+
+    def test_deep_non_tail_recursion(self):
+        self.sy.run("(define (g x) x) (define (f n) (if (= n 0) 0 (g (f (- n 1)))))")
+        self.assertEqual(self.sy.run("(f 200)"), 0)
+
+    def test_procedures_callable_from_python(self):
+        self.sy.run("(define (loop n) (if (= n 0) 'done (loop (- n 1))))")
+        self.assertEqual(self.sy.env['loop'](20000), 'done')
+
+    def test_cons_cells(self):
+        self.sy.run("(define lst (list 1 2 3))")
+        self.sy.run("(define longer (cons 0 lst))")
+        self.assertIs(self.sy.run("(cdr longer)"), self.sy.env['lst'])
+        self.assertEqual(self.sy.run("(cdr (cdr (cdr lst)))"), [])
+        self.assertEqual(self.sy.run("(null? (cdr (cdr (cdr lst))))"), True)
+        self.assertEqual(self.sy.run("(pair? lst)"), True)
+        self.assertEqual(self.sy.run("(length longer)"), 4)
+        with self.assertRaises(TypeError):
+            self.sy.run("(car '())")
+
+    def test_quoted_lists_are_pairs(self):
+        self.assertEqual(self.sy.run("(car (cdr '(1 (2 3))))"), [2, 3])
+        self.assertEqual(self.sy.run("(cdr (quote (1 2)))"), [2])
+        self.assertIs(self.sy.run("'()"), NIL)
+        self.assertEqual(str(self.sy.run("(map (lambda (x) (* x x)) '(1 2 3))")), "(1 4 9)")
+
+    def test_long_list_recursion(self):
+        self.sy.run("(define (build n acc) (if (= n 0) acc (build (- n 1) (cons n acc))))")
+        self.sy.run("(define (sum-list lst acc) (if (null? lst) acc (sum-list (cdr lst) (+ acc (car lst)))))")
+        self.assertEqual(self.sy.run("(sum-list (build 20000 '()) 0)"), 20000 * 20001 // 2)
+
+    def test_compile_once_run_many(self):
+        code = self.sy.compile(self.sy.parse(self.sy.tokenize("(if (> x 2) 'big 'small)")))
+        self.assertEqual(code(self.sy.extend_env(['x'], [3])), 'big')
+        self.assertEqual(code(self.sy.extend_env(['x'], [1])), 'small')
+
+    def test_immediate_lambda_call(self):
+        self.assertEqual(self.sy.run("((lambda (x) (* x 2)) 21)"), 42)
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            SythonInterpreter(engine='jit')
+
+    def test_environment_chain(self):
+        outer = self.sy.extend_env(['a'], [1])
+        inner = self.sy.extend_env(['b'], [2], outer)
+        self.assertEqual(inner['a'], 1)
+        self.assertEqual(inner['+'], self.sy.env['+'])
+        inner.set('a', 3)
+        self.assertEqual(outer['a'], 3)
+        self.assertNotIn('a', inner)
+        with self.assertRaises(NameError):
+            inner['missing']
+
+    def test_symbols_are_interned(self):
+        self.assertIs(Symbol('x'), Symbol('x'))
+        expr = self.sy.parse(self.sy.tokenize("(define (f x) (* x x))"))
+        self.assertIs(expr[1][1], Symbol('x'))
+        self.assertIs(expr[2][1], expr[2][2])
+        self.assertIs(pickle.loads(pickle.dumps(expr))[2][1], Symbol('x'))
+
+    def test_string_literals_are_strings(self):
+        literal = self.sy.atom('"hi there"')
+        self.assertIs(type(literal), String)
+        self.assertEqual(literal, "hi there")
+        self.assertEqual(self.sy.run('(define s "car") s'), "car")
+        self.assertEqual(self.sy.run("'(\"a\" b)"), ["a", "b"])
+
+    def test_register_special_form(self):
+        # (unless test body): body only runs when test is false
+        self.sy.register_special_form(
+            'unless', lambda expr, env: None if self.sy.evaluate(expr[1], env) else self.sy.evaluate(expr[2], env))
+        self.assertEqual(self.sy.run("(unless (< 2 1) (+ 1 2))"), 3)
+        self.assertIsNone(self.sy.run("(unless (< 1 2) (car '()))"))
+
+    def test_register_tail_special_form(self):
+        # (when test body) in tail position keeps loops in constant stack
+        self.sy.register_special_form('when', lambda expr, env: expr[2] if self.sy.evaluate(expr[1], env) else 0,
+                                      tail=True)
+        self.sy.run("(define (count n) (when (> n 0) (count (- n 1))))")
+        self.assertEqual(self.sy.run("(count 3)"), 0)
+
+    def test_register_compiled_special_form(self):
+        def compile_twice(expr, tail):
+            body = self.sy.compile(expr[1])
+            return lambda env: [body(env), body(env)]
+        self.sy.register_special_form('twice', compile=compile_twice)
+        self.sy.run("(define n 0)")
+        self.assertEqual(self.sy.run("(twice (+ n 1))"), [1, 1])
+        with self.assertRaises(ValueError):
+            self.sy.register_special_form('nothing')
+
+    def test_variadic_arithmetic(self):
+        self.assertEqual(self.sy.run("(+ 1 2 3 4)"), 10)
+        self.assertEqual(self.sy.run("(* 2 3 4)"), 24)
+        self.assertEqual(self.sy.run("(- 10 1 2)"), 7)
+        self.assertEqual(self.sy.run("(/ 24 2 3)"), 4.0)
+        self.assertEqual(self.sy.run("(- 5)"), -5)
+        self.assertEqual(self.sy.run("(/ 4)"), 0.25)
+        self.assertEqual(self.sy.run("(+)"), 0)
+        self.assertEqual(self.sy.run("(*)"), 1)
+        with self.assertRaisesRegex(TypeError, r"Operator '\*' requires all arguments to be numbers, got: \[2, 3, 'x'\]"):
+            self.sy.run("(* 2 3 'x)")
+        with self.assertRaisesRegex(ZeroDivisionError, "Division by zero is undefined"):
+            self.sy.run("(/ 1 2 0)")
+        with self.assertRaisesRegex(TypeError, "expects at least one argument"):
+            self.sy.run("(-)")
+
+    def test_comparisons(self):
+        self.assertIs(self.sy.run("(<= 1 1 2)"), True)
+        self.assertIs(self.sy.run("(>= 3 2 2)"), True)
+        self.assertIs(self.sy.run("(< 1 2 2)"), False)
+        self.assertIs(self.sy.run("(> 3 2 1)"), True)
+        self.assertIs(self.sy.run("(= 2 2 2.0)"), True)
+        self.assertIs(self.sy.run("(< 1)"), True)
+
+    def test_operands_are_evaluated_once(self):
+        calls = []
+        self.sy.env['tick'] = lambda x: calls.append(x) or x
+        self.assertEqual(self.sy.run("(+ (tick 1) (tick 2) (tick 3))"), 6)
+        self.assertEqual(self.sy.run("(- (tick 4) (tick 5))"), -1)
+        self.assertIs(self.sy.run("(< (tick 6) (tick 7))"), True)
+        self.assertEqual(calls, [1, 2, 3, 4, 5, 6, 7])
+
+    def test_rebound_operators_are_called(self):
+        self.sy.run("(define (+ a b) (* a b))")
+        self.assertEqual(self.sy.run("(+ 3 4)"), 12)
+        self.assertEqual(self.sy.run("((lambda (<) (< 1 2)) (lambda (a b) 'called))"), 'called')
+
+class TestSythonInterpreterEvalEngine(TestSythonInterpreter):
+    """Run the same suite against the reference tree-walking evaluator."""
+    def setUp(self):
+        self.sy = SythonInterpreter(engine='eval')
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file
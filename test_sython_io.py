@@ -0,0 +1,117 @@
+import io
+import os
+import tempfile
+import tracemalloc
+import unittest
+from unittest.mock import patch
+from sython_interpreter import SythonInterpreter
+from sython_io import EOF, InputPort
+from sython_stream import Stream
+
+
+class TestSythonIO(unittest.TestCase):
+    def setUp(self):
+        self.sy = SythonInterpreter()
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_file(self, name, text):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'w') as f:
+            f.write(text)
+        return path
+
+    def test_display_is_buffered_until_flush(self):
+        with patch('sys.stdout', new=io.StringIO()) as fake_out:
+            self.sy.env['display']("a")
+            self.sy.env['newline']()
+            self.assertEqual(fake_out.getvalue(), "")
+            self.sy.env['flush']()
+            self.assertEqual(fake_out.getvalue(), "a\n")
+
+    def test_full_buffer_is_written(self):
+        sy = SythonInterpreter(output_buffer_size=4)
+        with patch('sys.stdout', new=io.StringIO()) as fake_out:
+            sy.env['display']("ab")
+            self.assertEqual(fake_out.getvalue(), "")
+            sy.env['display']("cd")
+            self.assertEqual(fake_out.getvalue(), "abcd")
+
+    def test_run_keeps_output_in_order(self):
+        with patch('sys.stdout', new=io.StringIO()) as fake_out:
+            self.sy.run('(display "x" 1) (newline) (+ 1 2) (display "y")')
+        self.assertEqual(fake_out.getvalue(), "x 1\n3\ny")
+
+    def test_output_is_written_when_run_fails(self):
+        with patch('sys.stdout', new=io.StringIO()) as fake_out:
+            with self.assertRaises(ZeroDivisionError):
+                self.sy.run('(display "before") (/ 1 0)')
+        self.assertEqual(fake_out.getvalue(), "before")
+
+    def test_with_output_to_file(self):
+        path = os.path.join(self.tmp.name, 'out.txt')
+        self.sy.env['path'] = path
+        with patch('sys.stdout', new=io.StringIO()) as fake_out:
+            result = self.sy.run('(with-output-to-file path (lambda () (display "in file" 7)))'
+                                 '(display "after")')
+        self.assertIsNone(result)
+        self.assertEqual(fake_out.getvalue(), "after")
+        with open(path) as f:
+            self.assertEqual(f.read(), "in file 7")
+        self.assertEqual(self.sy.run('(with-output-to-file path (lambda () 42))'), 42)
+
+    def test_with_output_to_file_restores_port_on_error(self):
+        self.sy.env['path'] = os.path.join(self.tmp.name, 'out.txt')
+        stdout_port = self.sy.output
+        with self.assertRaises(TypeError):
+            self.sy.run("(with-output-to-file path (lambda () (car '())))")
+        self.assertIs(self.sy.output, stdout_port)
+
+    def test_read_line(self):
+        self.sy.env['path'] = self.write_file('in.txt', "first\nsecond\nlast")
+        self.sy.run("(define port (open-input-file path))")
+        self.assertIsInstance(self.sy.env['port'], InputPort)
+        self.assertEqual(self.sy.run("(read-line port)"), "first")
+        self.assertEqual(self.sy.run("(read-line port)"), "second")
+        self.assertEqual(self.sy.run("(read-line port)"), "last")
+        self.assertIs(self.sy.run("(read-line port)"), EOF)
+        self.assertIs(self.sy.run("(eof-object? (read-line port))"), True)
+        self.sy.run("(close-port port)")
+        with self.assertRaisesRegex(TypeError, "read-line expects an input port"):
+            self.sy.run("(read-line 5)")
+
+    def test_read_line_from_stdin(self):
+        with patch('sys.stdin', new=io.StringIO("typed\n")):
+            self.assertEqual(self.sy.run("(read-line)"), "typed")
+
+    def test_file_lines(self):
+        self.sy.env['path'] = self.write_file('log.txt', "".join(f"{i}\n" for i in range(100)))
+        self.assertIsInstance(self.sy.run("(file-lines path)"), Stream)
+        self.assertEqual(self.sy.run("(stream->list (stream-take 3 (file-lines path)))"), ["0", "1", "2"])
+        self.assertEqual(self.sy.run("(reduce + (map (lambda (line) 1) (file-lines path)))"), 100)
+        # Each walk reads the file again
+        self.sy.run("(define lines (file-lines path))")
+        self.assertEqual(self.sy.run("(length (stream->list lines))"), 100)
+        self.assertEqual(self.sy.run("(length (stream->list lines))"), 100)
+
+    def test_file_lines_in_bounded_memory(self):
+        peaks = []
+        for count in (20000, 200000):
+            self.sy.env['path'] = self.write_file(f'{count}.txt', "".join(f"line {i}\n" for i in range(count)))
+            expr = self.sy.parse(self.sy.tokenize("(reduce + (map (lambda (line) 1) (file-lines path)))"))
+            tracemalloc.start()
+            self.assertEqual(self.sy.execute(expr), count)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        self.assertLess(peaks[1], peaks[0] * 2)
+
+
+class TestSythonIOEvalEngine(TestSythonIO):
+    def setUp(self):
+        super().setUp()
+        self.sy = SythonInterpreter(engine='eval')
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
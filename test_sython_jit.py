@@ -0,0 +1,118 @@
+import unittest
+from sython_interpreter import SythonInterpreter
+from sython_procedure import Procedure
+
+
+class TestSythonJit(unittest.TestCase):
+    def setUp(self):
+        self.sy = SythonInterpreter(jit_threshold=3)
+
+    def warm_up(self, call, times=5):
+        for _ in range(times):
+            self.sy.run(call)
+
+    def test_hot_function_is_translated(self):
+        self.sy.run("(define (square x) (* x x))")
+        self.assertIsInstance(self.sy.env['square'], Procedure)
+        self.warm_up("(square 3)")
+        self.assertNotIsInstance(self.sy.env['square'], Procedure)
+        self.assertEqual(self.sy.run("(square 12)"), 144)
+        self.assertEqual(self.sy.run("(square 1.5)"), 2.25)
+
+    def test_self_tail_call_becomes_loop(self):
+        self.sy.run("(define (loop n acc) (if (= n 0) acc (loop (- n 1) (+ acc 1))))")
+        self.warm_up("(loop 3 0)")
+        self.assertIn('while True', self.sy.env['loop'].source)
+        self.assertEqual(self.sy.run("(loop 1000000 0)"), 1000000)
+
+    def test_results_match_interpreter(self):
+        programs = [
+            ("(define (fib n) (if (< n 2) n (+ (fib (- n 1)) (fib (- n 2)))))", "(fib 15)"),
+            ("(define (f x) (if (> (mod x 3) 1) (/ x 2) (- x 0.5)))", "(f 7)"),
+            ("(define (sum-list lst acc) (if (null? lst) acc (sum-list (cdr lst) (+ acc (car lst)))))",
+             "(sum-list '(1 2 3 4) 0)"),
+            ("(define (g a b) (if (<= 0 a b 10) (+ a b (* a b 2)) (- a)))", "(g 2 3)"),
+            ("(define (h n acc) (if (>= n 1) (h (- n 1) (/ (+ acc n) 2 1)) acc))", "(h 20 0)"),
+        ]
+        for definition, call in programs:
+            plain = SythonInterpreter(jit=False)
+            plain.run(definition)
+            self.sy.run(definition)
+            self.warm_up(call)
+            self.assertEqual(self.sy.run(call), plain.run(call), call)
+
+    def test_type_errors_match_interpreter(self):
+        self.sy.run("(define (add a b) (+ a b))")
+        self.warm_up("(add 1 2)")
+        self.assertNotIsInstance(self.sy.env['add'], Procedure)
+        with self.assertRaisesRegex(TypeError, r"Operator '\+' requires all arguments to be numbers, got: \['a', 1\]"):
+            self.sy.run('(add "a" 1)')
+
+    def test_division_by_zero_matches_interpreter(self):
+        self.sy.run("(define (div a b) (/ a b))")
+        self.warm_up("(div 1 2)")
+        with self.assertRaisesRegex(ZeroDivisionError, "Division by zero is undefined"):
+            self.sy.run("(div 1 0)")
+
+    def test_untranslatable_forms_stay_interpreted(self):
+        self.sy.run("(define (adder n) (lambda (x) (+ x n)))")
+        self.warm_up("((adder 1) 2)")
+        self.assertIsInstance(self.sy.env['adder'], Procedure)
+        self.assertEqual(self.sy.run("((adder 1) 2)"), 3)
+
+    def test_mutual_tail_calls_stay_interpreted(self):
+        self.sy.run("(define (my-even? n) (if (= n 0) #t (my-odd? (- n 1))))")
+        self.sy.run("(define (my-odd? n) (if (= n 0) #f (my-even? (- n 1))))")
+        self.warm_up("(my-even? 10)")
+        self.assertIsInstance(self.sy.env['my-even?'], Procedure)
+        self.assertEqual(self.sy.run("(my-even? 100001)"), False)
+
+    def test_redefining_operator_deoptimizes(self):
+        self.sy.run("(define (square x) (* x x))")
+        self.warm_up("(square 3)")
+        self.sy.run("(define (* a b) (+ a b))")
+        self.assertIsInstance(self.sy.env['square'], Procedure)
+        self.assertEqual(self.sy.run("(square 3)"), 6)
+
+    def test_rebinding_the_name_matches_interpreter(self):
+        definition = "(define (f n) (if (= n 0) 'done (f (- n 1))))"
+        plain = SythonInterpreter(jit=False)
+        plain.run(definition)
+        self.sy.run(definition)
+        self.warm_up("(f 3)")
+        self.assertNotIsInstance(self.sy.env['f'], Procedure)
+        for sy in (self.sy, plain):
+            sy.run("(define g f)")
+            sy.run("(define (f n) 'redefined)")
+        self.assertEqual(self.sy.run("(g 5)"), plain.run("(g 5)"))
+        self.assertEqual(self.sy.run("(g 5)"), 'redefined')
+
+    def test_rebinding_during_the_loop_matches_interpreter(self):
+        definitions = ["(define (rebind) (set! f (lambda (n) 'changed)))",
+                       "(define (stop? n) (if (= n 3) (rebind) (= n 0)))",
+                       "(define (f n) (if (stop? n) 'done (f (- n 1))))"]
+        plain = SythonInterpreter(jit=False)
+        for sy in (self.sy, plain):
+            for definition in definitions:
+                sy.run(definition)
+        self.warm_up("(f 2)")
+        self.assertNotIsInstance(self.sy.env['f'], Procedure)
+        self.assertEqual(self.sy.run("(f 5)"), plain.run("(f 5)"))
+        self.assertEqual(self.sy.run("(f 5)"), 'changed')
+
+    def test_translated_function_prints_as_procedure(self):
+        self.sy.run("(define (sq x) (* x x))")
+        self.warm_up("(sq 3)")
+        self.assertNotIsInstance(self.sy.env['sq'], Procedure)
+        self.assertEqual(repr(self.sy.run("sq")), "<procedure sq>")
+
+    def test_disable_switch(self):
+        sy = SythonInterpreter(jit=False)
+        sy.run("(define (square x) (* x x))")
+        for _ in range(5000):
+            sy.env['square'](2)
+        self.assertIsInstance(sy.env['square'], Procedure)
+        self.assertIsNone(SythonInterpreter(engine='eval').jit)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,72 @@
+import unittest
+from Symbol import Symbol
+from sython_interpreter import SythonInterpreter
+from sython_memo import MemoizedProcedure
+
+
+class TestSythonMemo(unittest.TestCase):
+    def setUp(self):
+        self.sy = SythonInterpreter()
+
+    def test_define_memo_recursion(self):
+        self.sy.run("(define-memo (fib n) (if (< n 2) n (+ (fib (- n 1)) (fib (- n 2)))))")
+        self.assertEqual(self.sy.run("(fib 80)"), 23416728348467685)
+        info = self.sy.env['fib'].cache_info()
+        self.assertEqual(info.misses, 81)
+        self.assertGreaterEqual(info.hits, 78)
+
+    def test_memoize_lambda_and_stats(self):
+        self.sy.run("(define square (memoize (lambda (x) (* x x))))")
+        self.sy.run("(square 3)")
+        self.sy.run("(square 3)")
+        self.sy.run("(square 4)")
+        self.assertEqual(self.sy.run("(memo-stats square)"), [1, 2, 1024, 2])
+        self.sy.run("(memo-clear! square)")
+        self.assertEqual(self.sy.run("(memo-stats square)"), [0, 0, 1024, 0])
+
+    def test_lru_eviction(self):
+        calls = []
+        memo = MemoizedProcedure(lambda x: calls.append(x) or x, maxsize=2)
+        for x in (1, 2, 1, 3, 2, 1):
+            memo(x)
+        # 2 was evicted by 3 after 1 was refreshed; then 1 was evicted by 2
+        self.assertEqual(calls, [1, 2, 3, 2, 1])
+        self.assertEqual(memo.cache_info(), (1, 5, 2, 2))
+
+    def test_list_arguments(self):
+        self.sy.run("(define total (memoize (lambda (lst) (reduce + lst))))")
+        self.assertEqual(self.sy.run("(total '(1 2 3))"), 6)
+        self.assertEqual(self.sy.run("(total (list 1 2 3))"), 6)
+        self.assertEqual(self.sy.env['total'].cache_info().hits, 1)
+        self.assertEqual(self.sy.env['total']([1, 2, 3]), 6)
+        self.assertEqual(self.sy.env['total'].cache_info().hits, 2)
+
+    def test_arguments_of_different_types(self):
+        self.sy.run("(define-memo (f x) x)")
+        self.assertIs(type(self.sy.run("(f 1)")), int)
+        self.assertIs(type(self.sy.run("(f 1.0)")), float)
+        self.assertIs(self.sy.run("(f #t)"), True)
+        self.assertEqual(self.sy.run('(f "a")'), 'a')
+        self.assertIs(type(self.sy.run("(f 'a)")), Symbol)
+        self.assertEqual(self.sy.run("(memo-stats f)"), [0, 5, 1024, 5])
+        self.sy.run("(f '(1 2))")
+        self.assertIs(type(self.sy.run("(car (f (list 1.0 2)))")), float)
+
+    def test_unkeyable_arguments_bypass_cache(self):
+        memo = MemoizedProcedure(lambda x: 42)
+        self.assertEqual(memo(bytearray(b'x')), 42)
+        self.assertEqual(memo.cache_info().currsize, 0)
+
+    def test_errors(self):
+        with self.assertRaises(TypeError):
+            self.sy.run("(memo-stats car)")
+        with self.assertRaises(ValueError):
+            self.sy.run("(memoize car 0)")
+
+
+class TestSythonMemoEvalEngine(TestSythonMemo):
+    def setUp(self):
+        self.sy = SythonInterpreter(engine='eval')
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
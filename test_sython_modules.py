@@ -0,0 +1,189 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from Symbol import Symbol
+from sython_extended import SythonExtended
+from sython_interpreter import SythonInterpreter
+import sython_modules
+
+
+class TestSythonLibraries(unittest.TestCase):
+    engine = 'compile'
+
+    def setUp(self):
+        self.sy = SythonExtended(engine=self.engine)
+
+    def test_installed_on_first_use(self):
+        self.assertNotIn(Symbol('sqrt'), dict.keys(self.sy.env))
+        self.assertEqual(self.sy.loaded_libraries, frozenset())
+        self.assertEqual(self.sy.run("(sqrt 16)"), 4.0)
+        self.assertEqual(self.sy.loaded_libraries, {'math'})
+        self.assertIn(Symbol('floor'), dict.keys(self.sy.env))
+
+    def test_membership_installs_the_library(self):
+        self.assertIn('sqrt', self.sy.env)
+        self.assertEqual(self.sy.loaded_libraries, {'math'})
+        self.assertEqual(self.sy.env.get('floor')(2.5), 2)
+        self.assertNotIn('nope', self.sy.env)
+        self.assertIsNone(self.sy.env.get('nope'))
+
+    def test_import_by_name(self):
+        self.sy.run("(import math)")
+        self.assertEqual(self.sy.loaded_libraries, {'math'})
+        self.sy.run("(import math as m)")
+        self.assertEqual(self.sy.run("(m/sqrt 9)"), 3.0)
+
+    def test_definitions_are_not_replaced(self):
+        self.sy.run("(define (floor x) 'mine)")
+        self.assertEqual(self.sy.run("(sqrt 4)"), 2.0)
+        self.assertEqual(self.sy.run("(floor 2.5)"), 'mine')
+
+    def test_unknown_names(self):
+        with self.assertRaisesRegex(NameError, "Unbound symbol: nope"):
+            self.sy.run("(nope 1)")
+        self.assertEqual(self.sy.loaded_libraries, frozenset())
+        with self.assertRaises(ModuleNotFoundError):
+            self.sy.run("(import nope)")
+
+    def test_register_library(self):
+        def install(interpreter, bindings):
+            bindings['triple'] = lambda x: 3 * x
+        self.sy.register_library('triple', install)
+        self.assertEqual(self.sy.run("(triple 2)"), 6)
+        self.assertNotIn('triple', SythonExtended().libraries)
+
+    def test_optimizer_inlines_lazy_primitives(self):
+        sy = SythonExtended(engine=self.engine, optimize=2)
+        self.assertEqual(sy.run("(define (hyp a b) (sqrt (+ (* a a) (* b b)))) (hyp 3 4)"), 5.0)
+
+
+class TestSythonLibrariesEvalEngine(TestSythonLibraries):
+    engine = 'eval'
+
+
+class TestSythonModules(unittest.TestCase):
+    engine = 'compile'
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.write('lib/helpers.sy', "(define (twice x) (list x x))")
+        self.write('lib/strings.sy', '(import "helpers")\n'
+                                     '(define greeting "hi")\n'
+                                     '(define (shout s) (twice s))\n'
+                                     '(display "loading strings")')
+        self.sy = SythonInterpreter(engine=self.engine)
+        self.sy.module_path = (self.tmp.name,)
+        self.sy.cache_modules = False
+
+    def write(self, name, text):
+        path = os.path.join(self.tmp.name, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(text)
+        return path
+
+    def test_import(self):
+        self.sy.run('(import "lib/strings")')
+        self.assertEqual(self.sy.run("(shout greeting)"), ['hi', 'hi'])
+
+    def test_import_as_prefix(self):
+        self.sy.run('(import "lib/strings" as s)')
+        self.assertEqual(self.sy.run("(s/shout 1)"), [1, 1])
+        with self.assertRaises(NameError):
+            self.sy.run("greeting")
+
+    def test_own_namespace(self):
+        self.write('counter.sy', "(define count 0) (define (bump) (set! count (+ count 1))) (define (get) count)")
+        self.sy.run("(define count 100)")
+        self.sy.run('(import "counter" as c)')
+        self.sy.run("(c/bump)")
+        self.assertEqual(self.sy.run("(c/get)"), 1)
+        self.assertEqual(self.sy.run("count"), 100)
+
+    def test_imports_are_not_exported(self):
+        self.sy.run('(import "lib/strings")')
+        self.assertEqual(self.sy.run("(shout 1)"), [1, 1])
+        with self.assertRaises(NameError):
+            self.sy.run("twice")
+
+    def test_library_import_stays_in_the_module(self):
+        sy = SythonExtended(engine=self.engine)
+        sy.module_path = (self.tmp.name,)
+        sy.cache_modules = False
+        self.write('roots.sy', "(import math) (define (root x) (abs (sqrt x)))")
+        sy.run("(define (abs x) 'mine)")
+        sy.run('(import "roots")')
+        self.assertEqual(sy.run("(abs -1)"), 'mine')
+        self.assertEqual(sy.run("(root 4)"), 2.0)
+
+    def test_runs_once(self):
+        with patch('sys.stdout') as stdout:
+            self.sy.run('(import "lib/strings") (import "lib/strings.sy" as s)')
+        self.assertEqual(stdout.write.call_count, 1)
+        self.assertEqual(list(self.sy.modules), [os.path.join(self.tmp.name, 'lib', 'helpers.sy'),
+                                                 os.path.join(self.tmp.name, 'lib', 'strings.sy')])
+
+    def test_import_inside_function(self):
+        self.sy.run('(define (f) ((lambda (_) (h/twice 2)) (import "lib/helpers" as h)))')
+        self.assertEqual(self.sy.run("(f)"), [2, 2])
+        with self.assertRaises(NameError):
+            self.sy.run("h/twice")
+
+    def test_circular_import(self):
+        self.write('a.sy', '(import "b")')
+        self.write('b.sy', '(import "a")')
+        with self.assertRaisesRegex(ImportError, "Circular import of a"):
+            self.sy.run('(import "a")')
+        self.assertEqual(self.sy.modules, {})
+
+    def test_missing_module(self):
+        with self.assertRaisesRegex(ModuleNotFoundError, "No module missing"):
+            self.sy.run('(import "missing")')
+
+    def test_bad_import(self):
+        with self.assertRaises(SyntaxError):
+            self.sy.run('(import "lib/strings" s)')
+        with self.assertRaises(SyntaxError):
+            self.sy.run('(import 1)')
+
+    def test_parsed_once_per_process(self):
+        self.sy.run('(import "lib/helpers")')
+        other = SythonInterpreter(engine=self.engine)
+        other.module_path = (self.tmp.name,)
+        with patch('sython_modules.iter_tokens') as iter_tokens:
+            other.run('(import "lib/helpers")')
+        iter_tokens.assert_not_called()
+        self.assertEqual(other.run("(twice 3)"), [3, 3])
+
+    def test_changed_module_is_parsed_again(self):
+        path = self.write('changing.sy', "(define x 1)")
+        self.sy.run('(import "changing")')
+        self.write('changing.sy', "(define x 22)")
+        os.utime(path, ns=(0, 0))
+        other = SythonInterpreter(engine=self.engine)
+        other.module_path = (self.tmp.name,)
+        other.run('(import "changing")')
+        self.assertEqual(other.run("x"), 22)
+        self.assertIs(sython_modules._parsed[path][1], sython_modules.read_module(other, path, False))
+
+    def test_snapshot_forks_modules(self):
+        self.write('counter.sy', "(define count 0) (define (bump) (set! count (+ count 1))) (define (get) count)")
+        self.sy.run('(import "counter" as c)')
+        snapshot = self.sy.snapshot()
+        first, second = snapshot.fork(), snapshot.fork()
+        first.run("(c/bump) (c/bump)")
+        second.run("(c/bump)")
+        self.assertEqual(first.run("(c/get)"), 2)
+        self.assertEqual(second.run("(c/get)"), 1)
+        self.assertEqual(self.sy.run("(c/get)"), 0)
+        self.assertIsNot(first.modules, second.modules)
+
+
+class TestSythonModulesEvalEngine(TestSythonModules):
+    engine = 'eval'
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import glob
+import os
+import pickle
+import unittest
+from sython_extended import SythonExtended
+from sython_interpreter import SythonInterpreter
+from sython_optimizer import Builtin, Folded, LocalRef, Optimizer
+from sython_procedure import Procedure
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks', 'corpus')
+
+PROGRAMS = [
+    "(+ 1 (* 2 3))",
+    "(if (< 1 2) (quote yes) (car '()))",
+    "(define (f x) (if #f (car '()) (* x (sqrt 16)))) (f 3)",
+    "(define (adder n) (lambda (x) (+ x n))) ((adder 5) 10)",
+    "(define (outer a) ((lambda (inner) (inner 2)) (lambda (b) (+ a b)))) (outer 1)",
+    "(define (outer a) (if (define (inner b) (+ a b)) 0 (inner 2))) (outer 1)",
+    "(define (shadow car) (car 1)) (shadow (lambda (x) (+ x 1)))",
+    "(define (f +) (+ 1 2)) (f *)",
+    "(define sqrt (lambda (x) x)) (sqrt 16)",
+    "(define (count n acc) (if (= n 0) acc (count (- n 1) (cons n acc)))) (length (count 500 '()))",
+    "(define k 2) (define (scale lst) (map (lambda (x) (* k x)) lst)) (set! k 3) (scale '(1 2))",
+    "(reduce + (filter (lambda (x) (= (mod x 2) 0)) '(1 2 3 4)))",
+    "(define-memo (fib n) (if (< n 2) n (+ (fib (- n 1)) (fib (- n 2))))) (fib 30)",
+    "(force (delay (* pi 2)))",
+    "(and #t (not #f))",
+    "(define (g x) (+ x 1)) (define (+ a b) (* a b)) (g 2)",
+    "(define (h) (* 2 (sqrt 16))) (set! sqrt (lambda (x) x)) (h)",
+    "(define (pick) (if (< 1 2) 'first 'second)) (define (< a b) #f) (pick)",
+]
+
+
+class TestSythonOptimizer(unittest.TestCase):
+    def optimized(self, code, level):
+        sy = SythonExtended(optimize=level)
+        return sy.optimizer.optimize(sy.parse(sy.tokenize(code)), sy.env)
+
+    def test_level_zero_runs_forms_as_parsed(self):
+        sy = SythonInterpreter()
+        self.assertIsNone(sy.optimizer)
+        expr = sy.parse(sy.tokenize("(+ 1 2)"))
+        self.assertIs(Optimizer(sy, 0).optimize(expr, sy.env), expr)
+
+    def test_constant_folding(self):
+        self.assertEqual(self.optimized("(+ 1 (* 2 3))", 1).value, 7)
+        self.assertEqual(self.optimized("(* 2 pi)", 1).value, 2 * 3.141592653589793)
+        folded = self.optimized("(sqrt (+ 7 9))", 1)
+        self.assertEqual((folded.value, folded.names, folded.expr), (4.0, {'sqrt', '+'}, ['sqrt', ['+', 7, 9]]))
+        self.assertEqual(self.optimized("(/ 1 0)", 1), ['/', 1, 0])  # still raises when run
+
+    def test_dead_branches(self):
+        folded = self.optimized("(if (< 1 2) x y)", 1)
+        self.assertIs(type(folded), Folded)
+        self.assertEqual(folded.value, 'x')
+        self.assertEqual(self.optimized("(if #f x y)", 1).value, 'y')
+        self.assertEqual(self.optimized("(if z x y)", 1), ['if', 'z', 'x', 'y'])
+
+    def test_shadowed_primitives_are_left_alone(self):
+        self.assertEqual(self.optimized("(lambda (+) (+ 1 2))", 2), ['lambda', ['+'], ['+', 1, 2]])
+        expr = self.optimized("(lambda (sqrt) (sqrt 4))", 2)
+        self.assertEqual(expr[2], ['sqrt', 4])
+        # The form redefining sum must call itself, not the builtin
+        expr = self.optimized("(define (sum l) (if (null? l) 0 (sum (cdr l))))", 2)
+        self.assertIsNot(type(expr[2][3][0]), Builtin)
+
+    def test_inlining_and_frame_resolution(self):
+        expr = self.optimized("(lambda (n) (lambda (x) (car (cons x n))))", 2)
+        inner = expr[2][2]
+        car, (cons, x, n) = inner
+        self.assertIs(type(car), Builtin)
+        self.assertIs(type(cons), Builtin)
+        self.assertEqual(x, 'x')
+        self.assertIs(type(n), LocalRef)
+        self.assertEqual(n.depth, 1)
+
+    def test_unknown_special_forms_are_not_optimized(self):
+        sy = SythonInterpreter(optimize=2)
+        sy.register_special_form('first-of', lambda expr, env: sy.evaluate(expr[1], env))
+        expr = sy.parse(sy.tokenize("(first-of (+ 1 2))"))
+        self.assertIs(sy.optimizer.optimize(expr, sy.env), expr)
+        self.assertEqual(sy.execute(expr), 3)
+
+    def test_results_are_unchanged(self):
+        for engine in ('compile', 'eval'):
+            for code in PROGRAMS:
+                results = [SythonExtended(engine=engine, optimize=level).run(code) for level in (0, 1, 2)]
+                self.assertEqual(results[1], results[0], (engine, code))
+                self.assertEqual(results[2], results[0], (engine, code))
+
+    def test_rebinding_a_primitive_later(self):
+        # Forms optimized before the rebinding must not keep the primitive
+        for engine in ('compile', 'eval'):
+            for level in (0, 1, 2):
+                sy = SythonExtended(engine=engine, optimize=level)
+                sy.run("(define (g x) (+ x 1)) (define (k) (+ 1 2))")
+                self.assertEqual(sy.run("(g 2)"), 3)
+                sy.run("(set! + (lambda (a b) (* a b)))")
+                self.assertEqual((sy.run("(g 2)"), sy.run("(k)")), (2, 2), (engine, level))
+
+    def test_corpus_results_are_unchanged(self):
+        for path in sorted(glob.glob(os.path.join(CORPUS, '*.sy'))):
+            with open(path) as f:
+                code = f.read()
+            results = [SythonExtended(optimize=level).run(code) for level in (0, 2)]
+            self.assertEqual(results[1], results[0], path)
+
+    def test_errors_are_unchanged(self):
+        for level in (0, 1, 2):
+            sy = SythonInterpreter(optimize=level)
+            with self.assertRaises(ZeroDivisionError):
+                sy.run("(define (f x) (/ x 0)) (f 1)")
+            with self.assertRaisesRegex(TypeError, "car expects a non-empty list"):
+                sy.run("(define (g) (car '())) (g)")
+
+    def test_jit_and_pickling_see_plain_names(self):
+        sy = SythonInterpreter(optimize=2, jit_threshold=5)
+        sy.run("(define k 10)")
+        sy.run("(define (loop n acc) (if (= n 0) acc (loop (- n 1) (+ acc k))))")
+        self.assertEqual(sy.run("(loop 100 0)"), 1000)
+        self.assertTrue(hasattr(sy.env['loop'], 'source'))
+        adder = sy.run("((lambda (n) (lambda (x) (+ x n))) 5)")
+        copy = pickle.loads(pickle.dumps(adder))
+        self.assertIsInstance(copy, Procedure)
+        self.assertEqual(copy(1), 6)
+
+    def test_unknown_level(self):
+        with self.assertRaises(ValueError):
+            SythonInterpreter(optimize=3)
+
+
+if __name__ == '__main__':
+    unittest.main()
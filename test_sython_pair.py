@@ -0,0 +1,49 @@
+import pickle
+import unittest
+from sython_pair import NIL, Pair, cons, from_iterable, to_datum, to_python
+
+
+class TestSythonPair(unittest.TestCase):
+    def test_cons_shares_tail(self):
+        tail = from_iterable([2, 3])
+        lst = cons(1, tail)
+        self.assertIs(lst.cdr, tail)
+        self.assertEqual(lst, [1, 2, 3])
+
+    def test_cons_onto_atom_builds_list(self):
+        self.assertEqual(cons(1, 2), [1, 2])
+        self.assertEqual(cons(1, NIL), [1])
+
+    def test_equality(self):
+        self.assertEqual(from_iterable([1, [2, 3]]), to_datum([1, [2, 3]]))
+        self.assertEqual(to_datum([1, [2, 3]]), [1, [2, 3]])
+        self.assertNotEqual(from_iterable([1, 2]), [1, 2, 3])
+        self.assertNotEqual(from_iterable([1]), NIL)
+        self.assertEqual(NIL, [])
+        self.assertEqual(Pair(1, 2), Pair(1, 2))
+
+    def test_hash_matches_tuple(self):
+        self.assertEqual(hash(from_iterable([1, 2])), hash((1, 2)))
+        self.assertEqual({from_iterable([1, 2]): 'x'}[(1, 2)], 'x')
+
+    def test_truthiness_and_length(self):
+        self.assertTrue(Pair(0, NIL))
+        self.assertFalse(NIL)
+        self.assertEqual(len(from_iterable(range(10))), 10)
+
+    def test_repr(self):
+        self.assertEqual(repr(to_datum([1, ['a', 2]])), '(1 (a 2))')
+        self.assertEqual(repr(Pair(1, 2)), '(1 . 2)')
+        self.assertEqual(repr(NIL), '()')
+
+    def test_python_conversion(self):
+        self.assertEqual(to_python(to_datum([1, [2, []]])), [1, [2, []]])
+        self.assertIs(type(to_python(to_datum([1, [2]]))[1]), list)
+
+    def test_pickle_long_list(self):
+        lst = from_iterable(range(100000))
+        self.assertEqual(pickle.loads(pickle.dumps(lst)), lst)
+        self.assertIs(pickle.loads(pickle.dumps(NIL)), NIL)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,84 @@
+import pickle
+import unittest
+from sython_extended import SythonExtended
+from sython_interpreter import SythonInterpreter
+from sython_procedure import Procedure
+
+
+class TestProcedurePickling(unittest.TestCase):
+    def setUp(self):
+        self.sy = SythonInterpreter()
+
+    def test_closure_keeps_captured_bindings(self):
+        self.sy.run("(define (adder n) (lambda (x) (+ x n)))")
+        add5 = pickle.loads(pickle.dumps(self.sy.run("(adder 5)")))
+        self.assertIsInstance(add5, Procedure)
+        self.assertEqual(add5(10), 15)
+
+    def test_recursive_function_and_primitives(self):
+        self.sy.run("(define (len lst) (if (null? lst) 0 (+ 1 (len (cdr lst)))))")
+        length = pickle.loads(pickle.dumps(self.sy.env['len']))
+        self.assertEqual(length(self.sy.run("'(1 2 3)")), 3)
+
+    def test_jitted_function_is_sent_as_its_procedure(self):
+        sy = SythonInterpreter(jit_threshold=1)
+        sy.run("(define (square x) (* x x))")
+        sy.run("(square 2)")
+        function = sy.env['square']
+        self.assertTrue(hasattr(function, 'procedure'))
+        self.assertEqual(sy.process_pool().map(function, [1, 2, 3], sy.env), [1, 4, 9])
+        sy.close()
+
+
+class TestPmap(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.sy = SythonInterpreter(workers=2)
+        cls.sy.run("(define offset 100)")
+        cls.sy.run("(define (fact n) (if (< n 2) 1 (* n (fact (- n 1)))))")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.sy.close()
+
+    def test_results_keep_input_order(self):
+        result = self.sy.run("(pmap (lambda (x) (+ offset (fact x))) '(5 1 4 2 3))")
+        self.assertEqual(result, [220, 101, 124, 102, 106])
+
+    def test_primitive_and_chunking(self):
+        self.assertEqual(self.sy.run("(pmap car '((1 2) (3 4) (5 6)))"), [1, 3, 5])
+        square = self.sy.run("(lambda (x) (* x x))")
+        items = list(range(1000))
+        self.assertEqual(self.sy.process_pool().map(square, items, self.sy.env, chunksize=7),
+                         [x * x for x in items])
+
+    def test_pool_stays_warm(self):
+        pool = self.sy.process_pool()
+        self.sy.run("(pmap fact '(1 2))")
+        self.sy.run("(pfor-each fact '(1 2))")
+        self.assertIs(self.sy.process_pool(), pool)
+
+    def test_pfor_each_and_errors(self):
+        self.assertIsNone(self.sy.run("(pfor-each fact '(1 2 3))"))
+        with self.assertRaises(TypeError):
+            self.sy.run("(pmap (lambda (x) (+ x \"a\")) '(1 2))")
+        with self.assertRaises(TypeError):
+            self.sy.run("(pmap fact 5)")
+
+
+class TestPmapLazyLibraries(unittest.TestCase):
+    def test_primitive_installed_by_the_closure(self):
+        sy = SythonExtended(workers=2)
+        self.addCleanup(sy.close)
+        self.assertEqual(sy.run("(pmap (lambda (x) (sqrt x)) '(4 9))"), [2.0, 3.0])
+
+class TestPmapEvalEngine(TestPmap):
+    @classmethod
+    def setUpClass(cls):
+        cls.sy = SythonInterpreter(engine='eval', workers=2)
+        cls.sy.run("(define offset 100)")
+        cls.sy.run("(define (fact n) (if (< n 2) 1 (* n (fact (- n 1)))))")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+from sython_extended import SythonExtended
+from sython_interpreter import SythonInterpreter
+from sython_procedure import Procedure
+from sython_profiler import Profiler
+
+
+class TestSythonProfiler(unittest.TestCase):
+    def setUp(self):
+        self.sy = SythonInterpreter(jit_threshold=2)
+        self.sy.run("(define (fib n) (if (< n 2) n (+ (fib (- n 1)) (fib (- n 2)))))")
+
+    def tearDown(self):
+        self.sy.stop_profiling()
+
+    def test_counts_functions_and_primitives(self):
+        profiler = self.sy.start_profiling()
+        self.assertEqual(self.sy.run("(fib 10)"), 55)
+        self.sy.stop_profiling()
+        fib = profiler.stats[('fib', 'function')]
+        self.assertEqual(fib.calls, 177)
+        self.assertEqual(profiler.stats[('<', 'primitive')].calls, 177)
+        self.assertLessEqual(fib.exclusive, fib.inclusive)
+        self.assertIn('fib (function)', profiler.report())
+
+    def test_library_primitives(self):
+        sy = SythonExtended()
+        sy.run("(define (hyp a b) (sqrt (+ (* a a) (* b b))))")
+        profiler = sy.start_profiling()
+        self.addCleanup(sy.stop_profiling)
+        self.assertEqual(sy.run("(hyp 3 4)"), 5.0)
+        self.assertEqual(profiler.stats[('sqrt', 'primitive')].calls, 1)
+        sy.register_library('triple', lambda interpreter, bindings: bindings.update(triple=lambda x: 3 * x))
+        self.assertEqual(sy.run("(triple 2)"), 6)
+        self.assertEqual(profiler.stats[('triple', 'primitive')].calls, 1)
+
+    def test_tail_calls_count_once_each(self):
+        self.sy.run("(define (loop i) (if (= i 0) 0 (loop (- i 1))))")
+        profiler = self.sy.start_profiling()
+        self.sy.run("(loop 100)")
+        self.sy.stop_profiling()
+        self.assertEqual(profiler.stats[('loop', 'function')].calls, 101)
+        self.assertNotIn('loop;loop', '\n'.join(profiler.collapsed_stacks()))
+
+    def test_collapsed_stacks(self):
+        profiler = self.sy.start_profiling()
+        self.sy.run("(fib 3)")
+        self.sy.stop_profiling()
+        paths = [line.rsplit(' ', 1)[0] for line in profiler.collapsed_stacks()]
+        self.assertIn('fib;fib;<', paths)
+
+    def test_stop_restores_everything(self):
+        call = Procedure.__call__
+        bindings = dict(self.sy.env)
+        self.sy.start_profiling()
+        self.assertIsNot(Procedure.__call__, call)
+        self.assertIsNot(self.sy.env['car'], bindings['car'])
+        self.sy.stop_profiling()
+        self.assertIs(Procedure.__call__, call)
+        for name, value in bindings.items():
+            self.assertIs(self.sy.env[name], value)
+
+    def test_jit_waits_while_profiling(self):
+        self.sy.start_profiling()
+        self.sy.run("(fib 5)")
+        self.assertIs(type(self.sy.env['fib']), Procedure)
+
+    def test_errors_unwind_the_stack(self):
+        profiler = self.sy.start_profiling()
+        with self.assertRaises(TypeError):
+            self.sy.run("(fib \"a\")")
+        self.assertEqual(profiler.stack, [])
+
+    def test_one_profiler_at_a_time(self):
+        self.sy.start_profiling()
+        with self.assertRaises(RuntimeError):
+            Profiler(SythonInterpreter()).start()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import io
+import unittest
+from unittest.mock import patch
+from sython_interpreter import SythonInterpreter
+from sython_reader import iter_tokens
+
+
+class TestSythonReader(unittest.TestCase):
+    def setUp(self):
+        self.sy = SythonInterpreter()
+
+    def test_positions(self):
+        tokens = list(iter_tokens("(define x\n  'y) ; comment\n42"))
+        self.assertEqual(tokens, [
+            ('(', 1, 1), ('define', 1, 2), ('x', 1, 9),
+            ("'", 2, 3), ('y', 2, 4), (')', 2, 5),
+            ('42', 3, 1),
+        ])
+
+    def test_string_literals(self):
+        tokens = [token for token, _, _ in iter_tokens('(display "a (b) ; c\'d")')]
+        self.assertEqual(tokens, ['(', 'display', '"a (b) ; c\'d"', ')'])
+
+    def test_chunked_file_matches_whole_string(self):
+        source = '(define (f x)\n  (* x x)) ; square\n(display "two\nlines")\n(f 12345)\n'
+        for chunk_size in (1, 2, 3, 7):
+            chunked = list(iter_tokens(io.StringIO(source), chunk_size=chunk_size))
+            self.assertEqual(chunked, list(iter_tokens(source)), chunk_size)
+
+    def test_unterminated_string(self):
+        with self.assertRaises(SyntaxError):
+            list(iter_tokens('(display "oops)'))
+
+    def test_read_forms(self):
+        forms = list(self.sy.read_forms(iter_tokens("(+ 1 2) 'x ''(a)")))
+        self.assertEqual(forms, [['+', 1, 2], ['quote', 'x'], ['quote', ['quote', ['a']]]])
+
+    def test_vector_literals(self):
+        self.assertEqual([token for token, _, _ in iter_tokens("#(1 #(a))")], ['#(', '1', '#(', 'a', ')', ')'])
+        vector, = self.sy.read_forms(iter_tokens("#(1 (2 x) #(y) \"s\")"))
+        self.assertEqual(repr(vector), "#(1 (2 x) #(y) s)")
+        with self.assertRaisesRegex(SyntaxError, "opened at line 1, column 1"):
+            self.sy.run("#(1 2")
+
+    def test_parse_consumes_one_form(self):
+        tokens = self.sy.tokenize("(+ 1 2) (* 3 4)")
+        self.assertEqual(self.sy.parse(tokens), ['+', 1, 2])
+        self.assertEqual(tokens, ['(', '*', '3', '4', ')'])
+
+    def test_parse_reports_source_positions(self):
+        with self.assertRaisesRegex(SyntaxError, "opened at line 1, column 1"):
+            self.sy.parse(self.sy.tokenize("(a\n b\n c"))
+        tokens = self.sy.tokenize("(a)\n  (b\n c")
+        self.assertIs(type(tokens), list)
+        self.assertEqual(self.sy.parse(tokens), ['a'])
+        self.assertEqual(tokens.index('('), 0)
+        with self.assertRaisesRegex(SyntaxError, "opened at line 2, column 3"):
+            self.sy.parse(tokens)
+
+    def test_syntax_errors(self):
+        with self.assertRaisesRegex(SyntaxError, "line 2, column 1"):
+            self.sy.run("(+ 1 2)\n)")
+        with self.assertRaisesRegex(SyntaxError, "opened at line 1, column 9"):
+            self.sy.run("(+ 1 2) (+ 3")
+
+    def test_deeply_nested_input(self):
+        depth = 5000
+        expr, = self.sy.read_forms(iter_tokens('(' * depth + ')' * depth))
+        for _ in range(depth - 1):
+            expr, = expr
+        self.assertEqual(expr, [])
+
+    def test_streaming_run_evaluates_before_reading_rest(self):
+        with patch('sys.stdout', new=io.StringIO()) as fake_out:
+            with self.assertRaises(SyntaxError):
+                self.sy.run('(display "first") (+ 1', stream=True)
+        self.assertEqual(fake_out.getvalue(), "first")
+
+        with patch('sys.stdout', new=io.StringIO()) as fake_out:
+            with self.assertRaises(SyntaxError):
+                self.sy.run('(display "first") (+ 1')
+        self.assertEqual(fake_out.getvalue(), "")
+
+    def test_streaming_run_from_file(self):
+        source = io.StringIO("(define (square x) (* x x))\n(square 12)\n")
+        with patch('sys.stdout', new=io.StringIO()):
+            self.assertEqual(self.sy.run(source, stream=True), 144)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
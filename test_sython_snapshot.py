@@ -0,0 +1,147 @@
+import io
+import unittest
+from unittest.mock import patch
+from sython_extended import SythonExtended
+from sython_interpreter import SythonInterpreter
+from sython_procedure import Procedure
+
+PRELUDE = """
+(define limit 10)
+(define (square x) (* x x))
+(define (clamp x) (if (> x limit) limit x))
+(define (count-down n) (if (= n 0) 'done (count-down (- n 1))))
+(define make-counter (lambda (start) (lambda () start)))
+(define five (make-counter 5))
+(define-memo (fib n) (if (< n 2) n (+ (fib (- n 1)) (fib (- n 2)))))
+"""
+
+
+class TestSythonSnapshot(unittest.TestCase):
+    engine = 'compile'
+
+    def setUp(self):
+        self.base = SythonExtended(engine=self.engine)
+        self.base.run(PRELUDE)
+        self.snapshot = self.base.snapshot()
+
+    def test_fork_has_prelude_definitions(self):
+        sandbox = self.snapshot.fork()
+        self.assertIsInstance(sandbox, SythonExtended)
+        self.assertEqual(sandbox.run("(clamp (square 3))"), 9)
+        self.assertEqual(sandbox.run("(clamp (square 4))"), 10)
+        self.assertEqual(sandbox.run("(five)"), 5)
+        self.assertEqual(sandbox.run("(fib 30)"), 832040)
+        self.assertEqual(sandbox.run("(count-down 100000)"), 'done')
+
+    def test_forks_are_isolated(self):
+        first, second = self.snapshot.fork(), self.snapshot.fork()
+        first.run("(set! limit 100)")
+        first.run("(define (square x) x)")
+        first.run("(define extra 1)")
+        self.assertEqual(first.run("(clamp 50)"), 50)
+        self.assertEqual(second.run("(clamp 50)"), 10)
+        self.assertEqual(second.run("(square 3)"), 9)
+        self.assertNotIn('extra', second.env)
+        self.assertEqual(self.base.run("(clamp 50)"), 10)
+        self.assertEqual(self.snapshot.fork().run("(clamp 50)"), 10)
+
+    def test_vector_literals_are_not_shared(self):
+        self.base.run("(define (get) #(0 0))")
+        snapshot = self.base.snapshot()
+        first, second = snapshot.fork(), snapshot.fork()
+        first.run("(define v (get))")
+        first.run("(vector-set! v 0 99)")
+        self.assertEqual(first.run("v"), [99, 0])
+        self.assertEqual(first.run("(get)"), [0, 0])
+        self.assertEqual(second.run("(get)"), [0, 0])
+        self.assertEqual(self.base.run("(get)"), [0, 0])
+
+    def test_later_changes_to_the_source_are_not_seen(self):
+        self.base.run("(set! limit 1)")
+        self.base.run("(define (square x) 0)")
+        sandbox = self.snapshot.fork()
+        self.assertEqual(sandbox.run("(clamp (square 3))"), 9)
+
+    def test_primitives_belong_to_the_fork(self):
+        sandbox = self.snapshot.fork()
+        self.assertIs(sandbox.env['display'].__self__, sandbox)
+        self.assertIs(sandbox.env['+'], sandbox.builtins['+'])
+        self.assertIs(sandbox.special_forms['define'].evaluate.__self__, sandbox)
+        self.assertIs(sandbox.env['hash-count'].__self__, sandbox)
+        sandbox.line_number = 7
+        with self.assertRaisesRegex(TypeError, "hash-count expects a hash table, got: 1 at line 7"):
+            sandbox.env['hash-count'](1)
+        with patch('sys.stdout', new=io.StringIO()) as fake_out:
+            sandbox.env['display']("only in the fork")
+            self.base.env['flush']()
+            self.assertEqual(fake_out.getvalue(), "")
+            sandbox.env['flush']()
+            self.assertEqual(fake_out.getvalue(), "only in the fork")
+
+    def test_procedures_are_copied(self):
+        sandbox = self.snapshot.fork()
+        square = sandbox.env['square']
+        self.assertIsInstance(square, Procedure)
+        self.assertIsNot(square, self.base.env['square'])
+        self.assertIs(square.env, sandbox.env)
+        self.assertIsNot(sandbox.env['five'].env.outer, self.base.env)
+        self.assertEqual(sandbox.run("(memo-stats fib)"), [0, 0, 1024, 0])
+
+    def test_vectors_and_hash_tables_are_copied(self):
+        self.base.run("(define v (vector 1 (vector 2))) (define h (make-hash-table)) (define (first) (vector-ref v 0))")
+        snapshot = self.base.snapshot()
+        sandbox = snapshot.fork()
+        sandbox.run("(vector-set! v 0 9) (vector-set! (vector-ref v 1) 0 8) (hash-set! h 'k 1)")
+        self.assertEqual(sandbox.run("(first)"), 9)
+        self.assertEqual(self.base.run("v"), [1, [2]])
+        self.assertEqual(snapshot.fork().run("v"), [1, [2]])
+        self.assertEqual(self.base.run("(hash-count h)"), 0)
+
+    def test_fork_keeps_options(self):
+        base = SythonInterpreter(engine=self.engine, optimize=2, jit_threshold=5)
+        sandbox = base.snapshot().fork()
+        self.assertEqual(sandbox.engine, self.engine)
+        self.assertEqual(sandbox.optimizer.level, 2)
+        if self.engine == 'compile':
+            self.assertEqual(sandbox.jit.threshold, 5)
+        self.assertEqual(sandbox.run("(+ 1 2)"), 3)
+
+    def test_inlined_primitives_belong_to_the_fork(self):
+        base = SythonExtended(engine=self.engine, optimize=2)
+        base.run("(define (say x) (display x))")
+        sandbox = base.snapshot().fork()
+        with patch('sys.stdout', new=io.StringIO()) as fake_out:
+            sandbox.run("(say 42)")
+            self.assertEqual(fake_out.getvalue(), "42")  # run flushes the fork's port
+            base.env['flush']()
+            self.assertEqual(fake_out.getvalue(), "42")
+        self.assertIs(base.env['say'].body[0].value.__self__, base)
+
+    def test_snapshot_while_profiling(self):
+        self.base.start_profiling()
+        with self.assertRaises(RuntimeError):
+            self.base.snapshot()
+        self.base.stop_profiling()
+
+
+class TestSythonSnapshotEvalEngine(TestSythonSnapshot):
+    engine = 'eval'
+
+
+class TestSythonSnapshotJit(unittest.TestCase):
+    def test_translated_functions_are_forked_as_procedures(self):
+        base = SythonInterpreter(jit_threshold=5)
+        base.run("(define (square x) (* x x))")
+        for _ in range(10):
+            base.run("(square 3)")
+        self.assertNotIsInstance(base.env['square'], Procedure)
+        sandbox = base.snapshot().fork()
+        self.assertIsInstance(sandbox.env['square'], Procedure)
+        for _ in range(10):
+            self.assertEqual(sandbox.run("(square 3)"), 9)
+        self.assertNotIsInstance(sandbox.env['square'], Procedure)
+        self.assertIs(sandbox.env['square'].procedure.env, sandbox.env)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import tracemalloc
+import unittest
+from sython_interpreter import SythonInterpreter
+from sython_stream import Stream
+
+
+class TestSythonStream(unittest.TestCase):
+    def setUp(self):
+        self.sy = SythonInterpreter()
+
+    def test_delay_force(self):
+        self.sy.run("(define q (delay (+ 1 2)))")
+        self.assertEqual(self.sy.run("(force q)"), 3)
+        self.assertEqual(self.sy.run("(force q)"), 3)
+        self.assertEqual(self.sy.run("(force 5)"), 5)
+
+    def test_delay_evaluates_once(self):
+        self.sy.run("(define calls 0)")
+        self.sy.run("(define p (delay (set! calls (+ calls 1))))")
+        self.assertEqual(self.sy.run("calls"), 0)
+        self.sy.run("(force p)")
+        self.sy.run("(force p)")
+        self.assertEqual(self.sy.run("calls"), 1)
+
+    def test_range(self):
+        self.assertEqual(self.sy.run("(stream->list (range 4))"), [0, 1, 2, 3])
+        self.assertEqual(self.sy.run("(stream->list (range 2 8 3))"), [2, 5])
+        self.assertEqual(self.sy.run("(stream->list (range 0 1 0.25))"), [0, 0.25, 0.5, 0.75])
+
+    def test_map_filter_reduce_stay_lazy(self):
+        self.sy.run("(define evens (filter (lambda (x) (= (mod x 2) 0)) (range 1000000000000)))")
+        self.assertIsInstance(self.sy.env['evens'], Stream)
+        self.sy.run("(define squares (map (lambda (x) (* x x)) evens))")
+        self.assertIsInstance(self.sy.env['squares'], Stream)
+        self.assertEqual(self.sy.run("(stream->list (stream-take 4 squares))"), [0, 4, 16, 36])
+        self.assertEqual(self.sy.run("(reduce + (stream-take 4 squares))"), 56)
+
+    def test_stream_functions(self):
+        self.assertEqual(self.sy.run("(stream->list (stream-map + (range 3) (range 10 13)))"), [10, 12, 14])
+        self.assertEqual(self.sy.run("(stream->list (stream-filter (lambda (x) (> x 1)) (range 4)))"), [2, 3])
+        self.assertEqual(self.sy.run("(stream-reduce + (range 5))"), 10)
+        self.assertEqual(self.sy.run("(stream-reduce + (range 0) 7)"), 7)
+        self.assertEqual(self.sy.run("(stream->list (list->stream '(1 2)))"), [1, 2])
+        self.assertEqual(self.sy.run("(stream? (range 1))"), True)
+        with self.assertRaises(ValueError):
+            self.sy.run("(reduce + (range 0))")
+
+    def test_streams_can_be_walked_twice(self):
+        self.sy.run("(define s (map (lambda (x) (* 2 x)) (range 3)))")
+        self.assertEqual(self.sy.run("(reduce + s)"), 6)
+        self.assertEqual(self.sy.run("(reduce + s)"), 6)
+
+    def test_pipeline_runs_in_constant_memory(self):
+        code = "(reduce + (map (lambda (x) (* x 2)) (filter (lambda (x) (> x 0)) (range {n}))))"
+        peaks = []
+        for n in (1000, 10000):
+            expr = self.sy.parse(self.sy.tokenize(code.format(n=n)))
+            tracemalloc.start()
+            self.sy.execute(expr)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        self.assertLess(peaks[1], peaks[0] * 2)
+
+
+class TestSythonStreamEvalEngine(TestSythonStream):
+    def setUp(self):
+        self.sy = SythonInterpreter(engine='eval')
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,140 @@
+import io
+import json
+import unittest
+from unittest.mock import patch
+from sython_interpreter import SythonInterpreter
+from sython_trace import JsonlTracer, SamplingTracer, Tracer, format_expr
+
+PROGRAM = """
+(define (square x) (* x x))
+(define (count-down n) (if (= n 0) 'done (count-down (- n 1))))
+(define y (square 3))
+"""
+
+
+class Recorder(Tracer):
+    def __init__(self, events=('enter', 'call', 'return', 'define', 'error')):
+        self.events = frozenset(events)
+        self.log = []
+
+    def on_enter(self, expr, env):
+        self.log.append(('enter', format_expr(expr)))
+
+    def on_call(self, name, args):
+        self.log.append(('call', name, list(args)))
+
+    def on_return(self, name, value):
+        self.log.append(('return', name, value))
+
+    def on_define(self, name, value):
+        self.log.append(('define', name, str(value)))
+
+    def on_error(self, error, line):
+        self.log.append(('error', type(error).__name__, line))
+
+
+class TestSythonTrace(unittest.TestCase):
+    engine = 'compile'
+
+    def traced(self, *events):
+        recorder = Recorder(events) if events else Recorder()
+        return SythonInterpreter(engine=self.engine, tracer=recorder), recorder
+
+    def test_untraced_interpreter_runs_plain_code(self):
+        sy = SythonInterpreter(engine=self.engine)
+        self.assertIsNone(sy.tracer)
+        for name in ('evaluate', 'compile', 'make_procedure'):
+            self.assertNotIn(name, vars(sy))
+        sy.run(PROGRAM)
+        self.assertNotEqual(sy.env['square'].code.__name__, 'traced')
+
+    def test_calls_returns_and_defines(self):
+        sy, recorder = self.traced('call', 'return', 'define')
+        sy.run(PROGRAM)
+        self.assertEqual(recorder.log, [
+            ('define', 'square', '<procedure square>'),
+            ('define', 'count-down', '<procedure count-down>'),
+            ('call', 'square', [3]),
+            ('return', 'square', 9),
+            ('define', 'y', '9'),
+        ])
+
+    def test_tail_calls_return_once(self):
+        sy, recorder = self.traced('call', 'return')
+        sy.run(PROGRAM)
+        recorder.log.clear()
+        self.assertEqual(sy.run("(count-down 2)"), 'done')
+        self.assertEqual(recorder.log, [
+            ('call', 'count-down', [2]),
+            ('call', 'count-down', [1]),
+            ('call', 'count-down', [0]),
+            ('return', 'count-down', 'done'),
+        ])
+
+    def test_calls_from_primitives(self):
+        sy, recorder = self.traced('call', 'return')
+        sy.run(PROGRAM)
+        recorder.log.clear()
+        sy.run("(map square (list 2))")
+        self.assertEqual(recorder.log, [('call', 'square', [2]), ('return', 'square', 4)])
+
+    def test_enter(self):
+        sy, recorder = self.traced('enter')
+        sy.run("(define (f x) (car x)) (f '(1 2))")
+        entered = [expr for _, expr in recorder.log]
+        for expr in ("(define (f x) (car x))", "(f (quote (1 2)))", "(car x)", "x"):
+            self.assertIn(expr, entered)
+        self.assertLess(entered.index("(f (quote (1 2)))"), entered.index("(car x)"))
+
+    def test_errors(self):
+        sy, recorder = self.traced('error')
+        with self.assertRaises(ZeroDivisionError):
+            sy.run("(+ 1 2)\n(/ 1 0)")
+        self.assertEqual(recorder.log, [('error', 'ZeroDivisionError', 2)])
+        self.assertNotIn('evaluate', vars(sy))  # errors alone need no hooks in the code
+
+    def test_debug_prints_events(self):
+        with patch('sys.stdout', new=io.StringIO()) as fake_out:
+            SythonInterpreter(engine=self.engine, debug=True).run("(define (sq x) (* x x)) (sq 2)")
+        output = fake_out.getvalue()
+        self.assertIn("[DEBUG] Defined sq as <procedure sq>", output)
+        self.assertIn("[DEBUG] Calling sq with (2)", output)
+        self.assertIn("[DEBUG] sq returned 4", output)
+        self.assertIn("[DEBUG] Evaluating (* x x)", output)
+
+    def test_fork_keeps_tracing(self):
+        sy, recorder = self.traced('call', 'return')
+        sy.run(PROGRAM)
+        sandbox = sy.snapshot().fork()
+        recorder.log.clear()
+        self.assertEqual(sandbox.run("(square 4)"), 16)
+        self.assertEqual(recorder.log, [('call', 'square', [4]), ('return', 'square', 16)])
+
+
+class TestSythonTraceEvalEngine(TestSythonTrace):
+    engine = 'eval'
+
+
+class TestTraceSinks(unittest.TestCase):
+    def test_jsonl(self):
+        out = io.StringIO()
+        sy = SythonInterpreter(tracer=JsonlTracer(out, max_length=5))
+        sy.run('(define (f s) "a long string") (f 123456789)')
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([r['event'] for r in records], ['define', 'call', 'return'])
+        self.assertEqual(records[1]['args'], ['12345...'])
+        self.assertEqual(records[2]['value'], 'a lon...')
+        self.assertTrue(all('time' in r for r in records))
+
+    def test_sampling(self):
+        recorder = Recorder()
+        sy = SythonInterpreter(tracer=SamplingTracer(recorder, every=10))
+        sy.run("(define (count-down n) (if (= n 0) 'done (count-down (- n 1))))")
+        sy.run("(count-down 99)")
+        self.assertEqual(len([e for e in recorder.log if e[0] == 'call']), 10)
+        self.assertEqual(len([e for e in recorder.log if e[0] == 'define']), 1)
+        with self.assertRaises(ValueError):
+            SamplingTracer(recorder, every=0)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)